@@ -0,0 +1,82 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from importlib import metadata
+
+from .load import DRIVERS, TRANSPORTS, run_load
+from .micro import run_micro
+from .upstream import PROFILES
+
+
+def fetchin_version():
+    try:
+        return metadata.version("fetchin")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--suite", nargs="+", choices=("load", "micro"), default=("load", "micro")
+    )
+    parser.add_argument("--driver", nargs="+", choices=DRIVERS, default=DRIVERS)
+    parser.add_argument(
+        "--profile",
+        nargs="+",
+        choices=sorted(PROFILES),
+        default=("fast", "slow", "flaky"),
+    )
+    parser.add_argument("--transport", nargs="+", choices=TRANSPORTS, default=("http",))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--trace-alloc", action="store_true")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = {
+        "metadata": {
+            "fetchin": fetchin_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        }
+    }
+
+    if "load" in args.suite:
+        report["load"] = []
+        for transport in args.transport:
+            for profile in args.profile:
+                for driver in args.driver:
+                    if transport == "memory" and driver == "async":
+                        continue
+                    result = run_load(
+                        driver,
+                        profile,
+                        PROFILES[profile],
+                        args.requests,
+                        args.concurrency,
+                        args.trace_alloc,
+                        transport,
+                    )
+                    print(json.dumps(result), file=sys.stderr)
+                    report["load"].append(result)
+
+    if "micro" in args.suite:
+        report["micro"] = run_micro(args.iterations)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import json
+
+LOWER_IS_BETTER = ("ms", "us", "ns", "kib", "errors", "connections")
+
+
+def _rows(report):
+    for result in report.get("load", []):
+        transport = result.get("transport", "http")
+        name = f"load[{result['driver']}/{result['profile']}/{transport}]"
+        for key, value in result.items():
+            if isinstance(value, (int, float)) and key not in (
+                "requests",
+                "concurrency",
+            ):
+                yield f"{name}.{key}", key, value
+    for name, result in report.get("micro", {}).items():
+        for key, value in result.items():
+            yield f"{name}.{key}", key, value
+
+
+def compare(baseline, candidate):
+    old = {name: (key, value) for name, key, value in _rows(baseline)}
+    lines = []
+    for name, key, value in _rows(candidate):
+        if name not in old or not old[name][1]:
+            continue
+        change = (value - old[name][1]) / old[name][1] * 100
+        better = change < 0 if key.endswith(LOWER_IS_BETTER) else change > 0
+        marker = "+" if better else "-" if abs(change) >= 5 else " "
+        lines.append(
+            f"{marker} {name:<60} {old[name][1]:>12} {value:>12} {change:+7.1f}%"
+        )
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    print("\n".join(compare(baseline, candidate)))
@@ -0,0 +1,196 @@
+import asyncio
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.metrics.metrics_interface import MetricsInterface
+from src.fetchin.transports import MemoryTransport
+
+from .upstream import MockH2Upstream, MockUpstream
+
+DRIVERS = ("sync", "async", "batch")
+TRANSPORTS = ("http", "http2", "memory")
+MEMORY_URL = "http://upstream.invalid/api/example"
+
+CIRCUIT_CONFIG = {"fail_max": 10**9}
+
+
+class LatencyRecorder(MetricsInterface):
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+
+    def track_request(self, method, status_code, response_time):
+        pass
+
+    def track_retry(self, method):
+        pass
+
+    def track_end_to_end(self, label, method, status_code, duration):
+        self.latencies.append(duration)
+        if status_code is None or status_code >= 500:
+            self.errors += 1
+
+
+def percentile(ordered, pct):
+    if not ordered:
+        return None
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def pool_config(concurrency: int, http2: bool = False):
+    # The mock upstream speaks cleartext HTTP/2 (h2c) without an upgrade
+    return {"pool_maxsize": concurrency, "http2_prior_knowledge": http2}
+
+
+def drive_sync(url, requests, concurrency, metrics, label, transport=None, http2=False):
+    with Fetcher(
+        label=label,
+        metrics=metrics,
+        circuit_config=CIRCUIT_CONFIG,
+        max_retries=1,
+        pool_config=pool_config(concurrency, http2),
+        transport=transport,
+    ) as fetcher:
+
+        def worker(count):
+            for _ in range(count):
+                try:
+                    fetcher.get(url)
+                except Exception:
+                    pass
+
+        shares = [requests // concurrency] * concurrency
+        shares[0] += requests % concurrency
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, shares))
+
+
+def drive_batch(
+    url, requests, concurrency, metrics, label, transport=None, http2=False
+):
+    with Fetcher(
+        label=label,
+        metrics=metrics,
+        circuit_config=CIRCUIT_CONFIG,
+        max_retries=1,
+        pool_config=pool_config(concurrency, http2),
+        transport=transport,
+    ) as fetcher:
+        for _ in fetcher.as_completed([url] * requests, concurrency=concurrency):
+            pass
+
+
+def drive_async(
+    url, requests, concurrency, metrics, label, transport=None, http2=False
+):
+    if transport is not None:
+        raise ValueError("AsyncFetcher does not support pluggable transports")
+
+    async def run():
+        semaphore = asyncio.Semaphore(concurrency)
+        async with AsyncFetcher(
+            label=label,
+            metrics=metrics,
+            circuit_config=CIRCUIT_CONFIG,
+            max_retries=1,
+            pool_config=pool_config(concurrency, http2),
+        ) as fetcher:
+
+            async def one():
+                async with semaphore:
+                    try:
+                        await fetcher.get(url)
+                    except Exception:
+                        pass
+
+            await asyncio.gather(*(one() for _ in range(requests)))
+
+    asyncio.run(run())
+
+
+DRIVER_FUNCTIONS = {"sync": drive_sync, "async": drive_async, "batch": drive_batch}
+
+
+def memory_transport(profile: dict):
+    padding = max(profile["body_size"] - len('{"data": ""}'), 0)
+    mapping = {
+        "request": {"method": "ANY", "urlPath": "/api/example"},
+        "response": {
+            "status": 200,
+            "body": '{"data": "' + "x" * padding + '"}',
+            "headers": {"Content-Type": "application/json"},
+            "fixedDelayMilliseconds": profile["latency"] * 1000,
+        },
+    }
+    return MemoryTransport([mapping])
+
+
+class _MemoryUpstream:
+    url = MEMORY_URL
+    connections = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+def run_load(
+    driver: str,
+    profile_name: str,
+    profile: dict,
+    requests: int,
+    concurrency: int,
+    trace_alloc: bool = False,
+    transport: str = "http",
+):
+    drive = DRIVER_FUNCTIONS[driver]
+    label = f"bench-{driver}-{profile_name}-{transport}"
+    if transport == "memory":
+        upstream_context, shared = _MemoryUpstream(), memory_transport(profile)
+    elif transport == "http2":
+        upstream_context, shared = MockH2Upstream(profile), None
+    else:
+        upstream_context, shared = MockUpstream(profile), None
+
+    def run(url, count, metrics):
+        drive(url, count, concurrency, metrics, label, shared, transport == "http2")
+
+    with upstream_context as upstream:
+        run(upstream.url, min(requests, 50), LatencyRecorder())
+
+        connections = upstream.connections
+        metrics = LatencyRecorder()
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        run(upstream.url, requests, metrics)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        result = {
+            "driver": driver,
+            "profile": profile_name,
+            "transport": transport,
+            "requests": len(metrics.latencies),
+            "concurrency": concurrency,
+            "errors": metrics.errors,
+            "throughput_rps": round(len(metrics.latencies) / wall, 1),
+            "cpu_us_per_request": round(cpu / max(requests, 1) * 1e6, 1),
+            "connections": upstream.connections - connections,
+        }
+        ordered = sorted(metrics.latencies)
+        for pct in (50, 95, 99):
+            value = percentile(ordered, pct)
+            result[f"p{pct}_ms"] = None if value is None else round(value * 1000, 3)
+
+        if trace_alloc:
+            tracemalloc.start()
+            run(upstream.url, max(requests // 10, 1), LatencyRecorder())
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["alloc_peak_kib"] = round(peak / 1024, 1)
+
+    return result
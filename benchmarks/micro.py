@@ -0,0 +1,70 @@
+import timeit
+
+import pybreaker
+from prometheus_client import CollectorRegistry
+
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.logging.logger import CustomLogger
+from src.fetchin.metrics.prometheus_metrics import PrometheusMetrics
+
+
+class UnboundPrometheusMetrics(PrometheusMetrics):
+    def _child(self, metric, labels: tuple):
+        return metric.labels(*labels)
+
+
+def ns_per_op(func, iterations: int, repeat: int = 3):
+    best = min(timeit.repeat(func, number=iterations, repeat=repeat))
+    return round(best / iterations * 1e9, 1)
+
+
+def noop():
+    pass
+
+
+def breaker_calling(breaker):
+    def run():
+        with breaker.calling():
+            pass
+
+    return run
+
+
+def run_micro(iterations: int):
+    results = {}
+
+    logger = CustomLogger(
+        name="fetchin-bench", extra_params={"app_name": "bench", "environment": "dev"}
+    )
+    extra = {"url": "http://localhost/api/example", "fetcher_label": "bench"}
+    results["logger._merge_params"] = ns_per_op(
+        lambda: logger._merge_params("Fetching data", extra), iterations
+    )
+
+    metric_modes = {
+        "labels_per_call": UnboundPrometheusMetrics,
+        "bound_children": PrometheusMetrics,
+    }
+    for name, factory in metric_modes.items():
+        metrics = factory(registry=CollectorRegistry())
+        results[f"metrics.track_request[{name}]"] = ns_per_op(
+            lambda: metrics.track_request("GET", 200, 0.01), iterations
+        )
+    metrics = PrometheusMetrics(registry=CollectorRegistry(), buffered=True)
+    results["metrics.track_request[buffered]"] = ns_per_op(
+        lambda: metrics.track_request("GET", 200, 0.01), iterations
+    )
+    metrics.close()
+
+    breaker = pybreaker.CircuitBreaker()
+    results["circuit_breaker.call"] = ns_per_op(lambda: breaker.call(noop), iterations)
+    results["circuit_breaker.calling"] = ns_per_op(breaker_calling(breaker), iterations)
+
+    fetcher = Fetcher(label="bench-micro", circuit_config={"scope": "host"})
+    results["fetcher._circuit_breaker_for"] = ns_per_op(
+        lambda: fetcher._circuit_breaker_for("http://localhost/api/example"),
+        iterations,
+    )
+    fetcher.close()
+
+    return {name: {"ns_per_op": value} for name, value in results.items()}
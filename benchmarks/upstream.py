@@ -0,0 +1,190 @@
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROFILES = {
+    "fast": {"latency": 0, "jitter": 0, "error_rate": 0, "body_size": 256},
+    "slow": {"latency": 0.02, "jitter": 0.03, "error_rate": 0, "body_size": 256},
+    "flaky": {"latency": 0.005, "jitter": 0.01, "error_rate": 0.05, "body_size": 256},
+    "large": {"latency": 0, "jitter": 0, "error_rate": 0, "body_size": 1024 * 1024},
+}
+
+ERROR_BODY = b'{"error": "unavailable"}'
+
+
+def profile_body(profile: dict):
+    padding = max(profile["body_size"] - len(b'{"data": ""}'), 0)
+    return b'{"data": "' + b"x" * padding + b'"}'
+
+
+def profile_response(profile: dict, body: bytes):
+    delay = profile["latency"] + random.uniform(0, profile["jitter"])
+    if delay:
+        time.sleep(delay)
+
+    if random.random() < profile["error_rate"]:
+        return 503, ERROR_BODY
+    return 200, body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        status, body = profile_response(self.server.profile, self.server.body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+class MockUpstream:
+    def __init__(self, profile: dict):
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        self.server.profile = profile
+        self.server.body = profile_body(profile)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/api/example"
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MockH2Upstream:
+    def __init__(self, profile: dict):
+        self.profile = profile
+        self.body = profile_body(profile)
+        self.socket = socket.create_server(("127.0.0.1", 0), backlog=1024)
+        self.connections = 0
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.socket.getsockname()
+        return f"http://{host}:{port}/api/example"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.socket.close()
+
+    def _serve(self):
+        while True:
+            try:
+                sock, _ = self.socket.accept()
+            except OSError:
+                return
+            self.connections += 1
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+
+    def _handle(self, sock):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        config = h2.config.H2Configuration(client_side=False)
+        connection = h2.connection.H2Connection(config=config)
+        connection.local_settings.max_concurrent_streams = 1000
+        connection.initiate_connection()
+        lock = threading.Condition()
+        sock.sendall(connection.data_to_send())
+
+        with sock:
+            while True:
+                try:
+                    data = sock.recv(65535)
+                except OSError:
+                    return
+                if not data:
+                    return
+
+                with lock:
+                    for event in connection.receive_data(data):
+                        if isinstance(event, h2.events.DataReceived):
+                            connection.acknowledge_received_data(
+                                event.flow_controlled_length, event.stream_id
+                            )
+                        elif isinstance(event, h2.events.StreamEnded):
+                            threading.Thread(
+                                target=self._respond,
+                                args=(sock, connection, lock, event.stream_id),
+                                daemon=True,
+                            ).start()
+                        elif isinstance(event, h2.events.WindowUpdated):
+                            lock.notify_all()
+                    sock.sendall(connection.data_to_send())
+
+    def _respond(self, sock, connection, lock, stream_id):
+        status, body = profile_response(self.profile, self.body)
+        headers = [
+            (":status", str(status)),
+            ("content-type", "application/json"),
+            ("content-length", str(len(body))),
+        ]
+        with lock:
+            connection.send_headers(stream_id, headers)
+            sent = 0
+            while sent < len(body):
+                size = min(
+                    connection.local_flow_control_window(stream_id),
+                    connection.max_outbound_frame_size,
+                    len(body) - sent,
+                )
+                if size <= 0:
+                    self._flush(sock, connection)
+                    lock.wait(1)
+                    continue
+                end = sent + size
+                connection.send_data(stream_id, body[sent:end])
+                sent = end
+            connection.end_stream(stream_id)
+            self._flush(sock, connection)
+
+    def _flush(self, sock, connection):
+        try:
+            sock.sendall(connection.data_to_send())
+        except OSError:
+            pass
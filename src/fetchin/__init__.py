@@ -1,5 +1,57 @@
-from .fetcher import Fetcher
-from .logging import CustomLogger
-from .metrics import PrometheusMetrics, MetricsInterface
+from .lazy_import import lazy_exports
 
-__all__ = ["Fetcher", "CustomLogger", "PrometheusMetrics", "MetricsInterface"]
+_EXPORTS = {
+    "Fetcher": ".fetcher",
+    "AsyncFetcher": ".fetcher",
+    "AdaptiveConcurrencyLimiter": ".fetcher",
+    "BackoffStrategy": ".fetcher",
+    "CircuitBreakerConfigError": ".fetcher",
+    "CircuitBreakerRegistry": ".fetcher",
+    "ConcurrencyLimitExceeded": ".fetcher",
+    "DecorrelatedJitterBackoff": ".fetcher",
+    "ExponentialBackoff": ".fetcher",
+    "FullJitterBackoff": ".fetcher",
+    "HedgeConfigError": ".fetcher",
+    "HedgePolicy": ".fetcher",
+    "LoadBalancer": ".fetcher",
+    "PaginationStrategy": ".fetcher",
+    "LinkHeaderPagination": ".fetcher",
+    "CursorPagination": ".fetcher",
+    "OffsetPagination": ".fetcher",
+    "Outbox": ".fetcher",
+    "OutboxFull": ".fetcher",
+    "MemoryOutboxStorage": ".fetcher",
+    "FileOutboxStorage": ".fetcher",
+    "SQLiteOutboxStorage": ".fetcher",
+    "MemoryStateStorage": ".fetcher",
+    "MmapStateStorage": ".fetcher",
+    "RedisStateStorage": ".fetcher",
+    "RateLimitConfigError": ".fetcher",
+    "RateLimitExceeded": ".fetcher",
+    "ResponseTooLarge": ".fetcher",
+    "StreamingResponse": ".fetcher",
+    "TokenBucket": ".fetcher",
+    "ResponseCache": ".cache",
+    "MemoryCache": ".cache",
+    "SQLiteCache": ".cache",
+    "CacheInterface": ".cache",
+    "CustomLogger": ".logging",
+    "HookInterface": ".hooks",
+    "RequestContext": ".hooks",
+    "OpenTelemetryHooks": ".hooks",
+    "CodecInterface": ".codecs",
+    "JSONCodec": ".codecs",
+    "MsgpackCodec": ".codecs",
+    "BytesCodec": ".codecs",
+    "BodySerializer": ".codecs",
+    "PrometheusMetrics": ".metrics",
+    "MetricsInterface": ".metrics",
+    "TransportInterface": ".transports",
+    "HTTPTransport": ".transports",
+    "HTTP2Transport": ".transports",
+    "MemoryTransport": ".transports",
+    "RecordReplayTransport": ".transports",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
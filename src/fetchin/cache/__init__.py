@@ -0,0 +1,12 @@
+from ..lazy_import import lazy_exports
+
+_EXPORTS = {
+    "CacheInterface": ".cache_interface",
+    "CacheEntry": ".cache_entry",
+    "MemoryCache": ".memory_cache",
+    "SQLiteCache": ".sqlite_cache",
+    "ResponseCache": ".response_cache",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,58 @@
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CacheEntry:
+    def __init__(
+        self,
+        status_code: int,
+        headers: dict,
+        content: bytes,
+        url: str,
+        encoding: str = None,
+        stored_at: float = None,
+        expires_at: float = None,
+    ):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.url = url
+        self.encoding = encoding
+        self.stored_at = stored_at if stored_at is not None else time.time()
+        self.expires_at = expires_at if expires_at is not None else self.stored_at
+
+    @classmethod
+    def from_response(cls, response, expires_at: float = None):
+        return cls(
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=response.content,
+            url=response.url,
+            encoding=response.encoding,
+            expires_at=expires_at,
+        )
+
+    @property
+    def size(self):
+        return len(self.content) + sum(
+            len(name) + len(value) for name, value in self.headers.items()
+        )
+
+    @property
+    def is_fresh(self):
+        return time.time() < self.expires_at
+
+    @property
+    def has_validators(self):
+        return "ETag" in self.headers or "Last-Modified" in self.headers
+
+    def to_response(self):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.url = self.url
+        response.encoding = self.encoding
+        return response
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class CacheInterface(ABC):
+    @abstractmethod
+    def get(self, key: str):
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
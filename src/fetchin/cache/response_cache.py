@@ -0,0 +1,166 @@
+import hashlib
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .cache_entry import CacheEntry
+from .cache_interface import CacheInterface
+from .memory_cache import MemoryCache
+
+CACHEABLE_STATUSES = (200, 203)
+REPRESENTATION_HEADERS = ("content-length", "content-encoding", "transfer-encoding")
+CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+
+def parse_cache_control(value: str):
+    directives = {}
+    for directive in (value or "").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def _parse_http_date(value: str):
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed.timestamp() if parsed else None
+
+
+def _vary_names(headers):
+    return sorted(
+        {name.strip().lower() for name in (headers.get("Vary") or "").split(",")} - {""}
+    )
+
+
+def _request_headers(headers):
+    # Caller headers are plain dicts, their names may be in any case
+    if isinstance(headers, CaseInsensitiveDict):
+        return headers
+    return CaseInsensitiveDict(headers or {})
+
+
+def _header_digest(headers, names):
+    # Hashed so that credentials never end up in a persistent backend's keys
+    headers = _request_headers(headers)
+    values = [(name, headers.get(name)) for name in names]
+    return hashlib.sha256(repr(values).encode()).hexdigest()[:32]
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        backend: CacheInterface = None,
+        default_ttl: float = 0,
+        methods: tuple = ("GET", "HEAD"),
+    ):
+        self.backend = backend or MemoryCache()
+        self.default_ttl = default_ttl
+        self.methods = methods
+
+    def key(self, method: str, url: str, params=None, headers: dict = None):
+        prepared = requests.Request(method, url, params=params).prepare()
+        key = f"{method}:{prepared.url}"
+        headers = _request_headers(headers)
+        if any(name in headers for name in CREDENTIAL_HEADERS):
+            key = f"{key}#{_header_digest(headers, CREDENTIAL_HEADERS)}"
+        return key
+
+    def _variant_key(self, key: str, headers: dict, vary):
+        return f"{key}|{_header_digest(headers, vary)}"
+
+    def is_cacheable_request(self, method: str, headers: dict = None):
+        request_directives = parse_cache_control(
+            _request_headers(headers).get("Cache-Control")
+        )
+        return method in self.methods and "no-store" not in request_directives
+
+    def get(self, key: str, headers: dict = None):
+        entry = self.backend.get(key)
+        vary = entry and _vary_names(entry.headers)
+        if vary:
+            # The entry under the plain key only records which request headers
+            # the response varies on, the response is stored per variant
+            entry = self.backend.get(self._variant_key(key, headers, vary))
+        if entry is None:
+            return None, False
+
+        request_directives = parse_cache_control(
+            _request_headers(headers).get("Cache-Control")
+        )
+        return entry, entry.is_fresh and "no-cache" not in request_directives
+
+    def conditional_headers(self, entry: CacheEntry):
+        headers = {}
+        if "ETag" in entry.headers:
+            headers["If-None-Match"] = entry.headers["ETag"]
+        if "Last-Modified" in entry.headers:
+            headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        return headers
+
+    def freshness_lifetime(self, headers):
+        directives = parse_cache_control(headers.get("Cache-Control"))
+        if "no-cache" in directives:
+            return 0
+        if directives.get("max-age") is not None:
+            try:
+                return max(int(directives["max-age"]), 0)
+            except ValueError:
+                return 0
+
+        expires = _parse_http_date(headers.get("Expires"))
+        if expires is not None:
+            date = _parse_http_date(headers.get("Date")) or time.time()
+            return max(expires - date, 0)
+
+        return self.default_ttl
+
+    def current_age(self, headers):
+        try:
+            return max(int(headers.get("Age") or 0), 0)
+        except ValueError:
+            return 0
+
+    def _expires_at(self, headers, stored_at: float):
+        return stored_at + self.freshness_lifetime(headers) - self.current_age(headers)
+
+    def store(self, key: str, response, headers: dict = None):
+        directives = parse_cache_control(response.headers.get("Cache-Control"))
+        if response.status_code not in CACHEABLE_STATUSES or "no-store" in directives:
+            return None
+        vary = _vary_names(response.headers)
+        if "*" in vary:
+            return None
+
+        entry = CacheEntry.from_response(
+            response, expires_at=self._expires_at(response.headers, time.time())
+        )
+        if not entry.is_fresh and not entry.has_validators:
+            return None
+
+        if vary:
+            marker = CacheEntry(
+                response.status_code, {"Vary": response.headers["Vary"]}, b"", entry.url
+            )
+            self.backend.set(key, marker)
+            key = self._variant_key(key, headers, vary)
+        self.backend.set(key, entry)
+        return entry
+
+    def revalidate(self, key: str, entry: CacheEntry, response, headers: dict = None):
+        entry.headers.update(
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in REPRESENTATION_HEADERS
+        )
+        entry.stored_at = time.time()
+        entry.expires_at = self._expires_at(entry.headers, entry.stored_at)
+        vary = _vary_names(entry.headers)
+        if vary:
+            key = self._variant_key(key, headers, vary)
+        self.backend.set(key, entry)
+        return entry
@@ -0,0 +1,81 @@
+import json
+import sqlite3
+import threading
+import time
+
+from .cache_entry import CacheEntry
+from .cache_interface import CacheInterface
+
+
+class SQLiteCache(CacheInterface):
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, "
+            "content BLOB, url TEXT, encoding TEXT, stored_at REAL, "
+            "expires_at REAL, accessed_at REAL)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, headers, content, url, encoding, stored_at, "
+                "expires_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._connection.commit()
+
+        status_code, headers, content, url, encoding, stored_at, expires_at = row
+        return CacheEntry(
+            status_code=status_code,
+            headers=json.loads(headers),
+            content=content,
+            url=url,
+            encoding=encoding,
+            stored_at=stored_at,
+            expires_at=expires_at,
+        )
+
+    def set(self, key: str, entry):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.status_code,
+                    json.dumps(dict(entry.headers)),
+                    entry.content,
+                    entry.url,
+                    entry.encoding,
+                    entry.stored_at,
+                    entry.expires_at,
+                    time.time(),
+                ),
+            )
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._connection.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,12 @@
+from ..lazy_import import lazy_exports
+
+_EXPORTS = {
+    "CodecInterface": ".codec_interface",
+    "JSONCodec": ".json_codec",
+    "MsgpackCodec": ".msgpack_codec",
+    "BytesCodec": ".bytes_codec",
+    "BodySerializer": ".body_serializer",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,69 @@
+from requests.structures import CaseInsensitiveDict
+
+from .bytes_codec import BytesCodec
+from .codec_interface import CodecInterface
+from .compression import COMPRESSION_ENCODINGS, DEFAULT_MIN_SIZE, compress
+from .json_codec import JSONCodec
+from .msgpack_codec import MsgpackCodec, msgpack
+
+CODECS = {"json": JSONCodec, "msgpack": MsgpackCodec, "bytes": BytesCodec}
+
+
+def resolve_codec(codec) -> CodecInterface:
+    if isinstance(codec, CodecInterface):
+        return codec
+    if codec not in CODECS:
+        raise ValueError(f"Unknown body codec: {codec}")
+    return CODECS[codec]()
+
+
+def wire_size(response, default: int):
+    downloaded = getattr(response, "num_bytes_downloaded", None)
+    if downloaded is None:
+        tell = getattr(getattr(response, "raw", None), "tell", None)
+        downloaded = tell() if tell else None
+    return default if not downloaded else downloaded
+
+
+class BodySerializer:
+    def __init__(
+        self,
+        codec="json",
+        encoding: str = None,
+        min_size: int = DEFAULT_MIN_SIZE,
+        level: int = None,
+    ):
+        if encoding is not None and encoding not in COMPRESSION_ENCODINGS:
+            raise ValueError(f"Unknown compression encoding: {encoding}")
+        self.codec = resolve_codec(codec)
+        self.encoding = encoding
+        self.min_size = min_size
+        self.level = level
+        self._decoders = [self.codec, JSONCodec()]
+        if msgpack is not None:
+            self._decoders.append(MsgpackCodec())
+
+    @classmethod
+    def from_config(cls, codec=None, compression_config: dict = None):
+        return cls(codec or "json", **(compression_config or {}))
+
+    def encode(self, data, headers: dict = None):
+        codec = self.codec
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            codec, data = BytesCodec(), bytes(data)
+
+        body = codec.encode(data)
+        size = len(body)
+        headers = CaseInsensitiveDict(headers or {})
+        if codec is self.codec:
+            headers.setdefault("Content-Type", codec.content_type)
+        if self.encoding and size >= self.min_size:
+            body = compress(body, self.encoding, self.level)
+            headers["Content-Encoding"] = self.encoding
+        return body, dict(headers), codec.name, size
+
+    def codec_for(self, content_type: str) -> CodecInterface:
+        for codec in self._decoders:
+            if codec.matches(content_type):
+                return codec
+        return BytesCodec()
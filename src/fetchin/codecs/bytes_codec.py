@@ -0,0 +1,19 @@
+from .codec_interface import CodecInterface
+
+
+class BytesCodec(CodecInterface):
+    name = "bytes"
+
+    def __init__(self, content_type: str = "application/octet-stream"):
+        self.content_type = content_type
+
+    def encode(self, data) -> bytes:
+        if isinstance(data, str):
+            return data.encode()
+        return bytes(data)
+
+    def decode(self, content: bytes):
+        return content
+
+    def matches(self, content_type: str):
+        return True
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+
+
+class CodecInterface(ABC):
+    name = ""
+    content_type = "application/octet-stream"
+
+    @abstractmethod
+    def encode(self, data) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, content: bytes):
+        pass
+
+    def matches(self, content_type: str):
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        return media_type == self.content_type
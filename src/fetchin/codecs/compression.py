@@ -0,0 +1,24 @@
+import gzip
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMPRESSION_ENCODINGS = ("gzip", "zstd")
+DEFAULT_MIN_SIZE = 1024
+
+
+def compress(body: bytes, encoding: str, level: int = None):
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6 if level is None else level)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ImportError(
+                "zstd compression requires zstandard, install it with "
+                "'pip install fetchin[zstd]'"
+            )
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(
+            body
+        )
+    raise ValueError(f"Unknown compression encoding: {encoding}")
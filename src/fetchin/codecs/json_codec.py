@@ -0,0 +1,30 @@
+import json
+
+from .codec_interface import CodecInterface
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec(CodecInterface):
+    name = "json"
+    content_type = "application/json"
+
+    def __init__(self, use_orjson: bool = True):
+        self.use_orjson = use_orjson and orjson is not None
+
+    def encode(self, data) -> bytes:
+        if self.use_orjson:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    def decode(self, content: bytes):
+        if self.use_orjson:
+            return orjson.loads(content)
+        return json.loads(content)
+
+    def matches(self, content_type: str):
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        return media_type == self.content_type or media_type.endswith("+json")
@@ -0,0 +1,30 @@
+from .codec_interface import CodecInterface
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class MsgpackCodec(CodecInterface):
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError(
+                "MsgpackCodec requires msgpack, install it with "
+                "'pip install fetchin[msgpack]'"
+            )
+
+    def encode(self, data) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, content: bytes):
+        return msgpack.unpackb(content, raw=False)
+
+    def matches(self, content_type: str):
+        media_type = (content_type or "").split(";")[0].strip().lower()
+        return media_type in MSGPACK_CONTENT_TYPES
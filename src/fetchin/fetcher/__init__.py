@@ -1,3 +1,37 @@
-from .fetcher import Fetcher
+from ..lazy_import import lazy_exports
 
-__all__ = ["Fetcher"]
+_EXPORTS = {
+    "Fetcher": ".fetcher",
+    "AsyncFetcher": ".async_fetcher",
+    "AdaptiveConcurrencyLimiter": ".concurrency_limiter",
+    "BackoffStrategy": ".backoff",
+    "CircuitBreakerConfigError": ".circuit_registry",
+    "CircuitBreakerRegistry": ".circuit_registry",
+    "ConcurrencyLimitExceeded": ".concurrency_limiter",
+    "DecorrelatedJitterBackoff": ".backoff",
+    "ExponentialBackoff": ".backoff",
+    "FullJitterBackoff": ".backoff",
+    "HedgeConfigError": ".hedging",
+    "HedgePolicy": ".hedging",
+    "LoadBalancer": ".load_balancer",
+    "PaginationStrategy": ".pagination",
+    "LinkHeaderPagination": ".pagination",
+    "CursorPagination": ".pagination",
+    "OffsetPagination": ".pagination",
+    "Outbox": ".outbox",
+    "OutboxFull": ".outbox_storage",
+    "MemoryOutboxStorage": ".outbox_storage",
+    "FileOutboxStorage": ".outbox_storage",
+    "SQLiteOutboxStorage": ".outbox_storage",
+    "MemoryStateStorage": ".circuit_storage",
+    "MmapStateStorage": ".circuit_storage",
+    "RedisStateStorage": ".circuit_storage",
+    "RateLimitConfigError": ".rate_limiter",
+    "RateLimitExceeded": ".rate_limiter",
+    "ResponseTooLarge": ".streaming",
+    "StreamingResponse": ".streaming",
+    "TokenBucket": ".rate_limiter",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,310 @@
+import asyncio
+import contextlib
+import time
+
+import pybreaker
+from ..metrics import MetricsInterface
+from .base import BaseFetcher
+from .concurrency_limiter import ConcurrencyLimitExceeded, is_overloaded
+from .pagination import DEFAULT_PREFETCH, aiter_pages, resolve_pagination
+from .rate_limiter import RateLimitExceeded
+from .singleflight import AsyncSingleFlight, singleflight_key
+from ..transports.http2_transport import httpx_client_options
+from .pool import DEFAULT_POOL_CONFIG
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def create_async_client(pool_config: dict = None):
+    if httpx is None:
+        raise ImportError(
+            "AsyncFetcher requires httpx, install it with 'pip install fetchin[async]'"
+        )
+
+    return httpx.AsyncClient(**httpx_client_options(pool_config))
+
+
+def _noop():
+    yield
+
+
+@contextlib.contextmanager
+def calling(breaker):
+    # Like breaker.calling(), except that a cancelled call is recorded neither
+    # as a failure nor as a success: pybreaker catches BaseException, so a
+    # timed out asyncio.wait_for would otherwise count against the breaker
+    breaker.call(_noop)
+    try:
+        yield
+    except asyncio.CancelledError:
+        raise
+    except BaseException as e:
+        breaker.state._handle_error(e)
+    else:
+        breaker.state._handle_success()
+
+
+class _PhaseTrace:
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.events = {}
+
+    async def __call__(self, event_name: str, info: dict):
+        self.events[event_name] = time.monotonic()
+
+    def _duration(self, step: str):
+        started = self.events.get(f"{step}.started")
+        completed = self.events.get(f"{step}.complete")
+        if started is None or completed is None:
+            return 0.0
+        return completed - started
+
+    def phases(self, queue_time: float):
+        connect = self._duration("connection.connect_tcp") + self._duration(
+            "connection.start_tls"
+        )
+        phases = {"queue": queue_time, "connect": connect}
+
+        sent = self.events.get(
+            "http11.send_request_headers.started"
+        ) or self.events.get("http2.send_request_headers.started")
+        received = self.events.get(
+            "http11.receive_response_headers.complete"
+        ) or self.events.get("http2.receive_response_headers.complete")
+        if sent is not None and received is not None:
+            phases["ttfb"] = received - sent
+            phases["download"] = max(time.monotonic() - received, 0)
+        return phases
+
+
+class AsyncFetcher(BaseFetcher):
+    def __init__(
+        self,
+        label: str,
+        logger=None,
+        metrics: MetricsInterface = None,
+        circuit_config: dict = None,
+        max_retries: int = 3,
+        pool_config: dict = None,
+        rate_limit_config: dict = None,
+        singleflight: bool = False,
+        concurrency_config: dict = None,
+        load_balancer_config: dict = None,
+        codec=None,
+        compression_config: dict = None,
+        hooks: list = None,
+    ):
+        super().__init__(
+            label,
+            logger,
+            metrics,
+            circuit_config,
+            max_retries,
+            rate_limit_config=rate_limit_config,
+            concurrency_config=concurrency_config,
+            load_balancer_config=load_balancer_config,
+            codec=codec,
+            compression_config=compression_config,
+            hooks=hooks,
+        )
+
+        self.singleflight = AsyncSingleFlight() if singleflight else None
+        self.client = create_async_client(pool_config)
+        config = {**DEFAULT_POOL_CONFIG, **(pool_config or {})}
+        self._streams = None
+        if (config["http2"] or config["http2_prior_knowledge"]) and config[
+            "max_streams"
+        ]:
+            self._streams = asyncio.Semaphore(config["max_streams"])
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def _perform_request_with_retries(self, method: str, url: str, **kwargs):
+        start_time, status_code = time.monotonic(), None
+        try:
+            response = await self._perform_attempts(method, url, **kwargs)
+            status_code = response.status_code
+            return response
+        finally:
+            self._track_end_to_end(method, status_code, time.monotonic() - start_time)
+
+    async def _send(self, method: str, url: str, **kwargs):
+        if self._streams is None:
+            return await self.client.request(method, url, **kwargs)
+        async with self._streams:
+            return await self.client.request(method, url, **kwargs)
+
+    async def _perform_attempts(self, method: str, url: str, **kwargs):
+        deadline = self._request_deadline()
+        attempt, delay, tried = 0, None, []
+        context = kwargs.pop("hook_context", None)
+
+        while attempt < self.max_retries:
+            attempt += 1
+            queue_time = await self._acquire_rate_limit(method, url)
+            queue_time += await self._acquire_concurrency(method, url)
+            slot = self._concurrency_slot()
+            try:
+                endpoint, target = self._select_endpoint(url, tried)
+                circuit_breaker = self._circuit_breaker_for(target)
+                attempt_start, trace = time.monotonic(), None
+                if context:
+                    self._start_attempt(context, attempt, target)
+            except BaseException:
+                slot.release()
+                raise
+            if self.metrics:
+                trace = _PhaseTrace()
+                kwargs["extensions"] = {**kwargs.get("extensions", {}), "trace": trace}
+            try:
+                with slot, self._endpoint_slot(endpoint) as pick, calling(
+                    circuit_breaker
+                ):
+                    response = await self._send(method, target, **kwargs)
+                    slot.dropped = is_overloaded(response.status_code)
+                    pick.failed = response.status_code >= 500
+                if context:
+                    self._end_attempt(context, attempt_start, response)
+                self._on_response(
+                    method,
+                    target,
+                    response,
+                    time.monotonic() - attempt_start,
+                    circuit_breaker,
+                )
+                if trace:
+                    self._track_phases(method, trace.phases(queue_time))
+            except pybreaker.CircuitBreakerError as e:
+                if context:
+                    self._end_attempt(context, attempt_start, error=e)
+                self._on_circuit_open(method, target, e)
+                if not self._can_failover(endpoint, attempt, tried):
+                    raise e
+                self._eject_endpoint(endpoint)
+                continue
+            except Exception as e:
+                if context:
+                    self._end_attempt(context, attempt_start, error=e)
+                self._on_attempt_failed(attempt, target, e, circuit_breaker)
+
+                delay = self._retry_delay(attempt, delay)
+                if attempt >= self.max_retries or self._retry_cancelled(
+                    delay, deadline
+                ):
+                    raise e
+            else:
+                if not self._should_retry_response(response):
+                    return response
+
+                delay = self._retry_delay(attempt, delay, response)
+                if attempt >= self.max_retries or self._retry_cancelled(
+                    delay, deadline
+                ):
+                    return response
+                await response.aclose()
+
+            self._track(method, is_retry=True)
+            if context:
+                self._emit("on_retry_scheduled", context, delay)
+            await asyncio.sleep(delay)
+
+    async def _acquire_rate_limit(self, method: str, url: str):
+        if self.rate_limiter is None:
+            return 0
+        try:
+            wait_time = await self.rate_limiter.acquire_async(
+                self.rate_limit_mode, self.rate_limit_timeout
+            )
+        except RateLimitExceeded as e:
+            self._on_rate_limited(method, url, e)
+            raise e
+        self._track_rate_limit(wait_time)
+        return wait_time
+
+    async def _acquire_concurrency(self, method: str, url: str):
+        if self.concurrency_limiter is None:
+            return 0
+        try:
+            wait_time = await self.concurrency_limiter.acquire_async(
+                self.concurrency_mode, self.concurrency_timeout
+            )
+        except ConcurrencyLimitExceeded as e:
+            self._on_concurrency_limited(method, url, e)
+            raise e
+        self._track_concurrency()
+        return wait_time
+
+    async def _handle_request(self, method: str, url: str, **kwargs):
+        self._log_request(method, url)
+        if not self.hooks:
+            return await self._coalesce_request(method, url, **kwargs)
+
+        context = self._start_request(method, url, kwargs)
+        try:
+            response = await self._coalesce_request(method, url, **kwargs)
+        except BaseException as e:
+            self._end_request(context, error=e)
+            raise
+        self._end_request(context, response)
+        return response
+
+    async def _coalesce_request(self, method: str, url: str, **kwargs):
+        key = self.singleflight and singleflight_key(method, url, kwargs)
+        if not key:
+            return await self._perform_request_with_retries(method, url, **kwargs)
+
+        response, shared = await self.singleflight.do(
+            key, lambda: self._perform_request_with_retries(method, url, **kwargs)
+        )
+        if shared:
+            self._on_coalesced(method, url)
+        return response
+
+    def paginate(
+        self,
+        url: str,
+        strategy="link",
+        params: dict = None,
+        max_pages: int = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        **kwargs,
+    ):
+        strategy = resolve_pagination(strategy)
+
+        async def fetch_page(page_url: str, page_params: dict):
+            response = await self.get(page_url, params=page_params, **kwargs)
+            self._track_page(strategy.name)
+            return response
+
+        return aiter_pages(fetch_page, strategy, url, params, max_pages, prefetch)
+
+    async def get(self, url: str, **kwargs):
+        return await self._handle_request("GET", url, **kwargs)
+
+    async def post(self, url: str, data: dict = None, **kwargs):
+        return await self._handle_request(
+            "POST", url, **self._body_kwargs(data, kwargs, "content")
+        )
+
+    async def delete(self, url: str, **kwargs):
+        return await self._handle_request("DELETE", url, **kwargs)
+
+    async def put(self, url: str, data: dict = None, **kwargs):
+        return await self._handle_request(
+            "PUT", url, **self._body_kwargs(data, kwargs, "content")
+        )
+
+    async def patch(self, url: str, data: dict = None, **kwargs):
+        return await self._handle_request(
+            "PATCH", url, **self._body_kwargs(data, kwargs, "content")
+        )
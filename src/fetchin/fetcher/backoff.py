@@ -0,0 +1,78 @@
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+
+
+class BackoffStrategy(ABC):
+    def __init__(self, base: float = 1.0, max_delay: float = None):
+        self.base = base
+        self.max_delay = max_delay
+
+    def _cap(self, delay: float):
+        if self.max_delay is not None:
+            return min(delay, self.max_delay)
+        return delay
+
+    @abstractmethod
+    def next_delay(self, attempt: int, previous: float = None):
+        pass
+
+    def __call__(self, attempt: int):
+        return self.next_delay(attempt)
+
+
+class ExponentialBackoff(BackoffStrategy):
+    def __init__(self, base: float = 1.0, factor: float = 2, max_delay: float = None):
+        super().__init__(base, max_delay)
+        self.factor = factor
+
+    def next_delay(self, attempt: int, previous: float = None):
+        return self._cap(self.base * self.factor**attempt)
+
+
+class FullJitterBackoff(ExponentialBackoff):
+    def next_delay(self, attempt: int, previous: float = None):
+        return random.uniform(0, super().next_delay(attempt))
+
+
+class DecorrelatedJitterBackoff(BackoffStrategy):
+    def next_delay(self, attempt: int, previous: float = None):
+        upper = max((previous or self.base) * 3, self.base)
+        return self._cap(random.uniform(self.base, upper))
+
+
+class CallableBackoff(BackoffStrategy):
+    def __init__(self, func, max_delay: float = None):
+        super().__init__(max_delay=max_delay)
+        self.func = func
+
+    def next_delay(self, attempt: int, previous: float = None):
+        return self._cap(self.func(attempt))
+
+
+def resolve_backoff(strategy, default) -> BackoffStrategy:
+    strategy = strategy or default
+    if isinstance(strategy, BackoffStrategy):
+        return strategy
+    return CallableBackoff(strategy)
+
+
+def parse_retry_after(value: str):
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        pass
+    else:
+        # "inf", "nan" and negative values are not valid delay-seconds
+        return delay if math.isfinite(delay) and delay >= 0 else None
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0)
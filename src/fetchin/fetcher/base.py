@@ -0,0 +1,524 @@
+import threading
+import time
+from datetime import timedelta
+
+import pybreaker
+from ..metrics import MetricsInterface
+from .backoff import parse_retry_after, resolve_backoff
+from .circuit_registry import CircuitBreakerRegistry, CircuitStateListener, breaker_key
+from .concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimitExceeded,
+    LimiterSlot,
+)
+from .hedging import HedgeConfigError, HedgePolicy
+from .load_balancer import EndpointSlot, LoadBalancer
+from .rate_limiter import RateLimitConfigError, RateLimitExceeded, TokenBucket
+
+RETRY_AFTER_STATUSES = (429, 503)
+
+
+class BaseFetcher:
+    circuit_registry = CircuitBreakerRegistry()
+    circuit_breakers = circuit_registry.breakers
+    rate_limiters = {}
+    _rate_limiters_lock = threading.Lock()
+    concurrency_limiters = {}
+    _concurrency_limiters_lock = threading.Lock()
+    load_balancers = {}
+    _load_balancers_lock = threading.Lock()
+    hedge_policies = {}
+    _hedge_policies_lock = threading.Lock()
+
+    def __init__(
+        self,
+        label: str,
+        logger=None,
+        metrics: MetricsInterface = None,
+        circuit_config: dict = None,
+        max_retries: int = 3,
+        rate_limit_config: dict = None,
+        concurrency_config: dict = None,
+        load_balancer_config: dict = None,
+        codec=None,
+        compression_config: dict = None,
+        hooks: list = None,
+    ):
+        self.label = label
+        self.logger = logger
+        self.metrics = metrics
+        self.max_retries = max_retries
+        self.hooks = tuple(hooks or ())
+
+        self._initialize_circuit_breaker(label, circuit_config)
+        self._initialize_retry_policy(circuit_config or {})
+        self.rate_limiter = self._initialize_rate_limiter(label, rate_limit_config)
+        self.concurrency_limiter = self._initialize_concurrency_limiter(
+            label, concurrency_config
+        )
+        self.load_balancer = self._initialize_load_balancer(label, load_balancer_config)
+        self.encode_bodies = codec is not None or bool(compression_config)
+        self._serializer = None
+        if self.encode_bodies:
+            self._serializer = self._create_serializer(codec, compression_config)
+
+    def _initialize_circuit_breaker(self, label: str, circuit_config: dict):
+        config = BaseFetcher.circuit_registry.configure(label, circuit_config)
+        self.circuit_scope = config["scope"]
+        self._circuit_listener = CircuitStateListener(
+            label, self.logger, self.metrics, self.hooks
+        )
+
+    @property
+    def circuit_breaker(self):
+        if self.circuit_scope != "label":
+            return None
+        return self._circuit_breaker_for()
+
+    def _circuit_breaker_for(self, url: str = None):
+        scope = self.circuit_scope
+        if self.load_balancer and scope == "label":
+            scope = "host"
+        return BaseFetcher.circuit_registry.get(
+            self.label,
+            breaker_key(self.label, scope, url),
+            self._circuit_listener,
+        )
+
+    @property
+    def serializer(self):
+        if self._serializer is None:
+            self._serializer = self._create_serializer()
+        return self._serializer
+
+    def _create_serializer(self, codec=None, compression_config: dict = None):
+        from ..codecs.body_serializer import BodySerializer
+
+        return BodySerializer.from_config(codec, compression_config)
+
+    def _body_kwargs(self, data, kwargs: dict, body_arg: str = "data"):
+        if not self.encode_bodies or data is None:
+            return {"json": data, **kwargs}
+
+        start = time.monotonic()
+        body, headers, codec, size = self.serializer.encode(
+            data, kwargs.pop("headers", None)
+        )
+        self._track_body("request", codec, size, len(body), time.monotonic() - start)
+        return {body_arg: body, "headers": headers, **kwargs}
+
+    def decode(self, response):
+        from ..codecs.body_serializer import wire_size
+
+        start = time.monotonic()
+        content = response.content
+        codec = self.serializer.codec_for(response.headers.get("Content-Type"))
+        data = codec.decode(content)
+        self._track_body(
+            "response",
+            codec.name,
+            len(content),
+            wire_size(response, len(content)),
+            time.monotonic() - start,
+        )
+        return data
+
+    def _track_body(
+        self, direction: str, codec: str, size: int, encoded_size: int, duration
+    ):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_body", None)
+            if track_method:
+                track_method(self.label, direction, codec, size, encoded_size, duration)
+
+    def _emit(self, event: str, context, *args):
+        if context.ended and event != "on_request_end":
+            # A losing hedge that is still running after the request ended
+            return
+        for hook in self.hooks:
+            try:
+                getattr(hook, event)(context, *args)
+            except Exception as e:
+                self._on_hook_error(hook, event, context.url, e)
+
+    def _on_hook_error(self, hook, event: str, url: str, error: Exception):
+        self._log(
+            "error",
+            f"Hook {type(hook).__name__}.{event} failed: {error!r}",
+            extra={"url": url, "fetcher_label": self.label},
+        )
+
+    def _start_request(self, method: str, url: str, kwargs: dict):
+        from ..hooks.request_context import RequestContext
+
+        context = RequestContext(self.label, method, url, kwargs.get("headers"))
+        self._emit("on_request_start", context)
+        if context.headers:
+            kwargs["headers"] = context.headers
+        kwargs["hook_context"] = context
+        return context
+
+    def _end_request(self, context, response=None, error=None):
+        duration = time.monotonic() - context.started_at
+        context.end()
+        self._emit("on_request_end", context, response, error, duration)
+
+    def _start_attempt(self, context, attempt: int, target: str):
+        context.attempt, context.target = attempt, target
+        self._emit("on_attempt_start", context)
+
+    def _end_attempt(self, context, started_at: float, response=None, error=None):
+        if response is not None:
+            self._emit("on_response", context, response)
+        duration = time.monotonic() - started_at
+        self._emit("on_attempt_end", context, response, error, duration)
+
+    def _initialize_rate_limiter(self, label: str, rate_limit_config: dict):
+        if not rate_limit_config:
+            return None
+
+        self.rate_limit_mode = rate_limit_config.get("mode", "block")
+        self.rate_limit_timeout = rate_limit_config.get("timeout")
+
+        bucket = TokenBucket(
+            rate=rate_limit_config["rate"], burst=rate_limit_config.get("burst")
+        )
+        with BaseFetcher._rate_limiters_lock:
+            current = BaseFetcher.rate_limiters.setdefault(label, bucket)
+            if (current.rate, current.capacity) != (bucket.rate, bucket.capacity):
+                raise RateLimitConfigError(
+                    f"Rate limiter for {label!r} is already configured with "
+                    f"rate={current.rate}, burst={current.capacity}, got "
+                    f"rate={bucket.rate}, burst={bucket.capacity}"
+                )
+            return current
+
+    def _initialize_concurrency_limiter(self, label: str, concurrency_config: dict):
+        if not concurrency_config:
+            return None
+
+        config = dict(concurrency_config)
+        self.concurrency_mode = config.pop("mode", "reject")
+        self.concurrency_timeout = config.pop("timeout", None)
+
+        with BaseFetcher._concurrency_limiters_lock:
+            if label not in BaseFetcher.concurrency_limiters:
+                BaseFetcher.concurrency_limiters[label] = AdaptiveConcurrencyLimiter(
+                    **config
+                )
+
+            return BaseFetcher.concurrency_limiters[label]
+
+    def _concurrency_slot(self):
+        return LimiterSlot(self.concurrency_limiter, self._track_concurrency)
+
+    def _on_concurrency_limited(
+        self, method: str, url: str, error: ConcurrencyLimitExceeded
+    ):
+        self._log(
+            "error",
+            f"Concurrency limit exceeded: {error}",
+            extra={"url": url, "fetcher_label": self.label},
+        )
+        self._track_concurrency(rejected=True)
+
+    def _track_concurrency(self, rejected: bool = False):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_concurrency", None)
+            if track_method:
+                limiter = self.concurrency_limiter
+                track_method(self.label, limiter.limit, limiter.in_flight, rejected)
+
+    def _initialize_load_balancer(self, label: str, load_balancer_config: dict):
+        if not load_balancer_config:
+            return None
+
+        with BaseFetcher._load_balancers_lock:
+            if label not in BaseFetcher.load_balancers:
+                BaseFetcher.load_balancers[label] = LoadBalancer(**load_balancer_config)
+
+            return BaseFetcher.load_balancers[label]
+
+    def _initialize_hedge_policy(self, label: str, hedge_config: dict):
+        if not hedge_config:
+            return None
+
+        policy = HedgePolicy.from_config(hedge_config, name=f"fetchin-{label}")
+        with BaseFetcher._hedge_policies_lock:
+            current = BaseFetcher.hedge_policies.setdefault(label, policy)
+            if current.settings != policy.settings:
+                raise HedgeConfigError(
+                    f"Hedging for {label!r} is already configured with "
+                    f"{current.settings}, got {policy.settings}"
+                )
+            return current
+
+    def _select_endpoint(self, url: str, tried: list):
+        if self.load_balancer is None or "://" in url:
+            return None, url
+
+        endpoint = self.load_balancer.select(exclude=tried)
+        tried.append(endpoint)
+        self._track_endpoint(endpoint)
+        return endpoint, endpoint.resolve(url)
+
+    def _endpoint_slot(self, endpoint):
+        return EndpointSlot(self.load_balancer, endpoint, self._on_endpoint_released)
+
+    def _on_endpoint_released(self, endpoint, latency: float, ejected: bool):
+        self._track_endpoint(endpoint, latency)
+        if ejected:
+            self._on_endpoint_ejected(endpoint)
+
+    def _can_failover(self, endpoint, attempt: int, tried: list):
+        return (
+            endpoint is not None
+            and attempt < self.max_retries
+            and len(tried) < len(self.load_balancer.endpoints)
+        )
+
+    def _eject_endpoint(self, endpoint):
+        if self.load_balancer.eject(endpoint):
+            self._on_endpoint_ejected(endpoint)
+
+    def _on_endpoint_ejected(self, endpoint):
+        self._log(
+            "error",
+            f"Endpoint {endpoint.name} ejected from the load balancer",
+            extra={"endpoint": endpoint.url, "fetcher_label": self.label},
+        )
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_endpoint_ejection", None)
+            if track_method:
+                track_method(self.label, endpoint.name)
+
+    def _track_endpoint(self, endpoint, latency: float = None):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_endpoint", None)
+            if track_method:
+                track_method(self.label, endpoint.name, endpoint.in_flight, latency)
+
+    def _on_rate_limited(self, method: str, url: str, error: RateLimitExceeded):
+        self._log(
+            "error",
+            f"Rate limit exceeded: {error}",
+            extra={"url": url, "fetcher_label": self.label},
+        )
+        self._track_rate_limit(rejected=True)
+
+    def _track_rate_limit(self, wait_time: float = 0, rejected: bool = False):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_rate_limit", None)
+            if track_method:
+                track_method(self.label, wait_time, rejected)
+
+    def _on_cache_result(self, result: str, url: str):
+        if result == "hit":
+            self._log(
+                "info",
+                "Response served from cache",
+                extra={"url": url, "fetcher_label": self.label},
+            )
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_cache", None)
+            if track_method:
+                track_method(self.label, result)
+
+    def _on_coalesced(self, method: str, url: str):
+        self._log(
+            "debug",
+            "Request coalesced with an in-flight call",
+            extra={"url": url, "fetcher_label": self.label},
+        )
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_coalesced", None)
+            if track_method:
+                track_method(self.label, method)
+
+    def _on_hedge(self, method: str, url: str, result: str):
+        self._log(
+            "debug",
+            f"Hedged request {result}",
+            extra={"url": url, "fetcher_label": self.label},
+        )
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_hedge", None)
+            if track_method:
+                track_method(self.label, method, result)
+
+    def _initialize_retry_policy(self, circuit_config: dict):
+        self.backoff_strategy = resolve_backoff(
+            circuit_config.get("backoff_strategy"), self.default_backoff_strategy
+        )
+        self.max_backoff = circuit_config.get("max_backoff")
+        self.retry_budget = circuit_config.get("retry_budget")
+        self.retry_statuses = frozenset(circuit_config.get("retry_statuses", ()))
+
+    def _request_deadline(self, deadline: float = None):
+        if self.retry_budget is None:
+            return deadline
+        budget_deadline = time.monotonic() + self.retry_budget
+        return budget_deadline if deadline is None else min(deadline, budget_deadline)
+
+    def _should_retry_response(self, response):
+        return response.status_code in self.retry_statuses
+
+    def _retry_delay(self, attempt: int, previous: float = None, response=None):
+        delay = None
+        if response is not None and response.status_code in RETRY_AFTER_STATUSES:
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None:
+            delay = self.backoff_strategy.next_delay(attempt, previous)
+        # A Retry-After past the deadline gives up the retry in _retry_cancelled
+        if self.max_backoff is not None:
+            delay = min(delay, self.max_backoff)
+        return delay
+
+    def _retry_cancelled(self, delay: float, deadline: float, cancel_event=None):
+        if cancel_event is not None and cancel_event.is_set():
+            return True
+        return deadline is not None and time.monotonic() + delay >= deadline
+
+    def _log(self, level: str, message: str, extra=None):
+        if self.logger:
+            log_method = getattr(self.logger, level, None)
+            if log_method:
+                log_method(message, extra=extra)
+
+    def _track(
+        self,
+        method: str,
+        status_code: int = None,
+        response_time: float = None,
+        is_retry: bool = False,
+    ):
+        if self.metrics:
+            if is_retry:
+                self.metrics.track_retry(method)
+                return
+
+            track_method = getattr(self.metrics, "track_labelled_request", None)
+            if track_method:
+                track_method(self.label, method, status_code, response_time)
+            else:
+                self.metrics.track_request(method, status_code, response_time)
+
+    def _track_end_to_end(self, method: str, status_code: int, duration: float):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_end_to_end", None)
+            if track_method:
+                track_method(self.label, method, status_code, duration)
+
+    def _track_phases(self, method: str, phases: dict):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_phase", None)
+            if track_method:
+                for phase, duration in phases.items():
+                    track_method(self.label, method, phase, duration)
+
+    def _response_phases(
+        self,
+        response,
+        attempt_time: float,
+        connect_time: float,
+        queue_time: float,
+        streamed: bool = False,
+    ):
+        phases = {"queue": queue_time, "connect": connect_time}
+        elapsed = getattr(response, "elapsed", None)
+        if isinstance(elapsed, timedelta):
+            headers_time = elapsed.total_seconds()
+            phases["ttfb"] = max(headers_time - connect_time, 0)
+            if not streamed:
+                phases["download"] = max(attempt_time - headers_time, 0)
+        return phases
+
+    def _on_stream_closed(
+        self, method: str, url: str, bytes_received: int, download_time: float
+    ):
+        self._log(
+            "info",
+            f"Stream closed after {bytes_received} bytes",
+            extra={"url": url, "fetcher_label": self.label},
+        )
+        self._track_phases(method, {"download": download_time})
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_bytes_received", None)
+            if track_method:
+                track_method(self.label, method, bytes_received)
+
+    def _track_page(self, strategy: str):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_page", None)
+            if track_method:
+                track_method(self.label, strategy)
+
+    def _track_outbox(self, depth: int, lag: float = None):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_outbox", None)
+            if track_method:
+                track_method(self.label, depth, lag)
+
+    def _on_dead_letter(self, url: str, reason: str, count: int):
+        self._log(
+            "error",
+            f"{count} outbox entries moved to the dead letters: {reason}",
+            extra={"url": url, "fetcher_label": self.label},
+        )
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_outbox_dead_letter", None)
+            if track_method:
+                track_method(self.label, reason, count)
+
+    def _track_pool(self, hit: bool):
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_pool_checkout", None)
+            if track_method:
+                track_method(self.label, hit)
+
+    def _log_request(self, method: str, url: str):
+        self._log(
+            "info",
+            f"{method} request to {url}",
+            extra={"url": url, "fetcher_label": self.label},
+        )
+
+    def _on_response(
+        self, method: str, url: str, response, response_time: float, circuit_breaker
+    ):
+        self._log(
+            "info",
+            f"Response received: {response.status_code}",
+            extra={
+                "url": url,
+                "status_code": response.status_code,
+                "fetcher_label": self.label,
+            },
+        )
+        self._track(method, response.status_code, response_time)
+
+        if circuit_breaker.current_state == pybreaker.STATE_HALF_OPEN:
+            circuit_breaker.close()
+
+    def _on_circuit_open(self, method: str, url: str, error: Exception):
+        self._log(
+            "error",
+            f"Circuit breaker open: {error}",
+            extra={"url": url, "error_message": str(error)},
+        )
+        self._track(method, status_code=500, response_time=0)
+
+    def _on_attempt_failed(
+        self, attempt: int, url: str, error: Exception, circuit_breaker
+    ):
+        self._log(
+            "error",
+            f"Attempt {attempt} failed: {error}",
+            extra={"url": url, "error_message": str(error)},
+        )
+
+        if circuit_breaker.current_state == pybreaker.STATE_HALF_OPEN:
+            circuit_breaker.open()
+
+    def default_backoff_strategy(self, attempt: int):
+        return 2**attempt
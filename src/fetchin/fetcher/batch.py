@@ -0,0 +1,97 @@
+import threading
+import time
+from concurrent.futures import (
+    CancelledError,
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
+)
+
+import pybreaker
+
+BODY_METHODS = ("POST", "PUT", "PATCH")
+
+
+def normalize_request(spec):
+    if isinstance(spec, str):
+        return "GET", spec, {}
+
+    if isinstance(spec, dict):
+        kwargs = dict(spec)
+        method = kwargs.pop("method", "GET")
+        return method.upper(), kwargs.pop("url"), kwargs
+
+    method, url, *rest = spec
+    return method.upper(), url, dict(rest[0]) if rest else {}
+
+
+def run_batch(
+    fetcher,
+    requests,
+    concurrency: int = 10,
+    timeout: float = None,
+    request_timeout: float = None,
+):
+    pending_specs = enumerate(requests)
+    batch_deadline = time.monotonic() + timeout if timeout is not None else None
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix=f"fetchin-{fetcher.label}"
+    )
+    in_flight = {}
+    cancelled_error = None
+
+    def _run(method, url, kwargs):
+        deadline = None
+        if request_timeout is not None:
+            deadline = time.monotonic() + request_timeout
+        if method in BODY_METHODS:
+            # Encoded like fetcher.post(), with the configured codec
+            kwargs = fetcher._body_kwargs(kwargs.pop("data", None), kwargs)
+        return fetcher._handle_request(
+            method, url, deadline=deadline, cancel_event=cancel_event, **kwargs
+        )
+
+    def _submit_next():
+        for index, spec in pending_specs:
+            method, url, kwargs = normalize_request(spec)
+            in_flight[executor.submit(_run, method, url, kwargs)] = index
+            return True
+        return False
+
+    try:
+        while len(in_flight) < concurrency and _submit_next():
+            pass
+
+        while in_flight:
+            remaining = None
+            if batch_deadline is not None:
+                remaining = max(batch_deadline - time.monotonic(), 0)
+
+            done, _ = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                cancel_event.set()
+                cancelled_error = TimeoutError("Batch deadline exceeded")
+                for future in list(in_flight):
+                    yield in_flight.pop(future), cancelled_error
+                break
+
+            for future in done:
+                index = in_flight.pop(future)
+                error = future.exception()
+                if isinstance(error, pybreaker.CircuitBreakerError):
+                    cancel_event.set()
+                    cancelled_error = CancelledError(
+                        f"Batch cancelled, circuit breaker open: {error}"
+                    )
+                yield index, error if error is not None else future.result()
+
+            while not cancel_event.is_set() and len(in_flight) < concurrency:
+                if not _submit_next():
+                    break
+
+        for index, _ in pending_specs:
+            yield index, cancelled_error
+    finally:
+        cancel_event.set()
+        executor.shutdown(wait=False)
@@ -0,0 +1,183 @@
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import pybreaker
+from .circuit_storage import MemoryStateStorage
+
+BREAKER_SCOPES = ("label", "host", "route")
+
+DEFAULT_BREAKER_CONFIG = {
+    "fail_max": 3,
+    "reset_timeout": 60,
+    "scope": "label",
+    "idle_timeout": 600,
+    "state_storage": None,
+}
+
+SWEEP_INTERVAL = 60
+
+
+class CircuitBreakerConfigError(ValueError):
+    pass
+
+
+def breaker_key(label: str, scope, url: str = None):
+    if scope == "label" or url is None:
+        return label
+    if callable(scope):
+        return f"{label}:{scope(url)}"
+
+    parts = urlsplit(url)
+    if scope == "host":
+        return f"{label}:{parts.netloc}"
+    return f"{label}:{parts.netloc}{parts.path or '/'}"
+
+
+class CircuitStateListener(pybreaker.CircuitBreakerListener):
+    def __init__(self, label: str, logger=None, metrics=None, hooks=()):
+        self.label = label
+        self.logger = logger
+        self.metrics = metrics
+        self.hooks = hooks
+
+    def state_change(self, cb, old_state, new_state):
+        state = new_state.name if new_state else None
+        previous_state = old_state.name if old_state else None
+        if self.logger:
+            log_method = getattr(
+                self.logger, "error" if state == pybreaker.STATE_OPEN else "info"
+            )
+            log_method(
+                f"Circuit breaker {cb.name} changed state to {state}",
+                extra={
+                    "fetcher_label": self.label,
+                    "breaker": cb.name,
+                    "previous_state": previous_state,
+                    "state": state,
+                },
+            )
+        if self.metrics:
+            track_method = getattr(self.metrics, "track_circuit_state", None)
+            if track_method:
+                track_method(self.label, cb.name, state)
+        for hook in self.hooks:
+            try:
+                hook.on_circuit_state_change(self.label, cb.name, previous_state, state)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(
+                        f"Hook {type(hook).__name__}.on_circuit_state_change "
+                        f"failed: {e!r}",
+                        extra={"fetcher_label": self.label, "breaker": cb.name},
+                    )
+
+
+class _ListenerSet(pybreaker.CircuitBreakerListener):
+    # Fans state changes out to every fetcher using the breaker, held weakly so
+    # that fetchers which are gone drop out
+    def __init__(self):
+        self._listeners = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def add(self, listener):
+        if listener not in self._listeners:
+            with self._lock:
+                self._listeners.add(listener)
+
+    def state_change(self, cb, old_state, new_state):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener.state_change(cb, old_state, new_state)
+
+
+class CircuitBreakerRegistry:
+    def __init__(self):
+        self.breakers = {}
+        self._listeners = {}
+        self._configs = {}
+        self._labels = {}
+        self._last_used = {}
+        self._next_sweep = 0
+        self._lock = threading.Lock()
+
+    def configure(self, label: str, circuit_config: dict = None):
+        config = self._resolve_config(circuit_config)
+        with self._lock:
+            current = self._configs.get(label)
+            if current is None:
+                self._configs[label] = config
+                return config
+            if circuit_config is not None and config != current:
+                raise CircuitBreakerConfigError(
+                    f"Circuit breaker for {label!r} is already configured "
+                    f"with {current}, got {config}"
+                )
+            return current
+
+    def get(self, label: str, key: str = None, listener=None):
+        key = key or label
+        # Held while the breaker is looked up and touched, so that a sweep
+        # can't evict a breaker that was just handed out
+        with self._lock:
+            breaker = self.breakers.get(key)
+            if breaker is None:
+                breaker = self._create(label, key)
+            if listener is not None:
+                self._listeners[key].add(listener)
+            self._last_used[key] = time.monotonic()
+            return breaker
+
+    def evict_idle(self, now: float = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._evict_idle(now)
+
+    def _create(self, label: str, key: str):
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._evict_idle(now)
+            self._next_sweep = now + SWEEP_INTERVAL
+
+        config = self._configs.get(label) or self._resolve_config(None)
+        listeners = self._listeners[key] = _ListenerSet()
+        breaker = pybreaker.CircuitBreaker(
+            fail_max=config["fail_max"],
+            reset_timeout=config["reset_timeout"],
+            state_storage=(config["state_storage"] or MemoryStateStorage()).create(key),
+            listeners=[listeners],
+            name=key,
+        )
+        self.breakers[key] = breaker
+        self._labels[key] = label
+        return breaker
+
+    def _evict_idle(self, now: float):
+        evicted = []
+        for key, last_used in list(self._last_used.items()):
+            config = self._configs.get(self._labels.get(key))
+            idle_timeout = config and config["idle_timeout"]
+            breaker = self.breakers.get(key)
+            if (
+                idle_timeout is not None
+                and breaker is not None
+                and now - last_used > idle_timeout
+                and breaker.current_state == pybreaker.STATE_CLOSED
+            ):
+                del self.breakers[key]
+                self._listeners.pop(key, None)
+                self._labels.pop(key, None)
+                self._last_used.pop(key, None)
+                evicted.append(key)
+        return evicted
+
+    def _resolve_config(self, circuit_config: dict = None):
+        config = {
+            name: (circuit_config or {}).get(name, default)
+            for name, default in DEFAULT_BREAKER_CONFIG.items()
+        }
+        if config["scope"] not in BREAKER_SCOPES and not callable(config["scope"]):
+            raise ValueError(f"Unknown circuit breaker scope: {config['scope']}")
+        return config
@@ -0,0 +1,158 @@
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pybreaker
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+STATE_CODES = {
+    pybreaker.STATE_CLOSED: 0,
+    pybreaker.STATE_OPEN: 1,
+    pybreaker.STATE_HALF_OPEN: 2,
+}
+STATE_NAMES = {code: state for state, code in STATE_CODES.items()}
+
+# state code, failure counter, opened_at as a UTC timestamp (0 when never opened)
+_SLOT = struct.Struct("=B3xId")
+
+
+class MemoryStateStorage:
+    def create(self, key: str):
+        return pybreaker.CircuitMemoryStorage(state=pybreaker.STATE_CLOSED)
+
+    def __eq__(self, other):
+        return type(other) is type(self)
+
+    def __hash__(self):
+        return hash(type(self))
+
+
+class MmapCircuitStorage(pybreaker.CircuitBreakerStorage):
+    def __init__(self, path: str, state: str = pybreaker.STATE_CLOSED):
+        if fcntl is None:
+            raise ImportError("MmapCircuitStorage requires fcntl (POSIX only)")
+
+        super().__init__("mmap")
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            if os.fstat(self._fd).st_size < _SLOT.size:
+                os.ftruncate(self._fd, _SLOT.size)
+                os.pwrite(self._fd, _SLOT.pack(STATE_CODES[state], 0, 0), 0)
+        self._mmap = mmap.mmap(self._fd, _SLOT.size)
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _update(self, state=None, counter=None, opened_at=None):
+        with self._locked():
+            current = _SLOT.unpack_from(self._mmap, 0)
+            _SLOT.pack_into(
+                self._mmap,
+                0,
+                current[0] if state is None else state,
+                current[1] if counter is None else counter(current[1]),
+                current[2] if opened_at is None else opened_at,
+            )
+
+    @property
+    def state(self):
+        return STATE_NAMES.get(self._mmap[0], pybreaker.STATE_CLOSED)
+
+    @state.setter
+    def state(self, state: str):
+        self._update(state=STATE_CODES[state])
+
+    def increment_counter(self):
+        self._update(counter=lambda value: value + 1)
+
+    def reset_counter(self):
+        self._update(counter=lambda value: 0)
+
+    @property
+    def counter(self):
+        return _SLOT.unpack_from(self._mmap, 0)[1]
+
+    @property
+    def opened_at(self):
+        timestamp = _SLOT.unpack_from(self._mmap, 0)[2]
+        if not timestamp:
+            return None
+        return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+    @opened_at.setter
+    def opened_at(self, value: datetime):
+        self._update(opened_at=(value - datetime(1970, 1, 1)).total_seconds())
+
+    def close(self):
+        if not self._mmap.closed:
+            self._mmap.close()
+            os.close(self._fd)
+
+    def __del__(self):
+        if getattr(self, "_mmap", None) is not None:
+            self.close()
+
+
+class MmapStateStorage:
+    def __init__(self, directory: str = None):
+        if directory is None:
+            shm = "/dev/shm"
+            base = shm if os.path.isdir(shm) else tempfile.gettempdir()
+            directory = os.path.join(base, "fetchin-breakers")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", key)[:64]
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.directory, f"{safe}-{digest}.breaker")
+
+    def create(self, key: str):
+        return MmapCircuitStorage(self.path(key))
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.directory == self.directory
+
+    def __hash__(self):
+        return hash((type(self), self.directory))
+
+
+class RedisStateStorage:
+    def __init__(self, redis, namespace: str = "fetchin"):
+        self.redis = redis
+        self.namespace = namespace
+
+    def create(self, key: str):
+        return pybreaker.CircuitRedisStorage(
+            state=pybreaker.STATE_CLOSED,
+            redis_object=self.redis,
+            namespace=f"{self.namespace}:{key}",
+        )
+
+    def __eq__(self, other):
+        return (
+            type(other) is type(self)
+            and other.redis is self.redis
+            and other.namespace == self.namespace
+        )
+
+    def __hash__(self):
+        return hash((type(self), id(self.redis), self.namespace))
@@ -0,0 +1,210 @@
+import math
+import threading
+import time
+from collections import deque
+
+import pybreaker
+
+CONCURRENCY_LIMIT_MODES = ("block", "wait", "reject")
+LIMIT_ALGORITHMS = ("aimd", "vegas")
+
+
+class ConcurrencyLimitExceeded(Exception):
+    pass
+
+
+def is_overloaded(status_code: int):
+    return status_code == 429 or status_code >= 500
+
+
+class _Waiter:
+    def __init__(self, loop=None):
+        self.loop = loop
+        self.signal = threading.Event() if loop is None else loop.create_future()
+
+    def wake(self):
+        if self.loop is None:
+            self.signal.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.signal)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        algorithm: str = "aimd",
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        latency_threshold: float = None,
+        smoothing: float = 1.0,
+    ):
+        if algorithm not in LIMIT_ALGORITHMS:
+            raise ValueError(f"Unknown concurrency limit algorithm: {algorithm}")
+        if not min_limit <= initial_limit <= max_limit:
+            raise ValueError("initial_limit must be between min_limit and max_limit")
+
+        self.algorithm = algorithm
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.rejected = 0
+        self._limit = float(initial_limit)
+        self._min_latency = None
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def _check_mode(self, mode: str):
+        if mode not in CONCURRENCY_LIMIT_MODES:
+            raise ValueError(f"Unknown concurrency limit mode: {mode}")
+
+    def _try_acquire(self, mode: str, loop=None):
+        with self._lock:
+            if not self._waiters and self.in_flight < self.limit:
+                self.in_flight += 1
+                return None
+            if mode == "reject":
+                self.rejected += 1
+                raise ConcurrencyLimitExceeded("Concurrency limit exceeded")
+
+            waiter = _Waiter(loop)
+            self._waiters.append(waiter)
+            return waiter
+
+    def _abandon(self, waiter: _Waiter):
+        with self._lock:
+            if waiter not in self._waiters:
+                return False
+            self._waiters.remove(waiter)
+            self.rejected += 1
+            return True
+
+    def acquire(self, mode: str = "reject", timeout: float = None):
+        self._check_mode(mode)
+        start = time.monotonic()
+        waiter = self._try_acquire(mode)
+        if waiter is None:
+            return 0
+
+        timeout = timeout if mode == "wait" else None
+        if not waiter.signal.wait(timeout) and self._abandon(waiter):
+            raise ConcurrencyLimitExceeded("Timed out waiting for a concurrency slot")
+        return time.monotonic() - start
+
+    async def acquire_async(self, mode: str = "reject", timeout: float = None):
+        import asyncio
+
+        self._check_mode(mode)
+        start = time.monotonic()
+        waiter = self._try_acquire(mode, asyncio.get_running_loop())
+        if waiter is None:
+            return 0
+
+        timeout = timeout if mode == "wait" else None
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.signal), timeout)
+        except asyncio.TimeoutError:
+            if self._abandon(waiter):
+                raise ConcurrencyLimitExceeded(
+                    "Timed out waiting for a concurrency slot"
+                )
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                self.release()
+            raise
+        return time.monotonic() - start
+
+    def release(self, latency: float = None, dropped: bool = None):
+        with self._lock:
+            if dropped is not None:
+                self._update_limit(latency, dropped)
+            self.in_flight -= 1
+
+            while self._waiters and self.in_flight < self.limit:
+                self.in_flight += 1
+                self._waiters.popleft().wake()
+
+    def _update_limit(self, latency: float, dropped: bool):
+        if self.latency_threshold is not None and latency > self.latency_threshold:
+            dropped = True
+
+        if self.algorithm == "aimd":
+            new_limit = self._aimd_limit(dropped)
+        else:
+            new_limit = self._vegas_limit(latency, dropped)
+
+        new_limit = (1 - self.smoothing) * self._limit + self.smoothing * new_limit
+        self._limit = min(max(new_limit, self.min_limit), self.max_limit)
+
+    def _aimd_limit(self, dropped: bool):
+        if dropped:
+            return self._limit * self.backoff_ratio
+        if self.in_flight * 2 >= self._limit:
+            return self._limit + 1
+        return self._limit
+
+    def _vegas_limit(self, latency: float, dropped: bool):
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+
+        step = max(math.log10(self._limit), 1)
+        if dropped:
+            return self._limit - step
+        if self.in_flight * 2 < self._limit or latency <= 0:
+            return self._limit
+
+        queue_size = self._limit * (1 - self._min_latency / latency)
+        if queue_size <= step:
+            return self._limit + 2 * step
+        if queue_size < 3 * step:
+            return self._limit + step
+        if queue_size > 6 * step:
+            return self._limit - step
+        return self._limit
+
+
+class LimiterSlot:
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter = None, on_release=None):
+        self.limiter = limiter
+        self.on_release = on_release
+        self.dropped = False
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.limiter is None:
+            return
+
+        if exc_type is None:
+            self.limiter.release(time.monotonic() - self.start, self.dropped)
+        elif issubclass(exc_type, pybreaker.CircuitBreakerError) or not issubclass(
+            exc_type, Exception
+        ):
+            self.limiter.release()
+        else:
+            self.limiter.release(time.monotonic() - self.start, True)
+        if self.on_release:
+            self.on_release()
+
+    def release(self):
+        # Gives the slot back without a sample when the request never started
+        if self.limiter is None:
+            return
+        self.limiter.release()
+        if self.on_release:
+            self.on_release()
@@ -1,12 +1,25 @@
-import requests
 import pybreaker
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, CancelledError, wait
+from typing import TYPE_CHECKING
 from ..metrics import MetricsInterface
+from ..transports import HTTPTransport, TransportInterface
+from .base import BaseFetcher
+from .batch import run_batch
+from .concurrency_limiter import ConcurrencyLimitExceeded, is_overloaded
+from .hedging import CancelEvent
+from .pagination import DEFAULT_PREFETCH, iter_pages, resolve_pagination
+from .rate_limiter import RateLimitExceeded
+from .pool import connect_time, reset_connect_time
+from .singleflight import SingleFlight, singleflight_key
+from .streaming import DEFAULT_CHUNK_SIZE, StreamingResponse
 
+if TYPE_CHECKING:  # pragma: no cover
+    from ..cache import ResponseCache
 
-class Fetcher:
-    circuit_breakers = {}
 
+class Fetcher(BaseFetcher):
     def __init__(
         self,
         label: str,
@@ -14,126 +27,421 @@ class Fetcher:
         metrics: MetricsInterface = None,
         circuit_config: dict = None,
         max_retries: int = 3,
+        pool_config: dict = None,
+        rate_limit_config: dict = None,
+        cache: "ResponseCache" = None,
+        singleflight: bool = False,
+        hedge_config: dict = None,
+        concurrency_config: dict = None,
+        transport: TransportInterface = None,
+        load_balancer_config: dict = None,
+        codec=None,
+        compression_config: dict = None,
+        hooks: list = None,
+        outbox_config: dict = None,
     ):
-        self.label = label
-        self.logger = logger
-        self.metrics = metrics
-        self.max_retries = max_retries
-
-        self.circuit_breaker = self._initialize_circuit_breaker(label, circuit_config)
-
-    def _initialize_circuit_breaker(self, label: str, circuit_config: dict):
-        default_config = {
-            "fail_max": 3,
-            "reset_timeout": 60,
-        }
-
-        if circuit_config:
-            default_config.update(circuit_config)
-
-        if label not in Fetcher.circuit_breakers:
-            Fetcher.circuit_breakers[label] = pybreaker.CircuitBreaker(
-                fail_max=default_config["fail_max"],
-                reset_timeout=default_config["reset_timeout"],
-                state_storage=pybreaker.CircuitMemoryStorage(
-                    state=pybreaker.STATE_CLOSED
-                ),
-            )
+        super().__init__(
+            label,
+            logger,
+            metrics,
+            circuit_config,
+            max_retries,
+            rate_limit_config=rate_limit_config,
+            concurrency_config=concurrency_config,
+            load_balancer_config=load_balancer_config,
+            codec=codec,
+            compression_config=compression_config,
+            hooks=hooks,
+        )
+
+        self.cache = cache
+        self.outbox_config = outbox_config
+        self._outbox = None
+        self._outbox_lock = threading.Lock()
+        self.singleflight = SingleFlight() if singleflight else None
+        self.transport = transport or self._create_transport(pool_config)
+
+        self.hedge_policy = self._initialize_hedge_policy(label, hedge_config)
+
+    def _create_transport(self, pool_config: dict = None):
+        config = pool_config or {}
+        if config.get("http2") or config.get("http2_prior_knowledge"):
+            from ..transports.http2_transport import HTTP2Transport
+
+            return HTTP2Transport(pool_config)
+        return HTTPTransport(pool_config, on_checkout=self._track_pool)
+
+    @property
+    def session(self):
+        return getattr(self.transport, "session", None)
+
+    @property
+    def outbox(self):
+        if self._outbox is None:
+            with self._outbox_lock:
+                if self._outbox is None:
+                    from .outbox import Outbox
+
+                    self._outbox = Outbox.from_config(self, self.outbox_config or {})
+        return self._outbox
+
+    def __enter__(self):
+        return self
 
-        return Fetcher.circuit_breakers[label]
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def _log(self, level: str, message: str, extra=None):
-        if self.logger:
-            log_method = getattr(self.logger, level, None)
-            if log_method:
-                log_method(message, extra=extra)
+    def close(self):
+        if self._outbox is not None:
+            self._outbox.close()
+        self.transport.close()
 
-    def _track(
+    def _perform_request_with_retries(self, method: str, url: str, **kwargs):
+        start_time, status_code = time.monotonic(), None
+        try:
+            response = self._perform_attempts(method, url, **kwargs)
+            status_code = response.status_code
+            return response
+        finally:
+            self._track_end_to_end(method, status_code, time.monotonic() - start_time)
+
+    def _perform_attempts(
         self,
         method: str,
-        status_code: int = None,
-        response_time: float = None,
-        is_retry: bool = False,
+        url: str,
+        deadline: float = None,
+        cancel_event: threading.Event = None,
+        **kwargs,
     ):
-        if self.metrics:
-            if is_retry:
-                self.metrics.track_retry(method)
-            else:
-                self.metrics.track_request(method, status_code, response_time)
-
-    def _perform_request_with_retries(self, method: str, url: str, **kwargs):
-        attempt, start_time = 0, time.time()
+        deadline = self._request_deadline(deadline)
+        attempt, delay, tried = 0, None, []
+        context = kwargs.pop("hook_context", None)
 
         while attempt < self.max_retries:
             attempt += 1
+            if deadline is not None:
+                kwargs["timeout"] = self._cap_timeout(kwargs.get("timeout"), deadline)
+            queue_time = self._acquire_rate_limit(method, url)
+            queue_time += self._acquire_concurrency(method, url)
+            slot = self._concurrency_slot()
             try:
-                response = self.circuit_breaker.call(
-                    requests.request, method, url, **kwargs
+                endpoint, target = self._select_endpoint(url, tried)
+                circuit_breaker = self._circuit_breaker_for(target)
+                attempt_start = time.monotonic()
+                if context:
+                    self._start_attempt(context, attempt, target)
+                reset_connect_time()
+            except BaseException:
+                slot.release()
+                raise
+            try:
+                with slot, self._endpoint_slot(
+                    endpoint
+                ) as pick, circuit_breaker.calling():
+                    response = self.transport.request(method, target, **kwargs)
+                    slot.dropped = is_overloaded(response.status_code)
+                    pick.failed = response.status_code >= 500
+                attempt_time = time.monotonic() - attempt_start
+                if context:
+                    self._end_attempt(context, attempt_start, response)
+                self._on_response(
+                    method, target, response, attempt_time, circuit_breaker
                 )
-                response_time = time.time() - start_time
-
-                self._log(
-                    "info",
-                    f"Response received: {response.status_code}",
-                    extra={
-                        "url": url,
-                        "status_code": response.status_code,
-                        "fetcher_label": self.label,
-                    },
+                self._track_phases(
+                    method,
+                    self._response_phases(
+                        response,
+                        attempt_time,
+                        connect_time(),
+                        queue_time,
+                        streamed=kwargs.get("stream", False),
+                    ),
                 )
-                self._track(method, response.status_code, response_time)
-
-                if self.circuit_breaker.current_state == pybreaker.STATE_HALF_OPEN:
-                    self.circuit_breaker.close()
-
-                return response
             except pybreaker.CircuitBreakerError as e:
-                self._log(
-                    "error",
-                    f"Circuit breaker open: {e}",
-                    extra={"url": url, "error_message": str(e)},
-                )
-                self._track(method, status_code=500, response_time=0)
-                raise e
+                if context:
+                    self._end_attempt(context, attempt_start, error=e)
+                self._on_circuit_open(method, target, e)
+                if not self._can_failover(endpoint, attempt, tried):
+                    raise e
+                self._eject_endpoint(endpoint)
+                continue
             except Exception as e:
-                self._log(
-                    "error",
-                    f"Attempt {attempt} failed: {e}",
-                    extra={"url": url, "error_message": str(e)},
-                )
-
-                if self.circuit_breaker.current_state == pybreaker.STATE_HALF_OPEN:
-                    self.circuit_breaker.open()
+                if context:
+                    self._end_attempt(context, attempt_start, error=e)
+                self._on_attempt_failed(attempt, target, e, circuit_breaker)
 
-                if attempt < self.max_retries:
-                    # Track retry attempt
-                    self._track(method, is_retry=True)
-                    time.sleep(self.default_backoff_strategy(attempt))
-                else:
+                delay = self._retry_delay(attempt, delay)
+                if attempt >= self.max_retries or self._retry_cancelled(
+                    delay, deadline, cancel_event
+                ):
                     raise e
+            else:
+                if not self._should_retry_response(response):
+                    return response
+
+                delay = self._retry_delay(attempt, delay, response)
+                if attempt >= self.max_retries or self._retry_cancelled(
+                    delay, deadline, cancel_event
+                ):
+                    return response
+                response.close()
+
+            # Track retry attempt
+            self._track(method, is_retry=True)
+            if context:
+                self._emit("on_retry_scheduled", context, delay)
+            if cancel_event is None:
+                time.sleep(delay)
+            elif cancel_event.wait(delay):
+                raise CancelledError(f"Request to {url} was cancelled")
+
+    def _acquire_rate_limit(self, method: str, url: str):
+        if self.rate_limiter is None:
+            return 0
+        try:
+            wait_time = self.rate_limiter.acquire(
+                self.rate_limit_mode, self.rate_limit_timeout
+            )
+        except RateLimitExceeded as e:
+            self._on_rate_limited(method, url, e)
+            raise e
+        self._track_rate_limit(wait_time)
+        return wait_time
+
+    def _acquire_concurrency(self, method: str, url: str):
+        if self.concurrency_limiter is None:
+            return 0
+        try:
+            wait_time = self.concurrency_limiter.acquire(
+                self.concurrency_mode, self.concurrency_timeout
+            )
+        except ConcurrencyLimitExceeded as e:
+            self._on_concurrency_limited(method, url, e)
+            raise e
+        self._track_concurrency()
+        return wait_time
+
+    def _cap_timeout(self, timeout, deadline: float):
+        remaining = max(deadline - time.monotonic(), 0.001)
+        if isinstance(timeout, tuple):
+            return tuple(min(t or remaining, remaining) for t in timeout)
+        return min(timeout or remaining, remaining)
+
+    def _perform_cached_request(self, method: str, url: str, **kwargs):
+        request_headers = kwargs.get("headers")
+        key = self.cache.key(method, url, kwargs.get("params"), request_headers)
+        entry, fresh = self.cache.get(key, request_headers)
+        if fresh:
+            self._on_cache_result("hit", url)
+            return entry.to_response()
+
+        if entry is not None and entry.has_validators:
+            from requests.structures import CaseInsensitiveDict
+
+            headers = CaseInsensitiveDict(request_headers or {})
+            headers.update(self.cache.conditional_headers(entry))
+            kwargs["headers"] = dict(headers)
+
+        response = self._send(method, url, **kwargs)
+        if entry is not None and response.status_code == 304:
+            self._on_cache_result("revalidated", url)
+            entry = self.cache.revalidate(key, entry, response, request_headers)
+            return entry.to_response()
+
+        self._on_cache_result("miss", url)
+        self.cache.store(key, response, request_headers)
+        return response
+
+    def _dispatch_request(self, method: str, url: str, **kwargs):
+        if self.cache and self.cache.is_cacheable_request(
+            method, kwargs.get("headers")
+        ):
+            return self._perform_cached_request(method, url, **kwargs)
+        return self._send(method, url, **kwargs)
+
+    def _send(self, method: str, url: str, **kwargs):
+        if self.hedge_policy and self.hedge_policy.applies_to(method):
+            return self._perform_hedged_request(method, url, **kwargs)
+        return self._perform_request_with_retries(method, url, **kwargs)
+
+    def _perform_hedged_request(self, method: str, url: str, **kwargs):
+        policy = self.hedge_policy
+        policy.record_request()
+        start_time = time.monotonic()
+
+        # The loser stops before its next attempt once the winner is known
+        cancel_event = CancelEvent(kwargs.get("cancel_event"))
+        context = kwargs.get("hook_context")
+        branch_kwargs = {**kwargs, "cancel_event": cancel_event}
+
+        delay, primary = policy.hedge_delay(), None
+        if delay is not None:
+            # None when every primary worker is busy, the request is then
+            # sent from this thread without a hedge
+            primary = policy.submit_primary(
+                self._perform_request_with_retries,
+                method,
+                url,
+                **{**branch_kwargs, "hook_context": context and context.branch()},
+            )
+        if primary is None:
+            response = self._perform_request_with_retries(method, url, **kwargs)
+            policy.observe(time.monotonic() - start_time)
+            return response
+
+        wait([primary], timeout=delay)
+        if primary.done() or not policy.try_acquire_hedge():
+            response = primary.result()
+            policy.observe(time.monotonic() - start_time)
+            return response
+
+        self._on_hedge(method, url, "sent")
+        hedge = policy.submit_hedge(
+            self._perform_request_with_retries,
+            method,
+            url,
+            **{**branch_kwargs, "hook_context": context and context.branch(hedge=True)},
+        )
+
+        winner, pending = None, {primary, hedge}
+        while winner is None and pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary, hedge):
+                if future in done and future.exception() is None:
+                    winner = future
+                    break
+
+        cancel_event.set()
+        if winner is None:
+            raise primary.exception()
+
+        loser = hedge if winner is primary else primary
+        loser.cancel()
+        loser.add_done_callback(_close_response)
+        if winner is hedge:
+            self._on_hedge(method, url, "won")
+        policy.observe(time.monotonic() - start_time)
+        return winner.result()
 
     def _handle_request(self, method: str, url: str, **kwargs):
-        self._log(
-            "info",
-            f"{method} request to {url}",
-            extra={"url": url, "fetcher_label": self.label},
+        self._log_request(method, url)
+        if not self.hooks:
+            return self._coalesce_request(method, url, **kwargs)
+
+        context = self._start_request(method, url, kwargs)
+        try:
+            response = self._coalesce_request(method, url, **kwargs)
+        except BaseException as e:
+            self._end_request(context, error=e)
+            raise
+        self._end_request(context, response)
+        return response
+
+    def _coalesce_request(self, method: str, url: str, **kwargs):
+        key = self.singleflight and singleflight_key(method, url, kwargs)
+        if not key:
+            return self._dispatch_request(method, url, **kwargs)
+
+        response, shared = self.singleflight.do(
+            key, lambda: self._dispatch_request(method, url, **kwargs)
+        )
+        if shared:
+            self._on_coalesced(method, url)
+        return response
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        max_bytes: int = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **kwargs,
+    ):
+        self._log_request(method, url)
+        response = self._perform_request_with_retries(
+            method, url, stream=True, **kwargs
+        )
+        return StreamingResponse(
+            response,
+            max_bytes=max_bytes,
+            chunk_size=chunk_size,
+            on_close=lambda size, duration: self._on_stream_closed(
+                method, url, size, duration
+            ),
+        )
+
+    def paginate(
+        self,
+        url: str,
+        strategy="link",
+        params: dict = None,
+        max_pages: int = None,
+        prefetch: int = DEFAULT_PREFETCH,
+        **kwargs,
+    ):
+        strategy = resolve_pagination(strategy)
+
+        def fetch_page(page_url: str, page_params: dict):
+            response = self.get(page_url, params=page_params, **kwargs)
+            self._track_page(strategy.name)
+            return response
+
+        return iter_pages(
+            fetch_page,
+            strategy,
+            url,
+            params,
+            max_pages,
+            prefetch,
+            thread_name=f"fetchin-paginate-{self.label}",
         )
-        return self._perform_request_with_retries(method, url, **kwargs)
 
-    def default_backoff_strategy(self, attempt: int):
-        return 2**attempt
+    def as_completed(
+        self,
+        requests,
+        concurrency: int = 10,
+        timeout: float = None,
+        request_timeout: float = None,
+    ):
+        return run_batch(self, requests, concurrency, timeout, request_timeout)
+
+    def gather(
+        self,
+        requests,
+        concurrency: int = 10,
+        timeout: float = None,
+        request_timeout: float = None,
+        return_exceptions: bool = False,
+    ):
+        results = {}
+        batch = self.as_completed(requests, concurrency, timeout, request_timeout)
+        for index, result in batch:
+            if isinstance(result, BaseException) and not return_exceptions:
+                batch.close()
+                raise result
+            results[index] = result
+
+        return [results[index] for index in range(len(results))]
+
+    def enqueue(self, method: str, url: str, data=None, **kwargs):
+        self.outbox.enqueue(method, url, data, **kwargs)
 
     def get(self, url: str, **kwargs):
         return self._handle_request("GET", url, **kwargs)
 
     def post(self, url: str, data: dict = None, **kwargs):
-        return self._handle_request("POST", url, json=data, **kwargs)
+        return self._handle_request("POST", url, **self._body_kwargs(data, kwargs))
 
     def delete(self, url: str, **kwargs):
         return self._handle_request("DELETE", url, **kwargs)
 
     def put(self, url: str, data: dict = None, **kwargs):
-        return self._handle_request("PUT", url, json=data, **kwargs)
+        return self._handle_request("PUT", url, **self._body_kwargs(data, kwargs))
 
     def patch(self, url: str, data: dict = None, **kwargs):
-        return self._handle_request("PATCH", url, json=data, **kwargs)
+        return self._handle_request("PATCH", url, **self._body_kwargs(data, kwargs))
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
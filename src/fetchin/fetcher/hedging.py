@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+HEDGE_METHODS = ("GET", "HEAD", "OPTIONS")
+MIN_SAMPLES = 20
+PARENT_POLL_INTERVAL = 0.05
+
+
+class HedgeConfigError(ValueError):
+    pass
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        delay: float = None,
+        percentile: float = None,
+        budget: float = 0.05,
+        methods=HEDGE_METHODS,
+        min_delay: float = 0.005,
+        window: int = 1000,
+        max_workers: int = 32,
+        max_primaries: int = 256,
+        name: str = "fetchin",
+    ):
+        if delay is None and percentile is None:
+            raise ValueError("hedge_config requires a delay or a percentile")
+        if percentile is not None and not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+
+        self.delay = delay
+        self.percentile = percentile
+        self.budget = budget
+        self.methods = frozenset(method.upper() for method in methods)
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+        self.max_primaries = max_primaries
+        self.window = window
+        self._latencies = deque(maxlen=window)
+        self._update_every = max(window // 10, 1)
+        self._since_update = 0
+        self._threshold = None
+        self._requests = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+        # Primaries get their own pool, so that they never queue behind
+        # hedges, and every primary has a worker as long as it holds a slot
+        self._primary_slots = threading.BoundedSemaphore(max_primaries)
+        self._primary_executor = ThreadPoolExecutor(
+            max_workers=max_primaries, thread_name_prefix=f"{name}-primary"
+        )
+        self._hedge_executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-hedge"
+        )
+
+    @classmethod
+    def from_config(cls, hedge_config: dict, name: str = "fetchin"):
+        return cls(**hedge_config, name=name)
+
+    @property
+    def settings(self):
+        return (
+            self.delay,
+            self.percentile,
+            self.budget,
+            self.methods,
+            self.min_delay,
+            self.window,
+            self.max_workers,
+            self.max_primaries,
+        )
+
+    def applies_to(self, method: str):
+        return method.upper() in self.methods
+
+    def hedge_delay(self):
+        if self.percentile is None or self._threshold is None:
+            return self.delay
+        return max(self._threshold, self.min_delay)
+
+    def record_request(self):
+        with self._lock:
+            self._requests += 1
+
+    def try_acquire_hedge(self):
+        with self._lock:
+            if self._hedges + 1 > self.budget * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+    def submit_primary(self, func, *args, **kwargs):
+        # None when every primary worker is busy, the caller then sends the
+        # request itself without a hedge
+        if not self._primary_slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._primary_executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._primary_slots.release()
+            raise
+        future.add_done_callback(lambda _: self._primary_slots.release())
+        return future
+
+    def submit_hedge(self, func, *args, **kwargs):
+        return self._hedge_executor.submit(func, *args, **kwargs)
+
+    def observe(self, latency: float):
+        if self.percentile is None:
+            return
+
+        with self._lock:
+            self._latencies.append(latency)
+            self._since_update += 1
+            if (
+                self._since_update >= self._update_every or self._threshold is None
+            ) and len(self._latencies) >= MIN_SAMPLES:
+                self._since_update = 0
+                ordered = sorted(self._latencies)
+                index = int(len(ordered) * self.percentile / 100)
+                self._threshold = ordered[min(index, len(ordered) - 1)]
+
+
+class CancelEvent(threading.Event):
+    # Also reports cancellation of the request the hedge belongs to, e.g. a batch
+    def __init__(self, parent: threading.Event = None):
+        super().__init__()
+        self.parent = parent
+
+    def is_set(self):
+        return super().is_set() or (self.parent is not None and self.parent.is_set())
+
+    def wait(self, timeout: float = None):
+        if self.parent is None:
+            return super().wait(timeout)
+
+        # Wake up now and then to notice the parent being set
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_set():
+            remaining = PARENT_POLL_INTERVAL
+            if deadline is not None:
+                remaining = min(deadline - time.monotonic(), remaining)
+                if remaining <= 0:
+                    return False
+            super().wait(remaining)
+        return True
@@ -0,0 +1,132 @@
+import math
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pybreaker
+
+BALANCING_STRATEGIES = ("least_outstanding", "ewma")
+
+
+class Endpoint:
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.name = urlsplit(self.url).netloc or self.url
+        self.in_flight = 0
+        self.failures = 0
+        self.ejected_until = 0
+        self.latency = None
+        self._updated_at = None
+
+    def resolve(self, path: str):
+        return f"{self.url}/{path.lstrip('/')}"
+
+    def is_ejected(self, now: float):
+        return self.ejected_until > now
+
+
+class LoadBalancer:
+    def __init__(
+        self,
+        endpoints,
+        strategy: str = "least_outstanding",
+        max_failures: int = 5,
+        ejection_time: float = 30,
+        decay_time: float = 10,
+    ):
+        if not endpoints:
+            raise ValueError("load_balancer_config requires at least one endpoint")
+        if strategy not in BALANCING_STRATEGIES:
+            raise ValueError(f"Unknown load balancing strategy: {strategy}")
+
+        self.endpoints = [Endpoint(url) for url in endpoints]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.ejection_time = ejection_time
+        self.decay_time = decay_time
+        self._lock = threading.Lock()
+
+    def _score(self, endpoint: Endpoint):
+        if self.strategy == "ewma":
+            return (endpoint.latency or 0) * (endpoint.in_flight + 1)
+        return endpoint.in_flight
+
+    def select(self, exclude=()):
+        now = time.monotonic()
+        with self._lock:
+            healthy = [e for e in self.endpoints if not e.is_ejected(now)]
+            candidates = (
+                [e for e in healthy if e not in exclude]
+                or healthy
+                or [e for e in self.endpoints if e not in exclude]
+                or self.endpoints
+            )
+            endpoint = min(candidates, key=lambda e: (self._score(e), random.random()))
+            endpoint.in_flight += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, latency: float = None, failed: bool = None):
+        now = time.monotonic()
+        with self._lock:
+            endpoint.in_flight -= 1
+            if latency is not None and not failed:
+                self._observe(endpoint, latency, now)
+            if failed is None:
+                return False
+            if not failed:
+                endpoint.failures = 0
+                return False
+
+            endpoint.failures += 1
+            if endpoint.failures >= self.max_failures and not endpoint.is_ejected(now):
+                return self._eject(endpoint, now)
+            return False
+
+    def eject(self, endpoint: Endpoint, duration: float = None):
+        now = time.monotonic()
+        with self._lock:
+            if endpoint.is_ejected(now):
+                return False
+            return self._eject(endpoint, now, duration)
+
+    def _eject(self, endpoint: Endpoint, now: float, duration: float = None):
+        endpoint.ejected_until = now + (duration or self.ejection_time)
+        endpoint.failures = 0
+        return True
+
+    def _observe(self, endpoint: Endpoint, latency: float, now: float):
+        if endpoint.latency is None or latency > endpoint.latency:
+            endpoint.latency = latency
+        else:
+            weight = math.exp(-(now - endpoint._updated_at) / self.decay_time)
+            endpoint.latency = endpoint.latency * weight + latency * (1 - weight)
+        endpoint._updated_at = now
+
+
+class EndpointSlot:
+    def __init__(self, balancer: LoadBalancer, endpoint: Endpoint, on_release=None):
+        self.balancer = balancer
+        self.endpoint = endpoint
+        self.on_release = on_release
+        self.failed = False
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.endpoint is None:
+            return
+
+        latency = time.monotonic() - self.start
+        if exc_type is None:
+            ejected = self.balancer.release(self.endpoint, latency, self.failed)
+        elif issubclass(exc_type, pybreaker.CircuitBreakerError) or not issubclass(
+            exc_type, Exception
+        ):
+            ejected = self.balancer.release(self.endpoint)
+        else:
+            ejected = self.balancer.release(self.endpoint, failed=True)
+        if self.on_release:
+            self.on_release(self.endpoint, latency, ejected)
@@ -0,0 +1,172 @@
+import threading
+import time
+
+import pybreaker
+
+from .outbox_storage import MemoryOutboxStorage, OutboxEntry
+
+RETRYABLE_STATUSES = frozenset((408, 425, 429))
+
+
+class Outbox:
+    def __init__(
+        self,
+        fetcher,
+        storage=None,
+        workers: int = 1,
+        batch_size: int = 1,
+        linger: float = 0.0,
+        max_attempts: int = 10,
+        poll_interval: float = 1.0,
+    ):
+        if workers < 1 or batch_size < 1 or max_attempts < 1:
+            raise ValueError("workers, batch_size and max_attempts must be positive")
+
+        self.fetcher = fetcher
+        self.storage = storage if storage is not None else MemoryOutboxStorage()
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._ready = threading.Event()
+        self._closed = threading.Event()
+        self._settled = threading.Condition()
+        self._threads = [
+            threading.Thread(
+                target=self._run,
+                name=f"fetchin-outbox-{fetcher.label}-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        if len(self.storage):
+            self._ready.set()
+
+    @classmethod
+    def from_config(cls, fetcher, outbox_config: dict):
+        return cls(fetcher, **outbox_config)
+
+    @property
+    def depth(self):
+        return len(self.storage)
+
+    def enqueue(self, method: str, url: str, data=None, **kwargs):
+        if self._closed.is_set():
+            raise RuntimeError("Outbox is closed")
+
+        self.storage.put(OutboxEntry(method.upper(), url, data, kwargs))
+        self.fetcher._track_outbox(len(self.storage))
+        self._ready.set()
+
+    def dead_letters(self):
+        return self.storage.dead_letters()
+
+    def flush(self, timeout: float = None):
+        with self._settled:
+            return self._settled.wait_for(lambda: not len(self.storage), timeout)
+
+    def close(self, timeout: float = 5.0):
+        if self._closed.is_set():
+            return
+        self.flush(timeout)
+        self._closed.set()
+        self._ready.set()
+        for thread in self._threads:
+            thread.join()
+        self.storage.close()
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._ready.wait(self.poll_interval)
+            self._ready.clear()
+            if self.linger and len(self.storage) < self.batch_size:
+                self._closed.wait(self.linger)
+
+            while not self._closed.is_set():
+                entries = self.storage.take(self.batch_size, time.time())
+                if not entries:
+                    break
+                if len(entries) == self.batch_size:
+                    # More may be waiting, let idle workers pick them up
+                    self._ready.set()
+                for batch in _group(entries):
+                    try:
+                        self._deliver(batch)
+                    except Exception as e:
+                        # Keep the worker alive, the batch would otherwise stay
+                        # claimed and flush() would never return
+                        self._dead_letter(batch, type(e).__name__)
+
+    def _deliver(self, entries):
+        first = entries[0]
+        data = [e.data for e in entries] if self.batch_size > 1 else first.data
+        kwargs = dict(first.kwargs)
+        try:
+            if data is not None:
+                kwargs = self.fetcher._body_kwargs(data, kwargs)
+        except (TypeError, ValueError):
+            self._dead_letter(entries, "unserializable")
+            return
+
+        try:
+            response = self.fetcher._handle_request(first.method, first.url, **kwargs)
+        except pybreaker.CircuitBreakerError:
+            self._reschedule(entries, "circuit_open", count=False)
+        except Exception as e:
+            self._reschedule(entries, type(e).__name__)
+        else:
+            status_code = response.status_code
+            response.close()
+            if status_code < 400:
+                self.storage.ack(entries)
+                now = time.time()
+                for entry in entries:
+                    self.fetcher._track_outbox(
+                        len(self.storage), now - entry.enqueued_at
+                    )
+            elif (
+                status_code >= 500
+                or status_code in RETRYABLE_STATUSES
+                or status_code in self.fetcher.retry_statuses
+            ):
+                self._reschedule(entries, f"status_{status_code}", response=response)
+            else:
+                self._dead_letter(entries, f"status_{status_code}")
+
+        self._settle()
+
+    def _settle(self):
+        with self._settled:
+            self._settled.notify_all()
+
+    def _reschedule(self, entries, reason: str, response=None, count: bool = True):
+        expired, now = [], time.time()
+        for entry in entries:
+            if count:
+                entry.attempts += 1
+            if entry.attempts >= self.max_attempts:
+                expired.append(entry)
+                continue
+            delay = self.fetcher._retry_delay(max(entry.attempts, 1), None, response)
+            entry.next_attempt_at = now + delay
+
+        if expired:
+            self._dead_letter(expired, reason)
+        retried = [entry for entry in entries if entry not in expired]
+        if retried:
+            self.storage.release(retried)
+
+    def _dead_letter(self, entries, reason: str):
+        self.storage.dead_letter(entries, reason)
+        self.fetcher._on_dead_letter(entries[0].url, reason, len(entries))
+        self.fetcher._track_outbox(len(self.storage))
+        self._settle()
+
+
+def _group(entries):
+    batches = {}
+    for entry in entries:
+        batches.setdefault(entry.batch_key, []).append(entry)
+    return batches.values()
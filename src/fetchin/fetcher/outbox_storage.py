@@ -0,0 +1,384 @@
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class OutboxFull(Exception):
+    pass
+
+
+class OutboxEntry:
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        data=None,
+        kwargs: dict = None,
+        entry_id: int = None,
+        enqueued_at: float = None,
+        attempts: int = 0,
+        next_attempt_at: float = 0.0,
+    ):
+        self.method = method
+        self.url = url
+        self.data = data
+        self.kwargs = kwargs or {}
+        self.entry_id = entry_id
+        self.enqueued_at = enqueued_at if enqueued_at is not None else time.time()
+        self.attempts = attempts
+        self.next_attempt_at = next_attempt_at
+
+    @property
+    def batch_key(self):
+        try:
+            return self.method, self.url, json.dumps(self.kwargs, sort_keys=True)
+        except (TypeError, ValueError):
+            # The memory storage accepts any kwargs (e.g. an auth object),
+            # such entries are delivered on their own
+            return self.method, self.url, id(self)
+
+    def to_dict(self):
+        return {
+            "entry_id": self.entry_id,
+            "method": self.method,
+            "url": self.url,
+            "data": self.data,
+            "kwargs": self.kwargs,
+            "enqueued_at": self.enqueued_at,
+            "attempts": self.attempts,
+            "next_attempt_at": self.next_attempt_at,
+        }
+
+    @classmethod
+    def from_dict(cls, values: dict):
+        return cls(**values)
+
+
+class MemoryOutboxStorage:
+    def __init__(self, max_entries: int = None, max_dead_letters: int = 1000):
+        self.max_entries = max_entries
+        self.max_dead_letters = max_dead_letters
+        self._pending = OrderedDict()
+        self._claimed = set()
+        # Only the most recent dead letters are kept
+        self._dead = deque(maxlen=max_dead_letters)
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def put(self, entry: OutboxEntry):
+        with self._lock:
+            if self.max_entries is not None and len(self._pending) >= self.max_entries:
+                raise OutboxFull(f"Outbox holds {len(self._pending)} entries")
+            entry.entry_id = next(self._ids)
+            self._pending[entry.entry_id] = entry
+
+    def take(self, limit: int, now: float):
+        entries = []
+        with self._lock:
+            for entry_id, entry in self._pending.items():
+                if len(entries) >= limit:
+                    break
+                if entry_id not in self._claimed and entry.next_attempt_at <= now:
+                    entries.append(entry)
+            self._claimed.update(entry.entry_id for entry in entries)
+        return entries
+
+    def ack(self, entries):
+        with self._lock:
+            self._remove(entries)
+
+    def _remove(self, entries):
+        for entry in entries:
+            self._pending.pop(entry.entry_id, None)
+            self._claimed.discard(entry.entry_id)
+
+    def release(self, entries):
+        with self._lock:
+            for entry in entries:
+                self._claimed.discard(entry.entry_id)
+
+    def dead_letter(self, entries, reason: str):
+        with self._lock:
+            self._remove(entries)
+            self._dead.extend((entry, reason) for entry in entries)
+
+    def dead_letters(self):
+        with self._lock:
+            return list(self._dead)
+
+    def close(self):
+        pass
+
+
+class FileOutboxStorage(MemoryOutboxStorage):
+    def __init__(
+        self,
+        path: str,
+        fsync: bool = False,
+        compact_after: int = 1000,
+        max_entries: int = None,
+        max_dead_letters: int = 1000,
+    ):
+        super().__init__(max_entries, max_dead_letters)
+        self.path = path
+        self.fsync = fsync
+        self.compact_after = compact_after
+        self._garbage = 0
+        self._replay()
+        self._compact()
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+
+        last_id = 0
+        with open(self.path, encoding="utf-8") as log:
+            for line in log:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A partially written last line from a crash
+                    continue
+                op = record["op"]
+                if op == "put":
+                    entry = OutboxEntry.from_dict(record["entry"])
+                    self._pending[entry.entry_id] = entry
+                    last_id = max(last_id, entry.entry_id)
+                elif op == "ack":
+                    self._pending.pop(record["entry_id"], None)
+                elif op == "retry":
+                    entry = self._pending.get(record["entry_id"])
+                    if entry is not None:
+                        entry.attempts = record["attempts"]
+                        entry.next_attempt_at = record["next_attempt_at"]
+                elif op == "dead":
+                    entry = OutboxEntry.from_dict(record["entry"])
+                    self._pending.pop(entry.entry_id, None)
+                    self._dead.append((entry, record["reason"]))
+                    last_id = max(last_id, entry.entry_id)
+        self._ids = itertools.count(last_id + 1)
+
+    def _compact(self):
+        records = [{"op": "put", "entry": e.to_dict()} for e in self._pending.values()]
+        records.extend(
+            {"op": "dead", "entry": e.to_dict(), "reason": reason}
+            for e, reason in self._dead
+        )
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as log:
+            log.writelines(json.dumps(record) + "\n" for record in records)
+            log.flush()
+            os.fsync(log.fileno())
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._garbage = 0
+
+    def _append(self, records, garbage: int = 0):
+        self._file.writelines(json.dumps(record) + "\n" for record in records)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        self._garbage += garbage
+        if self._garbage >= self.compact_after:
+            self._file.close()
+            self._compact()
+
+    def put(self, entry: OutboxEntry):
+        with self._lock:
+            super().put(entry)
+            try:
+                self._append([{"op": "put", "entry": entry.to_dict()}])
+            except Exception:
+                self._pending.pop(entry.entry_id, None)
+                raise
+
+    def ack(self, entries):
+        with self._lock:
+            super().ack(entries)
+            records = [{"op": "ack", "entry_id": e.entry_id} for e in entries]
+            self._append(records, garbage=2 * len(records))
+
+    def release(self, entries):
+        with self._lock:
+            super().release(entries)
+            records = [
+                {
+                    "op": "retry",
+                    "entry_id": e.entry_id,
+                    "attempts": e.attempts,
+                    "next_attempt_at": e.next_attempt_at,
+                }
+                for e in entries
+            ]
+            self._append(records, garbage=len(records))
+
+    def dead_letter(self, entries, reason: str):
+        with self._lock:
+            super().dead_letter(entries, reason)
+            records = [
+                {"op": "dead", "entry": e.to_dict(), "reason": reason} for e in entries
+            ]
+            self._append(records, garbage=len(records))
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class SQLiteOutboxStorage:
+    def __init__(
+        self, path: str, max_entries: int = None, max_dead_letters: int = 1000
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_dead_letters = max_dead_letters
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "entry_id INTEGER PRIMARY KEY AUTOINCREMENT, method TEXT, url TEXT, "
+            "data TEXT, kwargs TEXT, enqueued_at REAL, attempts INTEGER, "
+            "next_attempt_at REAL, claimed INTEGER DEFAULT 0)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS dead_letters ("
+            "entry_id INTEGER PRIMARY KEY, method TEXT, url TEXT, data TEXT, "
+            "kwargs TEXT, enqueued_at REAL, attempts INTEGER, reason TEXT, "
+            "failed_at REAL)"
+        )
+        # Entries claimed by workers of a previous process are delivered again
+        self._connection.execute("UPDATE outbox SET claimed = 0")
+        self._connection.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def put(self, entry: OutboxEntry):
+        values = (
+            entry.method,
+            entry.url,
+            json.dumps(entry.data),
+            json.dumps(entry.kwargs),
+            entry.enqueued_at,
+            entry.attempts,
+            entry.next_attempt_at,
+        )
+        with self._lock:
+            if self.max_entries is not None:
+                (depth,) = self._connection.execute(
+                    "SELECT COUNT(*) FROM outbox"
+                ).fetchone()
+                if depth >= self.max_entries:
+                    raise OutboxFull(f"Outbox holds {depth} entries")
+            cursor = self._connection.execute(
+                "INSERT INTO outbox (method, url, data, kwargs, enqueued_at, "
+                "attempts, next_attempt_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                values,
+            )
+            self._connection.commit()
+        entry.entry_id = cursor.lastrowid
+
+    def take(self, limit: int, now: float):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT entry_id, method, url, data, kwargs, enqueued_at, attempts, "
+                "next_attempt_at FROM outbox WHERE claimed = 0 AND "
+                "next_attempt_at <= ? ORDER BY entry_id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self._connection.executemany(
+                "UPDATE outbox SET claimed = 1 WHERE entry_id = ?",
+                [(row[0],) for row in rows],
+            )
+            self._connection.commit()
+
+        return [_row_entry(*row) for row in rows]
+
+    def ack(self, entries):
+        with self._lock:
+            self._connection.executemany(
+                "DELETE FROM outbox WHERE entry_id = ?",
+                [(entry.entry_id,) for entry in entries],
+            )
+            self._connection.commit()
+
+    def release(self, entries):
+        with self._lock:
+            self._connection.executemany(
+                "UPDATE outbox SET claimed = 0, attempts = ?, next_attempt_at = ? "
+                "WHERE entry_id = ?",
+                [(e.attempts, e.next_attempt_at, e.entry_id) for e in entries],
+            )
+            self._connection.commit()
+
+    def dead_letter(self, entries, reason: str):
+        failed_at = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO dead_letters "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        e.entry_id,
+                        e.method,
+                        e.url,
+                        json.dumps(e.data),
+                        json.dumps(e.kwargs),
+                        e.enqueued_at,
+                        e.attempts,
+                        reason,
+                        failed_at,
+                    )
+                    for e in entries
+                ],
+            )
+            self._connection.executemany(
+                "DELETE FROM outbox WHERE entry_id = ?",
+                [(entry.entry_id,) for entry in entries],
+            )
+            if self.max_dead_letters is not None:
+                self._connection.execute(
+                    "DELETE FROM dead_letters WHERE entry_id IN (SELECT entry_id "
+                    "FROM dead_letters ORDER BY failed_at DESC, entry_id DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_dead_letters,),
+                )
+            self._connection.commit()
+
+    def dead_letters(self):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT entry_id, method, url, data, kwargs, enqueued_at, attempts, "
+                "reason FROM dead_letters ORDER BY entry_id"
+            ).fetchall()
+
+        return [(_row_entry(*row[:-1]), row[-1]) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def _row_entry(
+    entry_id, method, url, data, kwargs, enqueued_at, attempts, next_attempt_at=0.0
+):
+    return OutboxEntry(
+        method,
+        url,
+        json.loads(data),
+        json.loads(kwargs),
+        entry_id=entry_id,
+        enqueued_at=enqueued_at,
+        attempts=attempts,
+        next_attempt_at=next_attempt_at,
+    )
@@ -0,0 +1,220 @@
+import contextvars
+import queue
+import threading
+from abc import ABC, abstractmethod
+from urllib.parse import urljoin
+
+DEFAULT_PREFETCH = 1
+_DONE = object()
+
+
+def _field(body, path: str):
+    for key in path.split("."):
+        if not isinstance(body, dict):
+            return None
+        body = body.get(key)
+    return body
+
+
+class PaginationStrategy(ABC):
+    name = "custom"
+
+    def first_request(self, url: str, params: dict = None):
+        return url, params
+
+    @abstractmethod
+    def next_request(self, url: str, params: dict, response):
+        pass
+
+
+class LinkHeaderPagination(PaginationStrategy):
+    name = "link"
+
+    def __init__(self, rel: str = "next"):
+        self.rel = rel
+
+    def next_request(self, url: str, params: dict, response):
+        next_url = response.links.get(self.rel, {}).get("url")
+        if not next_url:
+            return None
+        return urljoin(url, next_url), None
+
+
+class CursorPagination(PaginationStrategy):
+    name = "cursor"
+
+    def __init__(self, cursor_field: str = "next_cursor", cursor_param: str = "cursor"):
+        self.cursor_field = cursor_field
+        self.cursor_param = cursor_param
+
+    def next_request(self, url: str, params: dict, response):
+        cursor = _field(response.json(), self.cursor_field)
+        if not cursor:
+            return None
+        return url, {**(params or {}), self.cursor_param: cursor}
+
+
+class OffsetPagination(PaginationStrategy):
+    name = "offset"
+
+    def __init__(
+        self,
+        limit: int = 100,
+        items_field: str = None,
+        offset_param: str = "offset",
+        limit_param: str = "limit",
+        start: int = 0,
+    ):
+        self.limit = limit
+        self.items_field = items_field
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.start = start
+
+    def first_request(self, url: str, params: dict = None):
+        params = {**(params or {}), self.limit_param: self.limit}
+        params[self.offset_param] = self.start
+        return url, params
+
+    def next_request(self, url: str, params: dict, response):
+        items = response.json()
+        if self.items_field:
+            items = _field(items, self.items_field)
+        if not items or len(items) < self.limit:
+            return None
+        return url, {
+            **params,
+            self.offset_param: params[self.offset_param] + self.limit,
+        }
+
+
+PAGINATION_STRATEGIES = {
+    "link": LinkHeaderPagination,
+    "cursor": CursorPagination,
+    "offset": OffsetPagination,
+}
+
+
+def resolve_pagination(strategy) -> PaginationStrategy:
+    if isinstance(strategy, PaginationStrategy):
+        return strategy
+    if strategy not in PAGINATION_STRATEGIES:
+        raise ValueError(f"Unknown pagination strategy: {strategy}")
+    return PAGINATION_STRATEGIES[strategy]()
+
+
+def _walk(fetch_page, strategy: PaginationStrategy, url, params, max_pages):
+    url, params = strategy.first_request(url, params)
+    pages = 0
+    while url is not None and (max_pages is None or pages < max_pages):
+        response = fetch_page(url, params)
+        pages += 1
+        yield response
+        if response.status_code >= 400:
+            return
+        url, params = strategy.next_request(url, params, response) or (None, None)
+
+
+def iter_pages(
+    fetch_page,
+    strategy: PaginationStrategy,
+    url: str,
+    params: dict = None,
+    max_pages: int = None,
+    prefetch: int = DEFAULT_PREFETCH,
+    thread_name: str = None,
+):
+    pages = _walk(fetch_page, strategy, url, params, max_pages)
+    if not prefetch:
+        yield from pages
+        return
+
+    slots, buffer = threading.Semaphore(prefetch), queue.Queue()
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            while True:
+                slots.acquire()
+                if stopped.is_set():
+                    return
+                page = next(pages, _DONE)
+                if stopped.is_set():
+                    return
+                buffer.put((page, None))
+                if page is _DONE:
+                    return
+        except Exception as e:
+            buffer.put((_DONE, e))
+
+    # Pages are fetched under the caller's context, e.g. its active trace span
+    context = contextvars.copy_context()
+    threading.Thread(
+        target=context.run, args=(produce,), name=thread_name, daemon=True
+    ).start()
+    try:
+        while True:
+            page, error = buffer.get()
+            if error is not None:
+                raise error
+            if page is _DONE:
+                return
+            slots.release()
+            yield page
+    finally:
+        stopped.set()
+        slots.release()
+
+
+async def _awalk(fetch_page, strategy: PaginationStrategy, url, params, max_pages):
+    url, params = strategy.first_request(url, params)
+    pages = 0
+    while url is not None and (max_pages is None or pages < max_pages):
+        response = await fetch_page(url, params)
+        pages += 1
+        yield response
+        if response.status_code >= 400:
+            return
+        url, params = strategy.next_request(url, params, response) or (None, None)
+
+
+async def aiter_pages(
+    fetch_page,
+    strategy: PaginationStrategy,
+    url: str,
+    params: dict = None,
+    max_pages: int = None,
+    prefetch: int = DEFAULT_PREFETCH,
+):
+    import asyncio
+
+    pages = _awalk(fetch_page, strategy, url, params, max_pages)
+    if not prefetch:
+        async for page in pages:
+            yield page
+        return
+
+    slots, buffer = asyncio.Semaphore(prefetch), asyncio.Queue()
+
+    async def produce():
+        try:
+            await slots.acquire()
+            async for page in pages:
+                await buffer.put((page, None))
+                await slots.acquire()
+            await buffer.put((_DONE, None))
+        except Exception as e:
+            await buffer.put((_DONE, e))
+
+    task = asyncio.ensure_future(produce())
+    try:
+        while True:
+            page, error = await buffer.get()
+            if error is not None:
+                raise error
+            if page is _DONE:
+                return
+            slots.release()
+            yield page
+    finally:
+        task.cancel()
@@ -0,0 +1,34 @@
+import threading
+import time
+
+_timings = threading.local()
+
+DEFAULT_POOL_CONFIG = {
+    "pool_connections": 10,
+    "pool_maxsize": 10,
+    "pool_block": False,
+    "keep_alive": True,
+    "idle_timeout": None,
+    "http2": False,
+    "http2_prior_knowledge": False,
+    "max_streams": 100,
+}
+
+
+def reset_connect_time():
+    _timings.connect = 0.0
+
+
+def connect_time():
+    return getattr(_timings, "connect", 0.0)
+
+
+def timed_connect(connect):
+    def _connect():
+        start = time.monotonic()
+        try:
+            return connect()
+        finally:
+            _timings.connect = connect_time() + time.monotonic() - start
+
+    return _connect
@@ -0,0 +1,64 @@
+import threading
+import time
+
+RATE_LIMIT_MODES = ("block", "wait", "reject")
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+class RateLimitConfigError(ValueError):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than zero")
+
+        self.rate = rate
+        self.capacity = burst or max(rate, 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, max_wait: float = None):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            wait = max((1 - self._tokens) / self.rate, 0)
+            if max_wait is not None and wait > max_wait:
+                return None
+
+            self._tokens -= 1
+            return wait
+
+    def _max_wait(self, mode: str, timeout: float = None):
+        if mode not in RATE_LIMIT_MODES:
+            raise ValueError(f"Unknown rate limit mode: {mode}")
+        if mode == "reject":
+            return 0
+        return timeout if mode == "wait" else None
+
+    def acquire(self, mode: str = "block", timeout: float = None):
+        wait = self._reserve(self._max_wait(mode, timeout))
+        if wait is None:
+            raise RateLimitExceeded("Rate limit exceeded")
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, mode: str = "block", timeout: float = None):
+        wait = self._reserve(self._max_wait(mode, timeout))
+        if wait is None:
+            raise RateLimitExceeded("Rate limit exceeded")
+        if wait:
+            import asyncio
+
+            await asyncio.sleep(wait)
+        return wait
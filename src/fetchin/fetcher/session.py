@@ -0,0 +1,94 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+
+from .pool import DEFAULT_POOL_CONFIG, timed_connect
+
+
+class _InstrumentedPoolManager(PoolManager):
+    def __init__(self, on_checkout=None, **kwargs):
+        super().__init__(**kwargs)
+        self.on_checkout = on_checkout
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        self._instrument(pool)
+        return pool
+
+    def _instrument(self, pool):
+        get_conn, new_conn = pool._get_conn, pool._new_conn
+        local = threading.local()
+
+        def _new_conn():
+            local.created = True
+            conn = new_conn()
+            conn.connect = timed_connect(conn.connect)
+            return conn
+
+        def _get_conn(timeout=None):
+            local.created = False
+            conn = get_conn(timeout=timeout)
+            if self.on_checkout:
+                self.on_checkout(not local.created and conn.is_connected)
+            return conn
+
+        pool._new_conn = _new_conn
+        pool._get_conn = _get_conn
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    def __init__(self, idle_timeout: float = None, on_checkout=None, **kwargs):
+        self.idle_timeout = idle_timeout
+        self.on_checkout = on_checkout
+        self._last_used = time.monotonic()
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+        self.poolmanager = _InstrumentedPoolManager(
+            on_checkout=self.on_checkout,
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            **pool_kwargs,
+        )
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            idle_for, self._last_used = now - self._last_used, now
+        if self.idle_timeout is not None and idle_for > self.idle_timeout:
+            self.poolmanager.clear()
+
+    def send(self, request, **kwargs):
+        self._evict_idle()
+        return super().send(request, **kwargs)
+
+
+def create_session(pool_config: dict = None, on_checkout=None) -> requests.Session:
+    config = DEFAULT_POOL_CONFIG.copy()
+    if pool_config:
+        config.update(pool_config)
+
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(
+        idle_timeout=config["idle_timeout"],
+        on_checkout=on_checkout,
+        pool_connections=config["pool_connections"],
+        pool_maxsize=config["pool_maxsize"],
+        pool_block=config["pool_block"],
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    if not config["keep_alive"]:
+        session.headers["Connection"] = "close"
+
+    return session
@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import Future
+
+COALESCIBLE_METHODS = ("GET", "HEAD", "OPTIONS")
+KEY_HEADERS = (
+    "accept",
+    "accept-encoding",
+    "accept-language",
+    "authorization",
+    "cookie",
+)
+BODY_ARGUMENTS = ("data", "json", "files", "content")
+
+
+def singleflight_key(method: str, url: str, kwargs: dict):
+    if method not in COALESCIBLE_METHODS:
+        return None
+    if any(kwargs.get(argument) is not None for argument in BODY_ARGUMENTS):
+        return None
+
+    headers = tuple(
+        sorted(
+            (name.lower(), value)
+            for name, value in (kwargs.get("headers") or {}).items()
+            if name.lower() in KEY_HEADERS
+        )
+    )
+    params = kwargs.get("params")
+    if isinstance(params, dict):
+        params = tuple(sorted(params.items()))
+    return method, url, repr(params), headers
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            return call.result(), True
+
+        try:
+            call.set_result(func())
+        except BaseException as e:
+            call.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return call.result(), False
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, coroutine_func):
+        import asyncio
+
+        task = self._calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = self._calls[key] = asyncio.ensure_future(coroutine_func())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return await asyncio.shield(task), shared
@@ -0,0 +1,81 @@
+import json
+import time
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(Exception):
+    def __init__(self, max_bytes: int, received: int = None):
+        self.max_bytes = max_bytes
+        self.received = received
+        super().__init__(f"Response body exceeds the limit of {max_bytes} bytes")
+
+
+class StreamingResponse:
+    def __init__(
+        self,
+        response,
+        max_bytes: int = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_close=None,
+    ):
+        self.response = response
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.bytes_received = 0
+        self.closed = False
+        self._on_close = on_close
+        self._started = time.monotonic()
+
+        content_length = response.headers.get("Content-Length")
+        if max_bytes is not None and content_length and content_length.isdigit():
+            if int(content_length) > max_bytes:
+                self.close()
+                raise ResponseTooLarge(max_bytes, int(content_length))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def __iter__(self):
+        return self.iter_bytes()
+
+    def iter_bytes(self, chunk_size: int = None):
+        try:
+            for chunk in self.response.iter_content(chunk_size or self.chunk_size):
+                self.bytes_received += len(chunk)
+                if self.max_bytes is not None and self.bytes_received > self.max_bytes:
+                    raise ResponseTooLarge(self.max_bytes, self.bytes_received)
+                yield chunk
+        except BaseException:
+            self.close()
+            raise
+
+    def iter_lines(self, chunk_size: int = None, delimiter: bytes = b"\n"):
+        pending = b""
+        for chunk in self.iter_bytes(chunk_size):
+            lines = (pending + chunk).split(delimiter)
+            pending = lines.pop()
+            for line in lines:
+                yield line.rstrip(b"\r") if delimiter == b"\n" else line
+
+        if pending:
+            yield pending
+
+    def iter_ndjson(self, chunk_size: int = None):
+        for line in self.iter_lines(chunk_size):
+            if line.strip():
+                yield json.loads(line)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.response.close()
+        if self._on_close:
+            self._on_close(self.bytes_received, time.monotonic() - self._started)
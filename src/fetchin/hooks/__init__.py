@@ -0,0 +1,10 @@
+from ..lazy_import import lazy_exports
+
+_EXPORTS = {
+    "HookInterface": ".hook_interface",
+    "RequestContext": ".request_context",
+    "OpenTelemetryHooks": ".opentelemetry_hooks",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,23 @@
+class HookInterface:
+    def on_request_start(self, context):
+        pass
+
+    def on_attempt_start(self, context):
+        pass
+
+    def on_response(self, context, response):
+        pass
+
+    def on_attempt_end(self, context, response, error, duration: float):
+        pass
+
+    def on_retry_scheduled(self, context, delay: float):
+        pass
+
+    def on_request_end(self, context, response, error, duration: float):
+        pass
+
+    def on_circuit_state_change(
+        self, label: str, breaker: str, previous_state: str, state: str
+    ):
+        pass
@@ -0,0 +1,94 @@
+import random
+
+from .hook_interface import HookInterface
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover
+    trace = None
+
+
+class OpenTelemetryHooks(HookInterface):
+    def __init__(self, tracer_provider=None, sample_rate: float = 1.0, propagator=None):
+        if trace is None:
+            raise ImportError(
+                "OpenTelemetryHooks requires opentelemetry-api, install it with "
+                "'pip install fetchin[otel]'"
+            )
+        self.tracer = trace.get_tracer("fetchin", tracer_provider=tracer_provider)
+        self.sample_rate = sample_rate
+        self.propagator = propagator or propagate.get_global_textmap()
+
+    def _sampled(self, parent):
+        if parent.is_valid:
+            return parent.trace_flags.sampled
+        return random.random() < self.sample_rate
+
+    def _unsampled_span(self, parent):
+        if parent.is_valid:
+            return trace.NonRecordingSpan(parent)
+        return trace.NonRecordingSpan(
+            trace.SpanContext(
+                trace_id=random.getrandbits(128) or 1,
+                span_id=random.getrandbits(64) or 1,
+                is_remote=False,
+                trace_flags=trace.TraceFlags(trace.TraceFlags.DEFAULT),
+            )
+        )
+
+    def on_request_start(self, context):
+        parent = trace.get_current_span().get_span_context()
+        if self._sampled(parent):
+            span = self.tracer.start_span(
+                context.method,
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "http.request.method": context.method,
+                    "url.full": context.url,
+                    "fetchin.label": context.label,
+                },
+            )
+            context.data["otel_span"] = span
+        else:
+            span = self._unsampled_span(parent)
+
+        self.propagator.inject(context.headers, context=trace.set_span_in_context(span))
+
+    def on_attempt_start(self, context):
+        span = context.data.get("otel_span")
+        if span is not None and context.attempt > 1:
+            span.set_attribute("http.request.resend_count", context.attempt - 1)
+            span.add_event("retry", {"attempt": context.attempt})
+
+    def on_response(self, context, response):
+        span = context.data.get("otel_span")
+        if span is not None:
+            span.set_attribute("http.response.status_code", response.status_code)
+
+    def on_attempt_end(self, context, response, error, duration: float):
+        span = context.data.get("otel_span")
+        if span is not None and error is not None:
+            span.add_event(
+                "attempt_failed",
+                {"attempt": context.attempt, "error.type": type(error).__name__},
+            )
+
+    def on_retry_scheduled(self, context, delay: float):
+        span = context.data.get("otel_span")
+        if span is not None:
+            span.add_event("retry_scheduled", {"delay": delay})
+
+    def on_request_end(self, context, response, error, duration: float):
+        span = context.data.pop("otel_span", None)
+        if span is None:
+            return
+
+        if error is not None:
+            span.set_attribute("error.type", type(error).__name__)
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        elif response is not None and response.status_code >= 500:
+            span.set_attribute("error.type", str(response.status_code))
+            span.set_status(Status(StatusCode.ERROR))
+        span.end()
@@ -0,0 +1,31 @@
+import copy
+import threading
+import time
+
+
+class RequestContext:
+    def __init__(self, label: str, method: str, url: str, headers: dict = None):
+        self.label = label
+        self.method = method
+        self.url = url
+        self.target = url
+        self.headers = dict(headers or {})
+        self.attempt = 0
+        self.hedge = False
+        self.started_at = time.monotonic()
+        self.data = {}
+        self._ended = threading.Event()
+
+    @property
+    def ended(self):
+        return self._ended.is_set()
+
+    def end(self):
+        self._ended.set()
+
+    def branch(self, hedge: bool = False):
+        # Each branch of a hedged request counts its own attempts, the data and
+        # the end of the request are shared
+        context = copy.copy(self)
+        context.hedge = hedge
+        return context
@@ -1,3 +1,8 @@
-from .logger import CustomLogger
+from ..lazy_import import lazy_exports
 
-__all__ = ["CustomLogger"]
+_EXPORTS = {
+    "CustomLogger": ".logger",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
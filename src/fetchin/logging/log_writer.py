@@ -0,0 +1,154 @@
+import logging
+import queue
+import threading
+
+OVERFLOW_POLICIES = ("drop", "block")
+
+
+class BatchFlushStreamHandler(logging.StreamHandler):
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self.batching = False
+
+    def flush(self):
+        if not self.batching:
+            super().flush()
+
+
+class AsyncLogWriter:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        encode,
+        queue_size: int = 10000,
+        overflow: str = "drop",
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.logger = logger
+        self.encode = encode
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._dropped_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"fetchin-log-writer-{logger.name}", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def put(self, level: int, params: dict):
+        if self._closed.is_set():
+            # Nothing drains the queue any more, write on the caller's thread
+            self._write([(level, params)])
+            return
+
+        if self.overflow == "block":
+            self._put_blocking((level, params))
+        else:
+            try:
+                self._queue.put_nowait((level, params))
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += 1
+        if self._stopped:
+            # close() finished while the record was being queued
+            self._drain()
+
+    def _put_blocking(self, item):
+        while True:
+            try:
+                self._queue.put(item, timeout=self.flush_interval)
+                return
+            except queue.Full:
+                if self._stopped:
+                    self._write([item])
+                    return
+
+    @property
+    def _stopped(self):
+        return self._closed.is_set() and not self._thread.is_alive()
+
+    def flush(self):
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and not self._stopped:
+                self._queue.all_tasks_done.wait(self.flush_interval)
+        self._drain()
+
+    def close(self):
+        if not self._closed.is_set():
+            self._closed.set()
+            self._thread.join()
+        self._drain()
+
+    def _drain(self):
+        if not self._stopped:
+            return
+        batch = self._next_batch(block=False)
+        while batch:
+            self._write_batch(batch)
+            batch = self._next_batch(block=False)
+
+    def _next_batch(self, block: bool = True):
+        try:
+            batch = [self._queue.get(block, self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not (self._closed.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        try:
+            self._write(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch):
+        handlers = [
+            handler
+            for handler in self.logger.handlers
+            if isinstance(handler, BatchFlushStreamHandler)
+        ]
+        # Records put after close() are written by the callers
+        with self._write_lock:
+            for handler in handlers:
+                handler.batching = True
+
+            try:
+                for level, params in batch:
+                    try:
+                        message = self.encode(params)
+                    except (TypeError, ValueError):
+                        with self._dropped_lock:
+                            self.dropped += 1
+                        continue
+                    record = self.logger.makeRecord(
+                        self.logger.name, level, "", 0, message, None, None
+                    )
+                    self.logger.handle(record)
+            finally:
+                for handler in handlers:
+                    handler.batching = False
+                    handler.flush()
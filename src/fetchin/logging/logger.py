@@ -1,13 +1,44 @@
 import logging
 import json
+import weakref
+
+from .log_writer import AsyncLogWriter, BatchFlushStreamHandler
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _json_dumps(params: dict):
+    return json.dumps(params, ensure_ascii=False)
+
+
+def _orjson_dumps(params: dict):
+    return orjson.dumps(params, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Sync mode keeps the stdlib output format, so installing orjson does not
+# change existing log lines
+async_encoder = _orjson_dumps if orjson else _json_dumps
 
 
 class CustomLogger:
-    def __init__(self, name: str = "fetchin", extra_params: dict = None):
+    def __init__(
+        self,
+        name: str = "fetchin",
+        extra_params: dict = None,
+        async_mode: bool = False,
+        queue_size: int = 10000,
+        overflow: str = "drop",
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        encoder=None,
+    ):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
 
-        handler = logging.StreamHandler()
+        handler = BatchFlushStreamHandler()
         handler.setLevel(logging.DEBUG)
         formatter = logging.Formatter("%(message)s")
         handler.setFormatter(formatter)
@@ -16,21 +47,61 @@ class CustomLogger:
             self.logger.addHandler(handler)
 
         self.extra_params = extra_params or {}
+        self.encoder = encoder or (async_encoder if async_mode else _json_dumps)
+
+        self.writer = None
+        if async_mode:
+            self.writer = AsyncLogWriter(
+                self.logger,
+                self.encoder,
+                queue_size=queue_size,
+                overflow=overflow,
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+            )
+            # Closes the writer at exit, or once the logger is garbage
+            # collected, without keeping the logger alive
+            self._finalizer = weakref.finalize(self, self.writer.close)
+
+    @property
+    def queue_depth(self):
+        return self.writer.queue_depth if self.writer else 0
+
+    @property
+    def dropped(self):
+        return self.writer.dropped if self.writer else 0
 
     def _merge_params(self, message: str, extra: dict):
+        return self.encoder(self._build_params(message, extra))
+
+    def _build_params(self, message: str, extra: dict):
         merged = self.extra_params.copy()
         merged.update(extra or {})
         merged["message"] = message
-        return json.dumps(merged, ensure_ascii=False)
+        return merged
+
+    def _emit(self, level: int, message: str, extra: dict):
+        if not self.logger.isEnabledFor(level):
+            return
+        if self.writer:
+            self.writer.put(level, self._build_params(message, extra))
+        else:
+            self.logger.log(level, self._merge_params(message, extra))
 
     def info(self, message: str, extra: dict = None):
-        log_message = self._merge_params(message, extra)
-        self.logger.info(log_message)
+        self._emit(logging.INFO, message, extra)
 
     def error(self, message: str, extra: dict = None):
-        log_message = self._merge_params(message, extra)
-        self.logger.error(log_message)
+        self._emit(logging.ERROR, message, extra)
 
     def debug(self, message: str, extra: dict = None):
-        log_message = self._merge_params(message, extra)
-        self.logger.debug(log_message)
+        self._emit(logging.DEBUG, message, extra)
+
+    def flush(self):
+        if self.writer:
+            self.writer.flush()
+
+    def close(self):
+        if self.writer:
+            self._finalizer.detach()
+            self.writer.close()
@@ -1,5 +1,9 @@
-from .metrics_interface import MetricsInterface
-from .prometheus_metrics import PrometheusMetrics
+from ..lazy_import import lazy_exports
 
+_EXPORTS = {
+    "MetricsInterface": ".metrics_interface",
+    "PrometheusMetrics": ".prometheus_metrics",
+}
 
-__all__ = ["MetricsInterface", PrometheusMetrics]
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,140 @@
+import threading
+from bisect import bisect_left
+
+_UNKNOWN = object()
+
+
+class _ThreadBuffer:
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.lock = threading.Lock()
+        self.increments = {}
+        self.observations = {}
+
+    def drain(self):
+        with self.lock:
+            increments, self.increments = self.increments, {}
+            observations, self.observations = self.observations, {}
+        return increments, observations
+
+
+def _fold_layout(child):
+    # prometheus_client has no public API for adding pre-aggregated
+    # observations. The histogram bucket bounds, () for a summary, or None
+    # when the child does not have the expected private values
+    if not hasattr(getattr(child, "_sum", None), "inc"):
+        return None
+    bounds = getattr(child, "_upper_bounds", None)
+    if bounds is None:
+        return () if hasattr(getattr(child, "_count", None), "inc") else None
+    buckets = getattr(child, "_buckets", None)
+    if not bounds or not isinstance(buckets, list) or len(buckets) != len(bounds):
+        return None
+    return tuple(bounds)
+
+
+def _fold(child, count: int, total: float, buckets):
+    child._sum.inc(total)
+    if buckets is None:
+        child._count.inc(count)
+        return
+    for bucket, bucket_count in zip(child._buckets, buckets):
+        if bucket_count:
+            bucket.inc(bucket_count)
+
+
+class MetricBuffer:
+    def __init__(self, child, flush_interval: float = None):
+        self.child = child
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._layouts = {}
+        self._buffers = []
+        self._buffers_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+
+        if flush_interval:
+            self._thread = threading.Thread(
+                target=self._run, name="fetchin-metrics-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _buffer(self):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = _ThreadBuffer()
+            self._local.buffer = buffer
+            with self._buffers_lock:
+                self._buffers.append(buffer)
+        return buffer
+
+    def inc(self, metric, labels: tuple, amount: float = 1):
+        buffer = self._buffer()
+        key = (metric, labels)
+        with buffer.lock:
+            buffer.increments[key] = buffer.increments.get(key, 0) + amount
+
+    def observe(self, metric, labels: tuple, value: float):
+        # Observations are kept as count, sum and histogram bucket counts, so
+        # memory grows with the number of series rather than of requests.
+        # Children that cannot be folded into are observed right away
+        key = (metric, labels)
+        bounds = self._layouts.get(key, _UNKNOWN)
+        if bounds is _UNKNOWN:
+            bounds = self._layouts[key] = _fold_layout(self.child(metric, labels))
+        if bounds is None:
+            self.child(metric, labels).observe(value)
+            return
+        index = min(bisect_left(bounds, value), len(bounds) - 1) if bounds else None
+
+        buffer = self._buffer()
+        with buffer.lock:
+            aggregate = buffer.observations.get(key)
+            if aggregate is None:
+                buckets = [0] * len(bounds) if bounds else None
+                aggregate = buffer.observations[key] = [0, 0.0, buckets]
+            aggregate[0] += 1
+            aggregate[1] += value
+            if index is not None:
+                aggregate[2][index] += 1
+
+    def flush(self):
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+
+        with self._flush_lock:
+            for buffer in buffers:
+                finished = not buffer.thread.is_alive()
+                increments, observations = buffer.drain()
+                for (metric, labels), amount in increments.items():
+                    self.child(metric, labels).inc(amount)
+                for (metric, labels), aggregate in observations.items():
+                    _fold(self.child(metric, labels), *aggregate)
+
+                if finished:
+                    with self._buffers_lock:
+                        self._buffers.remove(buffer)
+
+    def close(self):
+        if self._thread and not self._closed.is_set():
+            self._closed.set()
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+
+class FlushCollector:
+    def __init__(self, buffer: MetricBuffer):
+        self.buffer = buffer
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        self.buffer.flush()
+        return []
@@ -9,3 +9,68 @@ class MetricsInterface(ABC):
     @abstractmethod
     def track_retry(self, method: str):
         pass
+
+    def track_labelled_request(
+        self, label: str, method: str, status_code: int, response_time: float
+    ):
+        self.track_request(method, status_code, response_time)
+
+    def track_end_to_end(
+        self, label: str, method: str, status_code: int, duration: float
+    ):
+        pass
+
+    def track_phase(self, label: str, method: str, phase: str, duration: float):
+        pass
+
+    def track_pool_checkout(self, label: str, hit: bool):
+        pass
+
+    def track_rate_limit(self, label: str, wait_time: float, rejected: bool):
+        pass
+
+    def track_cache(self, label: str, result: str):
+        pass
+
+    def track_coalesced(self, label: str, method: str):
+        pass
+
+    def track_circuit_state(self, label: str, breaker: str, state: str):
+        pass
+
+    def track_bytes_received(self, label: str, method: str, size: int):
+        pass
+
+    def track_hedge(self, label: str, method: str, result: str):
+        pass
+
+    def track_concurrency(self, label: str, limit: int, in_flight: int, rejected: bool):
+        pass
+
+    def track_endpoint(
+        self, label: str, endpoint: str, in_flight: int, latency: float = None
+    ):
+        pass
+
+    def track_endpoint_ejection(self, label: str, endpoint: str):
+        pass
+
+    def track_page(self, label: str, strategy: str):
+        pass
+
+    def track_body(
+        self,
+        label: str,
+        direction: str,
+        codec: str,
+        size: int,
+        encoded_size: int,
+        duration: float,
+    ):
+        pass
+
+    def track_outbox(self, label: str, depth: int, lag: float = None):
+        pass
+
+    def track_outbox_dead_letter(self, label: str, reason: str, count: int):
+        pass
@@ -1,15 +1,79 @@
-from prometheus_client import Summary, Counter, CollectorRegistry
+from typing import TYPE_CHECKING
 
+from .metric_buffer import FlushCollector, MetricBuffer
+from .metrics_interface import MetricsInterface
+
+if TYPE_CHECKING:  # pragma: no cover
+    from prometheus_client import CollectorRegistry
+
+CIRCUIT_STATE_VALUES = {"closed": 0, "half-open": 1, "open": 2}
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+    float("inf"),
+)
+
+
+class PrometheusMetrics(MetricsInterface):
+    def __init__(
+        self,
+        registry: "CollectorRegistry" = None,
+        histogram: bool = False,
+        buckets: tuple = DEFAULT_BUCKETS,
+        buffered: bool = False,
+        flush_interval: float = None,
+    ):
+        from prometheus_client import CollectorRegistry, Counter, Gauge, Summary
 
-class PrometheusMetrics:
-    def __init__(self, registry: CollectorRegistry = None):
         registry = registry or CollectorRegistry()
+        self.histogram = histogram
+        self.buckets = buckets
+        self._children = {}
+        self.buffer = None
 
-        self.request_time = Summary(
-            "http_request_duration_seconds",
-            "Time spent processing request",
-            ["method", "status_code"],
-            registry=registry,
+        if buffered:
+            self.buffer = MetricBuffer(self._child, flush_interval)
+            registry.register(FlushCollector(self.buffer))
+
+        if histogram:
+            self.request_time = self._duration_metric(
+                "http_request_duration_seconds",
+                "Time spent processing request",
+                ["fetcher_label", "method", "status_code"],
+                registry,
+            )
+        else:
+            self.request_time = Summary(
+                "http_request_duration_seconds",
+                "Time spent processing request",
+                ["method", "status_code"],
+                registry=registry,
+            )
+
+        self.end_to_end_time = self._duration_metric(
+            "http_request_end_to_end_duration_seconds",
+            "Time spent on a request including retries and backoff",
+            ["fetcher_label", "method", "status_code"],
+            registry,
+        )
+
+        self.phase_time = self._duration_metric(
+            "http_request_phase_duration_seconds",
+            "Time spent in each phase of a request attempt",
+            ["fetcher_label", "method", "phase"],
+            registry,
         )
 
         self.request_counter = Counter(
@@ -26,11 +90,289 @@ class PrometheusMetrics:
             registry=registry,
         )
 
-    def track_request(self, method: str, status_code: int, response_time: float):
-        self.request_time.labels(method=method, status_code=status_code).observe(
-            response_time
+        self.pool_checkout_counter = Counter(
+            "http_connection_pool_checkouts_total",
+            "Total number of connection pool checkouts",
+            ["fetcher_label", "result"],
+            registry=registry,
+        )
+
+        self.rate_limit_wait_time = Summary(
+            "http_rate_limit_wait_seconds",
+            "Time spent waiting for the client-side rate limiter",
+            ["fetcher_label"],
+            registry=registry,
+        )
+
+        self.cache_counter = Counter(
+            "http_cache_requests_total",
+            "Total number of cacheable requests by cache result",
+            ["fetcher_label", "result"],
+            registry=registry,
+        )
+
+        self.coalesced_counter = Counter(
+            "http_requests_coalesced_total",
+            "Total number of requests served by an identical in-flight request",
+            ["fetcher_label", "method"],
+            registry=registry,
+        )
+
+        self.rate_limit_rejections = Counter(
+            "http_rate_limit_rejections_total",
+            "Total number of requests rejected by the client-side rate limiter",
+            ["fetcher_label"],
+            registry=registry,
+        )
+
+        self.bytes_received_counter = Counter(
+            "http_response_bytes_received_total",
+            "Total number of response body bytes read from streamed responses",
+            ["fetcher_label", "method"],
+            registry=registry,
+        )
+
+        self.hedge_counter = Counter(
+            "http_hedged_requests_total",
+            "Total number of hedged requests sent and won",
+            ["fetcher_label", "method", "result"],
+            registry=registry,
+        )
+
+        self.concurrency_limit = Gauge(
+            "http_concurrency_limit",
+            "Current adaptive concurrency limit",
+            ["fetcher_label"],
+            registry=registry,
+        )
+
+        self.concurrency_in_flight = Gauge(
+            "http_concurrency_in_flight",
+            "Requests currently holding a concurrency slot",
+            ["fetcher_label"],
+            registry=registry,
+        )
+
+        self.concurrency_rejections = Counter(
+            "http_concurrency_rejections_total",
+            "Total number of requests rejected by the concurrency limiter",
+            ["fetcher_label"],
+            registry=registry,
+        )
+
+        self.circuit_transitions = Counter(
+            "http_circuit_breaker_transitions_total",
+            "Total number of circuit breaker state transitions",
+            ["fetcher_label", "breaker", "state"],
+            registry=registry,
+        )
+
+        self.circuit_state = Gauge(
+            "http_circuit_breaker_state",
+            "Current circuit breaker state (0 closed, 1 half-open, 2 open)",
+            ["fetcher_label", "breaker"],
+            registry=registry,
+        )
+
+        self.endpoint_in_flight = Gauge(
+            "http_endpoint_in_flight",
+            "Requests currently in flight to a load balanced endpoint",
+            ["fetcher_label", "endpoint"],
+            registry=registry,
+        )
+
+        self.endpoint_latency = self._duration_metric(
+            "http_endpoint_latency_seconds",
+            "Response latency per load balanced endpoint",
+            ["fetcher_label", "endpoint"],
+            registry,
         )
-        self.request_counter.labels(method=method, status_code=status_code).inc()
+
+        self.endpoint_ejections = Counter(
+            "http_endpoint_ejections_total",
+            "Total number of endpoints ejected from the load balancer",
+            ["fetcher_label", "endpoint"],
+            registry=registry,
+        )
+
+        self.page_counter = Counter(
+            "http_pages_fetched_total",
+            "Total number of pages fetched by paginate",
+            ["fetcher_label", "strategy"],
+            registry=registry,
+        )
+
+        self.body_bytes = Counter(
+            "http_body_bytes_total",
+            "Total number of serialized body bytes before compression",
+            ["fetcher_label", "direction", "codec"],
+            registry=registry,
+        )
+
+        self.body_encoded_bytes = Counter(
+            "http_body_encoded_bytes_total",
+            "Total number of body bytes sent or received on the wire",
+            ["fetcher_label", "direction", "codec"],
+            registry=registry,
+        )
+
+        self.codec_time = self._duration_metric(
+            "http_body_codec_duration_seconds",
+            "Time spent serializing, compressing and decoding bodies",
+            ["fetcher_label", "direction", "codec"],
+            registry,
+        )
+
+        self.outbox_depth = Gauge(
+            "http_outbox_depth",
+            "Number of requests waiting in the outbox",
+            ["fetcher_label"],
+            registry=registry,
+        )
+
+        self.outbox_lag = self._duration_metric(
+            "http_outbox_delivery_lag_seconds",
+            "Time from enqueueing an outbox request to its delivery",
+            ["fetcher_label"],
+            registry,
+        )
+
+        self.outbox_dead_letters = Counter(
+            "http_outbox_dead_letters_total",
+            "Total number of outbox requests given up on",
+            ["fetcher_label", "reason"],
+            registry=registry,
+        )
+
+    def _duration_metric(self, name: str, documentation: str, labels, registry):
+        from prometheus_client import Histogram, Summary
+
+        if self.histogram:
+            return Histogram(
+                name, documentation, labels, registry=registry, buckets=self.buckets
+            )
+        return Summary(name, documentation, labels, registry=registry)
+
+    def _child(self, metric, labels: tuple):
+        key = (metric, labels)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = metric.labels(*labels)
+        return child
+
+    def _inc(self, metric, labels: tuple, amount: float = 1):
+        if self.buffer:
+            self.buffer.inc(metric, labels, amount)
+        else:
+            self._child(metric, labels).inc(amount)
+
+    def _observe(self, metric, labels: tuple, value: float):
+        if self.buffer:
+            self.buffer.observe(metric, labels, value)
+        else:
+            self._child(metric, labels).observe(value)
+
+    def flush(self):
+        if self.buffer:
+            self.buffer.flush()
+
+    def close(self):
+        if self.buffer:
+            self.buffer.close()
+
+    def track_request(
+        self, method: str, status_code: int, response_time: float, label: str = ""
+    ):
+        if self.histogram:
+            labels = (label, method, status_code)
+        else:
+            labels = (method, status_code)
+        self._observe(self.request_time, labels, response_time)
+        self._inc(self.request_counter, (method, status_code))
+
+    def track_labelled_request(
+        self, label: str, method: str, status_code: int, response_time: float
+    ):
+        self.track_request(method, status_code, response_time, label=label)
+
+    def track_end_to_end(
+        self, label: str, method: str, status_code: int, duration: float
+    ):
+        status_code = "error" if status_code is None else status_code
+        self._observe(self.end_to_end_time, (label, method, status_code), duration)
+
+    def track_phase(self, label: str, method: str, phase: str, duration: float):
+        self._observe(self.phase_time, (label, method, phase), duration)
 
     def track_retry(self, method: str):
-        self.retry_counter.labels(method=method).inc()
+        self._inc(self.retry_counter, (method,))
+
+    def track_pool_checkout(self, label: str, hit: bool):
+        self._inc(self.pool_checkout_counter, (label, "hit" if hit else "miss"))
+
+    def track_rate_limit(self, label: str, wait_time: float, rejected: bool):
+        if rejected:
+            self._inc(self.rate_limit_rejections, (label,))
+        else:
+            self._observe(self.rate_limit_wait_time, (label,), wait_time)
+
+    def track_cache(self, label: str, result: str):
+        self._inc(self.cache_counter, (label, result))
+
+    def track_coalesced(self, label: str, method: str):
+        self._inc(self.coalesced_counter, (label, method))
+
+    def track_circuit_state(self, label: str, breaker: str, state: str):
+        self._inc(self.circuit_transitions, (label, breaker, state))
+        self._child(self.circuit_state, (label, breaker)).set(
+            CIRCUIT_STATE_VALUES.get(state, 0)
+        )
+
+    def track_bytes_received(self, label: str, method: str, size: int):
+        self._inc(self.bytes_received_counter, (label, method), size)
+
+    def track_hedge(self, label: str, method: str, result: str):
+        self._inc(self.hedge_counter, (label, method, result))
+
+    def track_concurrency(self, label: str, limit: int, in_flight: int, rejected: bool):
+        labels = (label,)
+        self._child(self.concurrency_limit, labels).set(limit)
+        self._child(self.concurrency_in_flight, labels).set(in_flight)
+        if rejected:
+            self._inc(self.concurrency_rejections, labels)
+
+    def track_endpoint(
+        self, label: str, endpoint: str, in_flight: int, latency: float = None
+    ):
+        labels = (label, endpoint)
+        self._child(self.endpoint_in_flight, labels).set(in_flight)
+        if latency is not None:
+            self._observe(self.endpoint_latency, labels, latency)
+
+    def track_endpoint_ejection(self, label: str, endpoint: str):
+        self._inc(self.endpoint_ejections, (label, endpoint))
+
+    def track_page(self, label: str, strategy: str):
+        self._inc(self.page_counter, (label, strategy))
+
+    def track_body(
+        self,
+        label: str,
+        direction: str,
+        codec: str,
+        size: int,
+        encoded_size: int,
+        duration: float,
+    ):
+        labels = (label, direction, codec)
+        self._inc(self.body_bytes, labels, size)
+        self._inc(self.body_encoded_bytes, labels, encoded_size)
+        self._observe(self.codec_time, labels, duration)
+
+    def track_outbox(self, label: str, depth: int, lag: float = None):
+        self._child(self.outbox_depth, (label,)).set(depth)
+        if lag is not None:
+            self._observe(self.outbox_lag, (label,), lag)
+
+    def track_outbox_dead_letter(self, label: str, reason: str, count: int):
+        self._inc(self.outbox_dead_letters, (label, reason), count)
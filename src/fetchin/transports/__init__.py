@@ -0,0 +1,12 @@
+from ..lazy_import import lazy_exports
+
+_EXPORTS = {
+    "TransportInterface": ".transport_interface",
+    "HTTPTransport": ".http_transport",
+    "HTTP2Transport": ".http2_transport",
+    "MemoryTransport": ".memory_transport",
+    "RecordReplayTransport": ".record_replay_transport",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
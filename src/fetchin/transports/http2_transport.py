@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+from ..fetcher.pool import DEFAULT_POOL_CONFIG
+from .transport_interface import TransportInterface
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+HTTPX_ARGUMENTS = ("params", "headers", "cookies", "json", "files", "auth")
+
+
+def httpx_client_options(pool_config: dict = None):
+    config = DEFAULT_POOL_CONFIG.copy()
+    if pool_config:
+        config.update(pool_config)
+
+    options = {
+        "limits": httpx.Limits(
+            max_connections=config["pool_maxsize"] if config["pool_block"] else None,
+            max_keepalive_connections=(
+                config["pool_maxsize"] if config["keep_alive"] else 0
+            ),
+            keepalive_expiry=config["idle_timeout"],
+        )
+    }
+    if config["http2"] or config["http2_prior_knowledge"]:
+        options["http2"] = True
+    if config["http2_prior_knowledge"]:
+        # Cleartext h2c: skip the HTTP/1.1 upgrade and speak HTTP/2 directly
+        options["http1"] = False
+    return options
+
+
+def _httpx_timeout(timeout):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class _StreamReader:
+    def __init__(self, response, run, on_close):
+        self.response = response
+        self.run = run
+        self.on_close = on_close
+
+    def stream(self, chunk_size: int, decode_content: bool = True):
+        chunks = self.response.aiter_bytes(chunk_size)
+        while True:
+            try:
+                yield self.run(chunks.__anext__())
+            except StopAsyncIteration:
+                return
+
+    def close(self):
+        self.run(self.response.aclose())
+        self.release_conn()
+
+    def release_conn(self):
+        on_close, self.on_close = self.on_close, None
+        if on_close:
+            on_close()
+
+
+class HTTP2Transport(TransportInterface):
+    # httpcore's sync HTTP/2 connection is not safe to share between threads,
+    # so all I/O runs on one event loop thread and callers wait for results
+    def __init__(self, pool_config: dict = None):
+        if httpx is None:
+            raise ImportError(
+                "HTTP2Transport requires httpx and h2, install them with "
+                "'pip install fetchin[http2]'"
+            )
+
+        config = {"http2": True, **(pool_config or {})}
+        self.pool_config = config
+        self.max_streams = config.get("max_streams", DEFAULT_POOL_CONFIG["max_streams"])
+        self._streams = None
+        if self.max_streams:
+            self._streams = threading.BoundedSemaphore(self.max_streams)
+        self._client = None
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=self._loop.run_forever,
+                        name="fetchin-http2",
+                        daemon=True,
+                    )
+                    self._thread.start()
+                    self._client = httpx.AsyncClient(
+                        **httpx_client_options(self.pool_config)
+                    )
+        return self._client
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def request(self, method: str, url: str, **kwargs):
+        import requests
+
+        stream = kwargs.pop("stream", False)
+        follow_redirects = kwargs.pop("allow_redirects", True)
+        request = self.client.build_request(
+            method,
+            url,
+            timeout=_httpx_timeout(kwargs.pop("timeout", None)),
+            **self._request_kwargs(kwargs),
+        )
+
+        if self._streams is not None:
+            self._streams.acquire()
+        try:
+            response, elapsed = self._run(self._send(request, stream, follow_redirects))
+        except httpx.TimeoutException as e:
+            self._release()
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            self._release()
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except BaseException:
+            self._release()
+            raise
+
+        if not stream:
+            self._release()
+        return self._to_response(request, response, elapsed, stream)
+
+    async def _send(self, request, stream: bool, follow_redirects: bool):
+        start = time.monotonic()
+        response = await self.client.send(
+            request, stream=True, follow_redirects=follow_redirects
+        )
+        elapsed = time.monotonic() - start
+        if not stream:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        return response, elapsed
+
+    def _request_kwargs(self, kwargs: dict):
+        data = kwargs.pop("data", None)
+        options = {name: kwargs.pop(name) for name in HTTPX_ARGUMENTS if name in kwargs}
+        if kwargs:
+            raise TypeError(
+                f"HTTP2Transport does not support {', '.join(sorted(kwargs))}"
+            )
+        if isinstance(data, (bytes, str)) or hasattr(data, "read"):
+            options["content"] = data
+        elif data is not None:
+            options["data"] = data
+        return options
+
+    def _to_response(self, request, response, elapsed: float, stream: bool):
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers.items())
+        result.url = str(response.url)
+        result.reason = response.reason_phrase
+        result.encoding = requests.utils.get_encoding_from_headers(result.headers)
+        result.elapsed = timedelta(seconds=elapsed)
+        result.request = requests.Request(
+            request.method, str(request.url), headers=dict(request.headers)
+        ).prepare()
+        if stream:
+            result.raw = _StreamReader(response, self._run, self._release)
+        else:
+            result._content = response.content
+            result._content_consumed = True
+        return result
+
+    def _release(self):
+        if self._streams is not None:
+            self._streams.release()
+
+    def close(self):
+        if self._client is not None:
+            self._run(self._client.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._client = None
@@ -0,0 +1,34 @@
+import threading
+
+from .transport_interface import TransportInterface
+
+
+class HTTPTransport(TransportInterface):
+    def __init__(self, pool_config: dict = None, on_checkout=None):
+        self.pool_config = pool_config
+        self.on_checkout = on_checkout
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    from ..fetcher.session import create_session
+
+                    self._session = create_session(
+                        self.pool_config, on_checkout=self.on_checkout
+                    )
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    def request(self, method: str, url: str, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
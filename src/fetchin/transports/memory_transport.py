@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+import time
+
+from .stub_mapping import StubMapping, build_response
+from .transport_interface import TransportInterface
+
+NOT_MATCHED_BODY = b"Request was not matched"
+
+
+class MemoryTransport(TransportInterface):
+    def __init__(self, mappings=None, files_dir: str = None, delays: bool = True):
+        self.files_dir = files_dir
+        self.delays = delays
+        self._mappings = []
+        self._lock = threading.Lock()
+        for mapping in mappings or []:
+            self.add_mapping(mapping)
+
+    @classmethod
+    def from_directory(cls, directory: str, delays: bool = True):
+        mappings_dir = os.path.join(directory, "mappings")
+        if not os.path.isdir(mappings_dir):
+            mappings_dir = directory
+
+        transport = cls(files_dir=os.path.join(directory, "__files"), delays=delays)
+        for name in sorted(os.listdir(mappings_dir)):
+            if name.endswith(".json"):
+                transport.load_file(os.path.join(mappings_dir, name))
+        return transport
+
+    def load_file(self, path: str):
+        with open(path) as f:
+            data = json.load(f)
+        for mapping in data.get("mappings", [data]):
+            self.add_mapping(mapping)
+
+    def add_mapping(self, mapping: dict):
+        stub = StubMapping(mapping, self.files_dir)
+        with self._lock:
+            mappings = [stub] + self._mappings
+            mappings.sort(key=lambda stub: stub.priority)
+            self._mappings = mappings
+        return stub
+
+    def match(self, method: str, url: str, **kwargs):
+        for stub in self._mappings:
+            if stub.matches(method, url, kwargs):
+                return stub
+        return None
+
+    def request(self, method: str, url: str, **kwargs):
+        stub = self.match(method, url, **kwargs)
+        if stub is None:
+            return build_response(method, url, 404, {}, NOT_MATCHED_BODY)
+
+        if self.delays and stub.delay:
+            time.sleep(stub.delay)
+        return build_response(
+            method,
+            url,
+            stub.response.get("status", 200),
+            stub.response.get("headers"),
+            stub.body(),
+        )
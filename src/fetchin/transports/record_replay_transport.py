@@ -0,0 +1,84 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+
+from .http_transport import HTTPTransport
+from .memory_transport import MemoryTransport
+from .transport_interface import TransportInterface
+
+RECORD_MODES = ("record", "replay", "auto")
+
+SKIPPED_HEADERS = frozenset(
+    ("connection", "content-encoding", "content-length", "transfer-encoding")
+)
+
+
+class RecordReplayTransport(TransportInterface):
+    def __init__(
+        self, directory: str, mode: str = "replay", transport: TransportInterface = None
+    ):
+        if mode not in RECORD_MODES:
+            raise ValueError(f"Unknown record mode: {mode}")
+
+        self.directory = directory
+        self.mode = mode
+        self.transport = transport
+        if mode != "replay" and transport is None:
+            self.transport = HTTPTransport()
+
+        self.mappings_dir = os.path.join(directory, "mappings")
+        os.makedirs(self.mappings_dir, exist_ok=True)
+        self.replay = MemoryTransport.from_directory(directory, delays=False)
+        self._lock = threading.Lock()
+
+    def request(self, method: str, url: str, **kwargs):
+        if self.mode == "replay" or (
+            self.mode == "auto" and self.replay.match(method, url, **kwargs)
+        ):
+            return self.replay.request(method, url, **kwargs)
+
+        response = self.transport.request(method, url, **kwargs)
+        self.record(method, response)
+        return response
+
+    def record(self, method: str, response):
+        parts = urlsplit(response.url)
+        path = parts.path or "/"
+        url = f"{path}?{parts.query}" if parts.query else path
+
+        content = response.content
+        body = {}
+        try:
+            body["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            body["base64Body"] = base64.b64encode(content).decode("ascii")
+
+        mapping = {
+            "request": {"method": method.upper(), "url": url},
+            "response": {
+                "status": response.status_code,
+                **body,
+                "headers": {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() not in SKIPPED_HEADERS
+                },
+            },
+        }
+
+        digest = hashlib.sha1(f"{method} {url}".encode("utf-8")).hexdigest()[:12]
+        slug = "-".join(filter(None, path.split("/")))[:64] or "root"
+        filename = os.path.join(
+            self.mappings_dir, f"{method.lower()}-{slug}-{digest}.json"
+        )
+        with self._lock:
+            with open(filename, "w") as f:
+                json.dump(mapping, f, indent=2)
+            self.replay.add_mapping(mapping)
+
+    def close(self):
+        if self.transport:
+            self.transport.close()
@@ -0,0 +1,141 @@
+import base64
+import json
+import os
+import re
+from datetime import timedelta
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_PRIORITY = 5
+
+
+def match_pattern(pattern: dict, value):
+    if "absent" in pattern:
+        return (value is None) == bool(pattern["absent"])
+    if value is None:
+        return False
+
+    if pattern.get("caseInsensitive"):
+        value = value.lower()
+        pattern = {
+            name: expected.lower() if isinstance(expected, str) else expected
+            for name, expected in pattern.items()
+        }
+
+    if "equalTo" in pattern:
+        return value == pattern["equalTo"]
+    if "contains" in pattern:
+        return pattern["contains"] in value
+    if "matches" in pattern:
+        return re.fullmatch(pattern["matches"], value) is not None
+    if "doesNotMatch" in pattern:
+        return re.fullmatch(pattern["doesNotMatch"], value) is None
+    if "equalToJson" in pattern:
+        expected = pattern["equalToJson"]
+        if isinstance(expected, str):
+            expected = json.loads(expected)
+        try:
+            return json.loads(value) == expected
+        except ValueError:
+            return False
+    return True
+
+
+def request_body(kwargs: dict):
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"])
+    data = kwargs.get("data")
+    if isinstance(data, bytes):
+        return data.decode("utf-8", "replace")
+    if isinstance(data, dict):
+        return urlencode(data)
+    return data
+
+
+class StubMapping:
+    def __init__(self, mapping: dict, files_dir: str = None):
+        self.mapping = mapping
+        self.request = mapping.get("request", {})
+        self.response = mapping.get("response", {})
+        self.priority = mapping.get("priority", DEFAULT_PRIORITY)
+        self.files_dir = files_dir
+
+        self._method = self.request.get("method", "ANY").upper()
+        self._url = self.request.get("url")
+        self._url_path = self.request.get("urlPath")
+        self._url_pattern = self._compile("urlPattern")
+        self._url_path_pattern = self._compile("urlPathPattern")
+
+    def _compile(self, name: str):
+        pattern = self.request.get(name)
+        return re.compile(pattern) if pattern is not None else None
+
+    def matches(self, method: str, url: str, kwargs: dict):
+        if self._method != "ANY" and self._method != method.upper():
+            return False
+
+        parts = urlsplit(url)
+        query = parse_qs(parts.query, keep_blank_values=True)
+        for name, value in (kwargs.get("params") or {}).items():
+            query.setdefault(name, []).extend(
+                value if isinstance(value, (list, tuple)) else [str(value)]
+            )
+        path = parts.path or "/"
+        full_url = f"{path}?{urlencode(query, doseq=True)}" if query else path
+
+        if self._url is not None and self._url != full_url:
+            return False
+        if self._url_path is not None and self._url_path != path:
+            return False
+        if self._url_pattern and not self._url_pattern.fullmatch(full_url):
+            return False
+        if self._url_path_pattern and not self._url_path_pattern.fullmatch(path):
+            return False
+
+        for name, pattern in self.request.get("queryParameters", {}).items():
+            values = query.get(name) or [None]
+            if not any(match_pattern(pattern, value) for value in values):
+                return False
+
+        headers = CaseInsensitiveDict(kwargs.get("headers") or {})
+        for name, pattern in self.request.get("headers", {}).items():
+            if not match_pattern(pattern, headers.get(name)):
+                return False
+
+        body = request_body(kwargs)
+        for pattern in self.request.get("bodyPatterns", []):
+            if not match_pattern(pattern, body):
+                return False
+        return True
+
+    def body(self):
+        response = self.response
+        if "jsonBody" in response:
+            return json.dumps(response["jsonBody"]).encode("utf-8")
+        if "base64Body" in response:
+            return base64.b64decode(response["base64Body"])
+        if "bodyFileName" in response and self.files_dir:
+            with open(
+                os.path.join(self.files_dir, response["bodyFileName"]), "rb"
+            ) as f:
+                return f.read()
+        return (response.get("body") or "").encode("utf-8")
+
+    @property
+    def delay(self):
+        return self.response.get("fixedDelayMilliseconds", 0) / 1000
+
+
+def build_response(method: str, url: str, status: int, headers: dict, content: bytes):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = content
+    response._content_consumed = True
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.elapsed = timedelta(0)
+    response.request = requests.Request(method, url).prepare()
+    return response
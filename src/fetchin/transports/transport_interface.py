@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+
+class TransportInterface(ABC):
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs):
+        pass
+
+    def close(self):
+        pass
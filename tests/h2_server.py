@@ -0,0 +1,112 @@
+import socket
+import threading
+
+import h2.config
+import h2.connection
+import h2.events
+
+
+class H2Request:
+    def __init__(self, headers):
+        pseudo = dict(headers)
+        self.command = pseudo[":method"]
+        self.path = pseudo[":path"]
+        self.headers = {
+            name: value for name, value in headers if not name.startswith(":")
+        }
+
+
+def default_responder(handler, body):
+    return 200, {"content-type": "application/json"}, b'{"data": "test"}'
+
+
+class LocalH2Server:
+    def __init__(self, responder=default_responder):
+        self.responder = responder
+        self.socket = socket.create_server(("127.0.0.1", 0))
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.socket.getsockname()
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.socket.close()
+
+    def _serve(self):
+        while True:
+            try:
+                sock, _ = self.socket.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+            threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+
+    def _handle(self, sock):
+        config = h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        connection = h2.connection.H2Connection(config=config)
+        connection.initiate_connection()
+        lock, streams = threading.Lock(), {}
+        sock.sendall(connection.data_to_send())
+
+        with sock:
+            while True:
+                try:
+                    data = sock.recv(65535)
+                except OSError:
+                    return
+                if not data:
+                    return
+
+                with lock:
+                    for event in connection.receive_data(data):
+                        if isinstance(event, h2.events.RequestReceived):
+                            streams[event.stream_id] = (event.headers, bytearray())
+                        elif isinstance(event, h2.events.DataReceived):
+                            streams[event.stream_id][1].extend(event.data)
+                            connection.acknowledge_received_data(
+                                event.flow_controlled_length, event.stream_id
+                            )
+                        elif isinstance(event, h2.events.StreamEnded):
+                            headers, body = streams.pop(event.stream_id)
+                            threading.Thread(
+                                target=self._respond,
+                                args=(sock, connection, lock, event.stream_id),
+                                kwargs={"request": H2Request(headers), "body": body},
+                                daemon=True,
+                            ).start()
+                    sock.sendall(connection.data_to_send())
+
+    def _respond(self, sock, connection, lock, stream_id, request, body):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            status, headers, content = self.responder(request, bytes(body))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        response_headers = [(":status", str(status))]
+        response_headers.extend((name.lower(), value) for name, value in headers.items())
+        response_headers.append(("content-length", str(len(content))))
+        with lock:
+            connection.send_headers(stream_id, response_headers)
+            frame_size = connection.max_outbound_frame_size
+            for start in range(0, len(content), frame_size):
+                connection.send_data(stream_id, content[start : start + frame_size])
+            connection.end_stream(stream_id)
+            try:
+                sock.sendall(connection.data_to_send())
+            except OSError:
+                pass
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock, ANY
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.logging.logger import CustomLogger
+from src.fetchin.metrics.prometheus_metrics import PrometheusMetrics
+from pybreaker import CircuitBreakerError
+from tests.http_server import LocalHTTPServer
+import httpx
+
+
+class TestAsyncFetcher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.logger = CustomLogger()
+        self.metrics = PrometheusMetrics()
+
+        logging.disable(logging.CRITICAL)
+
+        self.circuit_config = {
+            "fail_max": 1,
+            "reset_timeout": 2,
+        }
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_get_with_timeout_and_headers(self, mock_request):
+        fetcher = AsyncFetcher(label="async_get_with_timeout", logger=self.logger, metrics=self.metrics, circuit_config=self.circuit_config)
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"data": "test"}
+        mock_request.return_value = mock_response
+
+        response = await fetcher.get(
+            "http://localhost:8080/api/example",
+            timeout=5,
+            headers={"Authorization": "Bearer token"}
+        )
+
+        mock_request.assert_awaited_once_with(
+            "GET",
+            "http://localhost:8080/api/example",
+            timeout=5,
+            headers={"Authorization": "Bearer token"},
+            extensions={"trace": ANY},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"data": "test"})
+
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_post_sends_json(self, mock_request):
+        fetcher = AsyncFetcher(label="async_post_success", circuit_config=self.circuit_config)
+        mock_request.return_value = MagicMock(status_code=201)
+
+        response = await fetcher.post("http://localhost:8080/api/example", data={"key": "value"})
+
+        mock_request.assert_awaited_once_with("POST", "http://localhost:8080/api/example", json={"key": "value"})
+        self.assertEqual(response.status_code, 201)
+
+    @patch('src.fetchin.fetcher.async_fetcher.asyncio.sleep', new_callable=AsyncMock)
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_get_retry_uses_async_sleep(self, mock_request, mock_sleep):
+        circuit_config = {"fail_max": 2, "reset_timeout": 2}
+        fetcher = AsyncFetcher(label="async_get_retry", metrics=self.metrics, circuit_config=circuit_config)
+
+        mock_request.side_effect = [
+            httpx.ConnectError("boom"),
+            MagicMock(status_code=200, json=lambda: {"data": "test"}),
+        ]
+
+        response = await fetcher.get("http://localhost:8080/api/example")
+
+        self.assertEqual(response.json(), {"data": "test"})
+        mock_sleep.assert_awaited_once_with(2)
+
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_circuit_shared_with_sync_fetcher(self, mock_request):
+        async_fetcher = AsyncFetcher(label="async_shared_circuit", circuit_config=self.circuit_config)
+        sync_fetcher = Fetcher(label="async_shared_circuit", circuit_config=self.circuit_config)
+        self.assertIs(async_fetcher.circuit_breaker, sync_fetcher.circuit_breaker)
+
+        mock_request.side_effect = httpx.ConnectError("boom")
+
+        with self.assertRaises(CircuitBreakerError):
+            await async_fetcher.get("http://localhost:8080/api/example")
+
+        with self.assertRaises(CircuitBreakerError):
+            sync_fetcher.get("http://localhost:8080/api/example")
+
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_cancelled_requests_do_not_open_the_circuit(self, mock_request):
+        hooks = MagicMock()
+        fetcher = AsyncFetcher(
+            label="async_cancelled", circuit_config={"fail_max": 2, "reset_timeout": 2}, hooks=[hooks]
+        )
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        mock_request.side_effect = hang
+        for _ in range(3):
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(fetcher.get("http://localhost:8080/api/example"), 0.01)
+
+        self.assertEqual(fetcher.circuit_breaker.current_state, "closed")
+        self.assertEqual(fetcher.circuit_breaker.fail_counter, 0)
+        self.assertEqual(hooks.on_request_end.call_count, 3)
+
+        mock_request.side_effect = None
+        mock_request.return_value = MagicMock(status_code=200)
+        response = await fetcher.get("http://localhost:8080/api/example")
+        self.assertEqual(response.status_code, 200)
+
+    async def test_get_against_local_server(self):
+        with LocalHTTPServer() as server:
+            async with AsyncFetcher(label="async_local_server") as fetcher:
+                response = await fetcher.get(f"{server.url}/api/example")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"data": "test"})
+
+
+if __name__ == '__main__':
+    unittest.main()
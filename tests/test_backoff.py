@@ -0,0 +1,136 @@
+import logging
+import unittest
+from email.utils import formatdate
+import time
+from unittest.mock import patch, MagicMock
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.backoff import (
+    BackoffStrategy,
+    DecorrelatedJitterBackoff,
+    ExponentialBackoff,
+    FullJitterBackoff,
+    parse_retry_after,
+)
+import requests
+
+
+class TestBackoffStrategies(unittest.TestCase):
+    def test_exponential_backoff_with_cap(self):
+        strategy = ExponentialBackoff(base=0.5, max_delay=3)
+        self.assertEqual([strategy(attempt) for attempt in range(1, 5)], [1, 2, 3, 3])
+
+    def test_full_jitter_stays_within_exponential_bound(self):
+        strategy = FullJitterBackoff(base=1, max_delay=5)
+        for attempt in range(1, 6):
+            delay = strategy(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(2**attempt, 5))
+
+    def test_decorrelated_jitter_grows_from_previous_delay(self):
+        strategy = DecorrelatedJitterBackoff(base=1, max_delay=10)
+        previous = None
+        for attempt in range(1, 6):
+            delay = strategy.next_delay(attempt, previous)
+            self.assertGreaterEqual(delay, 1)
+            self.assertLessEqual(delay, min((previous or 1) * 3, 10))
+            previous = delay
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 10)), 10, delta=1.5)
+        for value in ("inf", "nan", "-5"):
+            self.assertIsNone(parse_retry_after(value))
+        self.assertEqual(parse_retry_after(formatdate(time.time() - 10)), 0)
+
+    def test_strategies_must_implement_next_delay(self):
+        with self.assertRaises(TypeError):
+            BackoffStrategy()
+
+
+class TestFetcherRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('src.fetchin.fetcher.fetcher.time.sleep')
+    @patch('requests.Session.request')
+    def test_configured_backoff_strategy_and_cap(self, mock_request, mock_sleep):
+        circuit_config = {"fail_max": 10, "backoff_strategy": lambda attempt: attempt * 10, "max_backoff": 15}
+        fetcher = Fetcher(label="test_backoff_strategy", circuit_config=circuit_config, max_retries=3)
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            fetcher.get("http://localhost:8080/api/example")
+
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [10, 15])
+
+    @patch('src.fetchin.fetcher.fetcher.time.sleep')
+    @patch('requests.Session.request')
+    def test_retry_after_on_retryable_status(self, mock_request, mock_sleep):
+        circuit_config = {"retry_statuses": [429, 503]}
+        fetcher = Fetcher(label="test_retry_after", circuit_config=circuit_config)
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "7"})
+        mock_request.side_effect = [throttled, MagicMock(status_code=200)]
+
+        response = fetcher.get("http://localhost:8080/api/example")
+
+        self.assertEqual(response.status_code, 200)
+        mock_sleep.assert_called_once_with(7)
+        throttled.close.assert_called_once()
+
+    @patch('src.fetchin.fetcher.fetcher.time.sleep')
+    @patch('requests.Session.request')
+    def test_retry_after_is_capped(self, mock_request, mock_sleep):
+        circuit_config = {"retry_statuses": [429], "max_backoff": 5}
+        fetcher = Fetcher(label="test_retry_after_cap", circuit_config=circuit_config)
+        mock_request.side_effect = [
+            MagicMock(status_code=429, headers={"Retry-After": "3600"}),
+            MagicMock(status_code=429, headers={"Retry-After": "inf"}),
+            MagicMock(status_code=200),
+        ]
+
+        self.assertEqual(fetcher.get("http://localhost:8080/api/example").status_code, 200)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [5, 4])
+
+    @patch('src.fetchin.fetcher.fetcher.time.sleep')
+    @patch('requests.Session.request')
+    def test_retry_after_past_the_budget_gives_up(self, mock_request, mock_sleep):
+        circuit_config = {"retry_statuses": [429], "retry_budget": 10}
+        fetcher = Fetcher(label="test_retry_after_budget", circuit_config=circuit_config)
+        mock_request.return_value = MagicMock(status_code=429, headers={"Retry-After": "3600"})
+
+        self.assertEqual(fetcher.get("http://localhost:8080/api/example").status_code, 429)
+        mock_sleep.assert_not_called()
+
+    @patch('src.fetchin.fetcher.fetcher.time.sleep')
+    @patch('requests.Session.request')
+    def test_last_retryable_response_is_returned(self, mock_request, mock_sleep):
+        circuit_config = {"retry_statuses": [503]}
+        fetcher = Fetcher(label="test_retry_exhausted", circuit_config=circuit_config, max_retries=2)
+        mock_request.return_value = MagicMock(status_code=503, headers={})
+
+        response = fetcher.get("http://localhost:8080/api/example")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch('src.fetchin.fetcher.fetcher.time.sleep')
+    @patch('requests.Session.request')
+    def test_retry_budget_stops_retrying(self, mock_request, mock_sleep):
+        circuit_config = {"fail_max": 10, "retry_budget": 3, "backoff_strategy": ExponentialBackoff()}
+        fetcher = Fetcher(label="test_retry_budget", circuit_config=circuit_config, max_retries=5)
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            fetcher.get("http://localhost:8080/api/example")
+
+        mock_sleep.assert_called_once_with(2)
+        self.assertEqual(mock_request.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.batch import normalize_request
+from pybreaker import CircuitBreakerError
+from tests.http_server import LocalHTTPServer
+import requests
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_normalize_request(self):
+        self.assertEqual(normalize_request("http://a"), ("GET", "http://a", {}))
+        self.assertEqual(
+            normalize_request({"method": "post", "url": "http://a", "json": {"k": 1}}),
+            ("POST", "http://a", {"json": {"k": 1}}),
+        )
+        self.assertEqual(
+            normalize_request(("PUT", "http://a", {"timeout": 1})),
+            ("PUT", "http://a", {"timeout": 1}),
+        )
+
+    def test_gather_returns_results_in_order_with_bounded_concurrency(self):
+        lock, active, peak = threading.Lock(), [0], [0]
+
+        def responder(handler, body):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return 200, {}, handler.path.encode()
+
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_gather_order") as fetcher:
+                urls = [f"{server.url}/item/{i}" for i in range(12)]
+                responses = fetcher.gather(urls, concurrency=4)
+
+        self.assertEqual([r.text for r in responses], [f"/item/{i}" for i in range(12)])
+        self.assertLessEqual(peak[0], 4)
+        self.assertGreater(peak[0], 1)
+
+    def test_body_specs_are_encoded_like_verb_methods(self):
+        received = []
+
+        def responder(handler, body):
+            received.append((handler.command, handler.headers["Content-Type"], body))
+            return 200, {}, b""
+
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_gather_body") as fetcher:
+                fetcher.gather([{"method": "POST", "url": f"{server.url}/items", "data": {"id": 1}}])
+                fetcher.post(f"{server.url}/items", data={"id": 1})
+
+        self.assertEqual(received[0], received[1])
+        self.assertEqual(received[0][1], "application/json")
+
+    @patch('requests.Session.request')
+    def test_circuit_open_cancels_queued_requests(self, mock_request):
+        fetcher = Fetcher(label="test_gather_fail_fast", circuit_config={"fail_max": 1, "reset_timeout": 60})
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+
+        results = fetcher.gather(["http://localhost:8080/api/example"] * 5, concurrency=1, return_exceptions=True)
+
+        self.assertIsInstance(results[0], CircuitBreakerError)
+        self.assertTrue(all(isinstance(r, CancelledError) for r in results[1:]))
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch('requests.Session.request')
+    def test_gather_raises_first_error(self, mock_request):
+        fetcher = Fetcher(label="test_gather_raises", circuit_config={"fail_max": 1, "reset_timeout": 60})
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+
+        with self.assertRaises(CircuitBreakerError):
+            fetcher.gather(["http://localhost:8080/api/example"] * 3, concurrency=1)
+
+    def test_batch_deadline(self):
+        def responder(handler, body):
+            time.sleep(0.5)
+            return 200, {}, b"slow"
+
+        with LocalHTTPServer(responder) as server:
+            fetcher = Fetcher(label="test_gather_deadline")
+            start = time.monotonic()
+            results = list(fetcher.as_completed([f"{server.url}/slow"] * 4, concurrency=2, timeout=0.1))
+            elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(sorted(index for index, _ in results), [0, 1, 2, 3])
+        self.assertTrue(all(isinstance(result, TimeoutError) for _, result in results))
+
+    @patch('requests.Session.request')
+    def test_request_deadline_stops_retries(self, mock_request):
+        fetcher = Fetcher(label="test_gather_request_deadline", circuit_config={"fail_max": 10, "reset_timeout": 60})
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+
+        start = time.monotonic()
+        results = fetcher.gather(["http://localhost:8080/api/example"], request_timeout=1, return_exceptions=True)
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertIsInstance(results[0], requests.exceptions.ConnectionError)
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertLessEqual(mock_request.call_args.kwargs["timeout"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import logging
+import os
+import tempfile
+import time
+import unittest
+from email.utils import formatdate
+from unittest.mock import MagicMock
+from src.fetchin.cache import CacheEntry, MemoryCache, ResponseCache, SQLiteCache
+from src.fetchin.fetcher.fetcher import Fetcher
+from tests.http_server import LocalHTTPServer
+
+
+def make_entry(content=b"body", headers=None, ttl=60):
+    return CacheEntry(200, headers or {"ETag": '"v1"'}, content, "http://a/", expires_at=time.time() + ttl)
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", make_entry())
+        cache.set("b", make_entry())
+        cache.get("a")
+        cache.set("c", make_entry())
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_byte_limit(self):
+        entry = make_entry(content=b"x" * 100)
+        cache = MemoryCache(max_bytes=entry.size * 2)
+        for key in ("a", "b", "c"):
+            cache.set(key, make_entry(content=b"x" * 100))
+        cache.set("huge", make_entry(content=b"x" * 1000))
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("huge"))
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_entries_survive_reopening(self):
+        cache = SQLiteCache(self.path)
+        cache.set("a", make_entry(content=b"persisted"))
+        cache.close()
+
+        entry = SQLiteCache(self.path).get("a")
+        self.assertEqual(entry.content, b"persisted")
+        self.assertEqual(entry.headers["etag"], '"v1"')
+        self.assertTrue(entry.is_fresh)
+
+    def test_max_entries(self):
+        cache = SQLiteCache(self.path, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, make_entry())
+
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        cache.delete("c")
+        self.assertIsNone(cache.get("c"))
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_freshness_lifetime(self):
+        cache = ResponseCache(default_ttl=5)
+        self.assertEqual(cache.freshness_lifetime({"Cache-Control": "public, max-age=30"}), 30)
+        self.assertEqual(cache.freshness_lifetime({"Cache-Control": "no-cache, max-age=30"}), 0)
+        self.assertEqual(cache.freshness_lifetime({}), 5)
+
+        now = time.time()
+        headers = {"Date": formatdate(now), "Expires": formatdate(now + 120)}
+        self.assertAlmostEqual(cache.freshness_lifetime(headers), 120, delta=1)
+
+    def test_key_includes_params(self):
+        cache = ResponseCache()
+        self.assertEqual(cache.key("GET", "http://a/items", {"page": 2}), "GET:http://a/items?page=2")
+
+    def test_key_separates_credentials(self):
+        cache = ResponseCache()
+        alice = cache.key("GET", "http://a/me", headers={"Authorization": "Bearer alice"})
+        bob = cache.key("GET", "http://a/me", headers={"authorization": "Bearer bob"})
+        self.assertNotIn(alice, (bob, cache.key("GET", "http://a/me")))
+        self.assertNotIn("alice", alice)
+        self.assertEqual(alice, cache.key("GET", "http://a/me", headers={"authorization": "Bearer alice"}))
+
+    def test_responses_are_stored_per_vary_variant(self):
+        cache = ResponseCache()
+        key = cache.key("GET", "http://a/")
+        english = make_entry(b"hello", {"Cache-Control": "max-age=60", "Vary": "Accept-Language"}).to_response()
+        cache.store(key, english, {"Accept-Language": "en"})
+
+        entry, fresh = cache.get(key, {"accept-language": "en"})
+        self.assertEqual((entry.content, fresh), (b"hello", True))
+        self.assertEqual(cache.get(key, {"Accept-Language": "de"}), (None, False))
+        self.assertEqual(cache.get(key), (None, False))
+
+        anything = make_entry(headers={"Cache-Control": "max-age=60", "Vary": "*"}).to_response()
+        self.assertIsNone(cache.store(cache.key("GET", "http://b/"), anything))
+
+    def test_age_shortens_freshness(self):
+        cache = ResponseCache()
+        aged = make_entry(headers={"Cache-Control": "max-age=60", "Age": "100"}).to_response()
+        self.assertIsNone(cache.store(cache.key("GET", "http://a/"), aged))
+
+        entry = cache.store(
+            cache.key("GET", "http://b/"),
+            make_entry(headers={"Cache-Control": "max-age=60", "Age": "50"}).to_response(),
+        )
+        self.assertAlmostEqual(entry.expires_at - entry.stored_at, 10, delta=1)
+
+
+class TestFetcherCache(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.calls = []
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def responder(self, headers):
+        def _responder(handler, body):
+            self.calls.append(dict(handler.headers))
+            if handler.headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, headers, b'{"data": "cached"}'
+        return _responder
+
+    def test_fresh_response_is_served_from_cache(self):
+        metrics = MagicMock()
+        with LocalHTTPServer(self.responder({"Cache-Control": "max-age=60"})) as server:
+            fetcher = Fetcher(label="test_cache_hit", metrics=metrics, cache=ResponseCache())
+            first = fetcher.get(f"{server.url}/config")
+            second = fetcher.get(f"{server.url}/config")
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(second.json(), first.json())
+        metrics.track_cache.assert_any_call("test_cache_hit", "miss")
+        metrics.track_cache.assert_any_call("test_cache_hit", "hit")
+
+    def test_stale_response_is_revalidated_with_etag(self):
+        metrics = MagicMock()
+        with LocalHTTPServer(self.responder({"Cache-Control": "no-cache", "ETag": '"v1"'})) as server:
+            fetcher = Fetcher(label="test_cache_revalidate", metrics=metrics, cache=ResponseCache())
+            fetcher.get(f"{server.url}/config")
+            response = fetcher.get(f"{server.url}/config")
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.calls[1]["If-None-Match"], '"v1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"data": "cached"})
+        metrics.track_cache.assert_any_call("test_cache_revalidate", "revalidated")
+
+    def test_no_store_is_not_cached(self):
+        with LocalHTTPServer(self.responder({"Cache-Control": "no-store"})) as server:
+            fetcher = Fetcher(label="test_cache_no_store", cache=ResponseCache(default_ttl=60))
+            fetcher.get(f"{server.url}/config")
+            fetcher.get(f"{server.url}/config")
+
+        self.assertEqual(len(self.calls), 2)
+
+    def test_lowercase_request_directives(self):
+        with LocalHTTPServer(self.responder({"Cache-Control": "max-age=60", "ETag": '"v1"'})) as server:
+            fetcher = Fetcher(label="test_cache_lowercase", cache=ResponseCache())
+            fetcher.get(f"{server.url}/config", headers={"cache-control": "no-store"})
+            fetcher.get(f"{server.url}/config")
+            fetcher.get(f"{server.url}/config", headers={"cache-control": "no-cache", "if-none-match": '"v0"'})
+
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(self.calls[2]["If-None-Match"], '"v1"')
+
+    def test_responses_are_not_shared_across_credentials(self):
+        with LocalHTTPServer(self.responder({"Cache-Control": "max-age=60"})) as server:
+            fetcher = Fetcher(label="test_cache_credentials", cache=ResponseCache())
+            fetcher.get(f"{server.url}/me", headers={"Authorization": "Bearer alice"})
+            fetcher.get(f"{server.url}/me", headers={"Authorization": "Bearer bob"})
+            fetcher.get(f"{server.url}/me", headers={"Authorization": "Bearer alice"})
+
+        self.assertEqual([call["Authorization"] for call in self.calls], ["Bearer alice", "Bearer bob"])
+
+    def test_cache_hit_bypasses_open_circuit_breaker(self):
+        with LocalHTTPServer(self.responder({"Cache-Control": "max-age=60"})) as server:
+            fetcher = Fetcher(label="test_cache_open_circuit", cache=ResponseCache())
+            fetcher.get(f"{server.url}/config")
+            fetcher.circuit_breaker.open()
+            response = fetcher.get(f"{server.url}/config")
+            fetcher.circuit_breaker.close()
+
+        self.assertEqual(response.json(), {"data": "cached"})
+
+
+if __name__ == "__main__":
+    unittest.main()
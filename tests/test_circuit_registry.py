@@ -0,0 +1,156 @@
+import gc
+import logging
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from src.fetchin.fetcher.circuit_registry import (
+    CircuitBreakerConfigError,
+    CircuitBreakerRegistry,
+    breaker_key,
+)
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.metrics.prometheus_metrics import PrometheusMetrics
+from pybreaker import CircuitBreakerError
+from prometheus_client import CollectorRegistry
+import requests
+
+
+class TestCircuitBreakerRegistry(unittest.TestCase):
+    def test_breaker_keys_by_scope(self):
+        url = "https://api.example.com/users/1?page=2"
+        self.assertEqual(breaker_key("api", "label", url), "api")
+        self.assertEqual(breaker_key("api", "host", url), "api:api.example.com")
+        self.assertEqual(breaker_key("api", "route", url), "api:api.example.com/users/1")
+        self.assertEqual(breaker_key("api", lambda u: "users", url), "api:users")
+
+    def test_conflicting_config_is_rejected(self):
+        registry = CircuitBreakerRegistry()
+        registry.configure("api", {"fail_max": 2})
+        registry.configure("api", {"fail_max": 2, "backoff_strategy": lambda attempt: 0})
+        registry.configure("api")
+
+        with self.assertRaises(CircuitBreakerConfigError):
+            registry.configure("api", {"fail_max": 5})
+
+    def test_every_fetcher_on_a_label_is_notified(self):
+        first, second = MagicMock(), MagicMock()
+        Fetcher(label="test_registry_listeners", hooks=[first]).circuit_breaker
+        fetcher = Fetcher(label="test_registry_listeners", hooks=[second])
+        # The first fetcher is gone, its listener was only weakly referenced
+        gc.collect()
+        fetcher.circuit_breaker.open()
+        fetcher.circuit_breaker.close()
+
+        self.assertEqual(first.on_circuit_state_change.call_count, 0)
+        self.assertEqual(
+            [c.args for c in second.on_circuit_state_change.call_args_list],
+            [
+                ("test_registry_listeners", "test_registry_listeners", "closed", "open"),
+                ("test_registry_listeners", "test_registry_listeners", "open", "closed"),
+            ],
+        )
+
+        other = Fetcher(label="test_registry_listeners", hooks=[first])
+        other.circuit_breaker.open()
+        other.circuit_breaker.close()
+        self.assertEqual(first.on_circuit_state_change.call_count, 2)
+        self.assertEqual(second.on_circuit_state_change.call_count, 4)
+
+    def test_unknown_scope(self):
+        with self.assertRaises(ValueError):
+            CircuitBreakerRegistry().configure("api", {"scope": "planet"})
+
+    def test_idle_closed_breakers_are_evicted(self):
+        registry = CircuitBreakerRegistry()
+        registry.configure("api", {"idle_timeout": 10})
+        idle = registry.get("api", "api:idle.example.com")
+        tripped = registry.get("api", "api:down.example.com")
+        tripped.open()
+
+        evicted = registry.evict_idle(now=registry._last_used["api:idle.example.com"] + 11)
+
+        self.assertEqual(evicted, ["api:idle.example.com"])
+        self.assertIn("api:down.example.com", registry.breakers)
+        self.assertIsNot(registry.get("api", "api:idle.example.com"), idle)
+
+    def test_sweep_does_not_evict_a_breaker_being_handed_out(self):
+        registry = CircuitBreakerRegistry()
+        registry.configure("api", {"idle_timeout": 10})
+        breaker = registry.get("api")
+        sweep = threading.Thread(target=registry.evict_idle)
+
+        class SweepOnTouch(dict):
+            # Runs a sweep between the lookup of the breaker and its touch
+            def __setitem__(self, key, value):
+                if sweep.ident is None:
+                    sweep.start()
+                    sweep.join(0.1)
+                super().__setitem__(key, value)
+
+        registry._last_used = SweepOnTouch({"api": registry._last_used["api"] - 11})
+        self.assertIs(registry.get("api"), breaker)
+        sweep.join()
+        self.assertIs(registry.breakers.get("api"), breaker)
+
+
+class TestPerHostCircuitBreakers(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('requests.Session.request')
+    def test_failing_host_does_not_trip_other_hosts(self, mock_request):
+        def respond(method, url, **kwargs):
+            if "down.example.com" in url:
+                raise requests.exceptions.ConnectionError()
+            return MagicMock(status_code=200)
+
+        mock_request.side_effect = respond
+        circuit_config = {"fail_max": 1, "scope": "host", "backoff_strategy": lambda attempt: 0}
+        fetcher = Fetcher(label="test_per_host_breakers", circuit_config=circuit_config)
+
+        with self.assertRaises(CircuitBreakerError):
+            fetcher.get("http://down.example.com/api")
+
+        self.assertEqual(fetcher.get("http://up.example.com/api").status_code, 200)
+        self.assertIsNone(fetcher.circuit_breaker)
+        self.assertEqual(Fetcher.circuit_breakers["test_per_host_breakers:down.example.com"].current_state, "open")
+
+    def test_fetchers_with_conflicting_config(self):
+        Fetcher(label="test_conflicting_breaker", circuit_config={"fail_max": 1})
+        with self.assertRaises(CircuitBreakerConfigError):
+            Fetcher(label="test_conflicting_breaker", circuit_config={"fail_max": 4})
+
+    @patch('requests.Session.request')
+    def test_state_transitions_are_reported(self, mock_request):
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+        registry = CollectorRegistry()
+        logger = MagicMock()
+        fetcher = Fetcher(
+            label="test_breaker_transitions",
+            logger=logger,
+            metrics=PrometheusMetrics(registry=registry),
+            circuit_config={"fail_max": 1},
+        )
+
+        with self.assertRaises(CircuitBreakerError):
+            fetcher.get("http://localhost:8080/api/example")
+
+        labels = {"fetcher_label": "test_breaker_transitions", "breaker": "test_breaker_transitions"}
+        self.assertEqual(registry.get_sample_value("http_circuit_breaker_transitions_total", {**labels, "state": "open"}), 1)
+        self.assertEqual(registry.get_sample_value("http_circuit_breaker_state", labels), 2)
+        logger.error.assert_any_call(
+            "Circuit breaker test_breaker_transitions changed state to open",
+            extra={
+                "fetcher_label": "test_breaker_transitions",
+                "breaker": "test_breaker_transitions",
+                "previous_state": "closed",
+                "state": "open",
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import logging
+import multiprocessing
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.fetchin.fetcher.circuit_registry import CircuitBreakerRegistry
+from src.fetchin.fetcher.circuit_storage import MmapCircuitStorage, MmapStateStorage, RedisStateStorage
+from src.fetchin.fetcher.fetcher import Fetcher
+from pybreaker import CircuitBreakerError
+import requests
+
+try:
+    import fakeredis
+except ImportError:  # pragma: no cover
+    fakeredis = None
+
+
+def increment_counter(path, times):
+    storage = MmapCircuitStorage(path)
+    for _ in range(times):
+        storage.increment_counter()
+    storage.close()
+
+
+class SharedStateTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('requests.Session.request')
+    def assert_state_is_shared(self, label, state_storage, mock_request):
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+        circuit_config = {"fail_max": 2, "state_storage": state_storage, "backoff_strategy": lambda attempt: 0}
+        fetcher = Fetcher(label=label, circuit_config=circuit_config)
+
+        with self.assertRaises(CircuitBreakerError):
+            fetcher.get("http://localhost:8080/api/example")
+
+        other_worker = CircuitBreakerRegistry()
+        other_worker.configure(label, circuit_config)
+        breaker = other_worker.get(label)
+        self.assertEqual(breaker.current_state, "open")
+        with self.assertRaises(CircuitBreakerError):
+            with breaker.calling():
+                pass
+
+
+class TestMmapStateStorage(SharedStateTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.storage = MmapStateStorage(self.directory.name)
+
+    def test_state_is_shared_between_storages(self):
+        first = self.storage.create("api:example.com")
+        second = self.storage.create("api:example.com")
+
+        first.increment_counter()
+        first.state = "open"
+        self.assertEqual((second.state, second.counter), ("open", 1))
+
+        second.reset_counter()
+        self.assertEqual(first.counter, 0)
+        self.assertIsNone(first.opened_at)
+
+    def test_counter_updates_are_atomic_across_processes(self):
+        path = self.storage.path("api")
+        processes = [multiprocessing.Process(target=increment_counter, args=(path, 200)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual(self.storage.create("api").counter, 800)
+
+    def test_breaker_opened_by_one_worker_is_open_for_all(self):
+        self.assert_state_is_shared("test_mmap_shared_state", self.storage)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class TestRedisStateStorage(SharedStateTestCase):
+    def test_breaker_opened_by_one_worker_is_open_for_all(self):
+        storage = RedisStateStorage(fakeredis.FakeStrictRedis())
+        self.assert_state_is_shared("test_redis_shared_state", storage)
+
+
+if __name__ == "__main__":
+    unittest.main()
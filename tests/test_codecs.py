@@ -0,0 +1,135 @@
+import gzip
+import json
+import unittest
+from unittest.mock import MagicMock
+from src.fetchin.codecs.body_serializer import BodySerializer
+from src.fetchin.codecs.json_codec import JSONCodec
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from tests.http_server import LocalHTTPServer
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+PAYLOAD = {"items": [{"id": i, "name": f"item-{i}"} for i in range(200)]}
+
+
+class RecordingResponder:
+    def __init__(self, status=200, headers=None, body=b"{}"):
+        self.response = (status, headers or {"Content-Type": "application/json"}, body)
+        self.requests = []
+
+    def __call__(self, handler, body):
+        self.requests.append((dict(handler.headers), body))
+        return self.response
+
+
+class TestBodySerializer(unittest.TestCase):
+    def test_json_codec_with_and_without_orjson(self):
+        for codec in (JSONCodec(), JSONCodec(use_orjson=False)):
+            encoded = codec.encode(PAYLOAD)
+            self.assertNotIn(b", ", encoded)
+            self.assertEqual(codec.decode(encoded), PAYLOAD)
+
+    def test_compresses_above_the_threshold(self):
+        serializer = BodySerializer(encoding="gzip", min_size=1024)
+
+        body, headers, codec, size = serializer.encode(PAYLOAD)
+        self.assertEqual(headers, {"Content-Type": "application/json", "Content-Encoding": "gzip"})
+        self.assertLess(len(body), size)
+        self.assertEqual(json.loads(gzip.decompress(body)), PAYLOAD)
+
+        body, headers, _, size = serializer.encode({"small": True})
+        self.assertEqual(headers, {"Content-Type": "application/json"})
+        self.assertEqual(len(body), size)
+
+    def test_caller_headers_are_matched_case_insensitively(self):
+        serializer = BodySerializer(encoding="gzip", min_size=0)
+        _, headers, _, _ = serializer.encode(PAYLOAD, {"content-type": "application/vnd.api+json", "content-encoding": "br"})
+        self.assertEqual(headers, {"content-type": "application/vnd.api+json", "Content-Encoding": "gzip"})
+
+    def test_bytes_pass_through_unchanged(self):
+        serializer = BodySerializer()
+        body, headers, codec, _ = serializer.encode(b"a,b\n1,2", {"Content-Type": "text/csv"})
+        self.assertEqual((body, headers, codec), (b"a,b\n1,2", {"Content-Type": "text/csv"}, "bytes"))
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd_compression(self):
+        body, headers, _, _ = BodySerializer(encoding="zstd", min_size=0).encode(PAYLOAD)
+        self.assertEqual(headers["Content-Encoding"], "zstd")
+        decompressed = zstandard.ZstdDecompressor().decompress(body)
+        self.assertEqual(json.loads(decompressed), PAYLOAD)
+
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    def test_decoder_follows_the_response_content_type(self):
+        serializer = BodySerializer("msgpack")
+        self.assertEqual(serializer.codec_for("application/x-msgpack").name, "msgpack")
+        self.assertEqual(serializer.codec_for("application/problem+json; charset=utf-8").name, "json")
+        self.assertEqual(serializer.codec_for("text/csv").name, "bytes")
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            BodySerializer("xml")
+        with self.assertRaises(ValueError):
+            Fetcher(label="test_codec_invalid", compression_config={"encoding": "br"})
+
+
+class TestFetcherBodies(unittest.TestCase):
+    def test_post_compresses_large_bodies(self):
+        responder, metrics = RecordingResponder(), MagicMock()
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(
+                label="test_codec_post",
+                metrics=metrics,
+                compression_config={"encoding": "gzip", "min_size": 512},
+            ) as fetcher:
+                fetcher.post(f"{server.url}/ingest", data=PAYLOAD)
+
+        headers, body = responder.requests[0]
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(headers["Content-Type"], "application/json")
+        self.assertEqual(json.loads(gzip.decompress(body)), PAYLOAD)
+
+        label, direction, codec, size, encoded_size, duration = metrics.track_body.call_args.args
+        self.assertEqual((label, direction, codec, encoded_size), ("test_codec_post", "request", "json", len(body)))
+        self.assertGreater(size, encoded_size)
+
+    def test_decode_reports_wire_and_decoded_sizes(self):
+        body = json.dumps(PAYLOAD).encode()
+        compressed = gzip.compress(body)
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        metrics = MagicMock()
+        with LocalHTTPServer(RecordingResponder(headers=headers, body=compressed)) as server:
+            with Fetcher(label="test_codec_decode", metrics=metrics) as fetcher:
+                data = fetcher.decode(fetcher.get(f"{server.url}/export"))
+
+        self.assertEqual(data, PAYLOAD)
+        _, direction, codec, size, encoded_size, _ = metrics.track_body.call_args.args
+        self.assertEqual((direction, codec, size), ("response", "json", len(body)))
+        self.assertEqual(encoded_size, len(compressed))
+
+
+class TestAsyncFetcherBodies(unittest.IsolatedAsyncioTestCase):
+    @unittest.skipIf(msgpack is None, "msgpack is not installed")
+    async def test_async_post_with_msgpack(self):
+        responder = RecordingResponder(headers={"Content-Type": "application/msgpack"}, body=msgpack.packb({"ok": True}))
+        with LocalHTTPServer(responder) as server:
+            async with AsyncFetcher(label="test_codec_async", codec="msgpack") as fetcher:
+                response = await fetcher.post(f"{server.url}/ingest", data=PAYLOAD)
+                data = fetcher.decode(response)
+
+        headers, body = responder.requests[0]
+        self.assertEqual(headers["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(body), PAYLOAD)
+        self.assertEqual(data, {"ok": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import threading
+import time
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded
+from src.fetchin.fetcher.fetcher import Fetcher
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    def test_aimd_grows_when_utilized_and_backs_off_on_drops(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=10)
+        for _ in range(3):
+            limiter.acquire()
+        limiter.release(0.01, dropped=False)
+        self.assertEqual(limiter.limit, 5)
+
+        limiter.release(0.01, dropped=True)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_latency_threshold_counts_as_drop(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_threshold=0.5)
+        limiter.acquire()
+        limiter.release(1.0, dropped=False)
+        self.assertEqual(limiter.limit, 9)
+
+    def test_vegas_shrinks_when_latency_queues_up(self):
+        limiter = AdaptiveConcurrencyLimiter(algorithm="vegas", initial_limit=20)
+        for _ in range(20):
+            limiter.acquire()
+
+        limiter.release(0.01, dropped=False)
+        grown = limiter.limit
+        limiter.release(0.1, dropped=False)
+
+        self.assertEqual(grown, 22)
+        self.assertLess(limiter.limit, grown)
+
+    def test_reject_mode(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+
+        with self.assertRaises(ConcurrencyLimitExceeded):
+            limiter.acquire("reject")
+        self.assertEqual(limiter.rejected, 1)
+
+    def test_wait_mode_hands_released_slot_to_waiter(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        limiter.acquire()
+        threading.Timer(0.1, limiter.release).start()
+
+        wait_time = limiter.acquire("wait", timeout=1)
+        self.assertGreaterEqual(wait_time, 0.05)
+        self.assertEqual(limiter.in_flight, 1)
+
+        with self.assertRaises(ConcurrencyLimitExceeded):
+            limiter.acquire("wait", timeout=0.05)
+        self.assertEqual(len(limiter._waiters), 0)
+
+
+class TestFetcherConcurrencyLimit(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('requests.Session.request')
+    def test_excess_requests_are_shed_before_the_circuit_breaker(self, mock_request):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_response(*args, **kwargs):
+            started.set()
+            release.wait()
+            return MagicMock(status_code=200)
+
+        mock_request.side_effect = slow_response
+        metrics = MagicMock()
+        concurrency_config = {"initial_limit": 1, "min_limit": 1}
+        fetcher = Fetcher(label="test_concurrency_shed", metrics=metrics, concurrency_config=concurrency_config)
+
+        worker = threading.Thread(target=fetcher.get, args=("http://localhost:8080/api/example",))
+        worker.start()
+        started.wait()
+        with self.assertRaises(ConcurrencyLimitExceeded):
+            fetcher.get("http://localhost:8080/api/example")
+        release.set()
+        worker.join()
+
+        self.assertEqual(fetcher.circuit_breaker.fail_counter, 0)
+        metrics.track_concurrency.assert_any_call("test_concurrency_shed", 1, 1, True)
+        self.assertEqual(metrics.track_concurrency.call_args.args, ("test_concurrency_shed", 2, 0, False))
+
+    @patch('requests.Session.request')
+    def test_overload_responses_shrink_the_limit(self, mock_request):
+        mock_request.return_value = MagicMock(status_code=503)
+        fetcher = Fetcher(label="test_concurrency_overload", concurrency_config={"initial_limit": 10})
+
+        for _ in range(3):
+            fetcher.get("http://localhost:8080/api/example")
+        self.assertEqual(fetcher.concurrency_limiter.limit, 7)
+
+    def test_slot_is_released_when_the_attempt_cannot_start(self):
+        fetcher = Fetcher(label="test_concurrency_setup_error", concurrency_config={"initial_limit": 1})
+        with patch.object(fetcher, "_circuit_breaker_for", side_effect=RuntimeError("boom")):
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    fetcher.get("http://localhost:8080/api/example")
+
+        self.assertEqual(fetcher.concurrency_limiter.in_flight, 0)
+
+
+class TestAsyncConcurrencyLimit(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_async_requests_queue_for_a_slot(self, mock_request):
+        in_flight, peak = 0, 0
+
+        async def slow_response(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return MagicMock(status_code=503)
+
+        mock_request.side_effect = slow_response
+        concurrency_config = {"initial_limit": 2, "mode": "wait", "timeout": 1}
+        fetcher = AsyncFetcher(label="test_async_concurrency", concurrency_config=concurrency_config)
+
+        start = time.monotonic()
+        await asyncio.gather(*(fetcher.get("http://localhost:8080/api/example") for _ in range(6)))
+
+        self.assertEqual(peak, 2)
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertEqual(fetcher.concurrency_limiter.in_flight, 0)
+
+    async def test_async_slot_is_released_when_the_attempt_cannot_start(self):
+        fetcher = AsyncFetcher(label="test_async_concurrency_setup_error", concurrency_config={"initial_limit": 1})
+        with patch.object(fetcher, "_select_endpoint", side_effect=RuntimeError("boom")):
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    await fetcher.get("http://localhost:8080/api/example")
+
+        self.assertEqual(fetcher.concurrency_limiter.in_flight, 0)
+
+    async def test_async_reject_mode(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire_async()
+        with self.assertRaises(ConcurrencyLimitExceeded):
+            await limiter.acquire_async("wait", timeout=0.01)
+        self.assertEqual(limiter.rejected, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,7 +23,7 @@ class TestFetcher(unittest.TestCase):
     def tearDown(self):
         logging.disable(logging.NOTSET)
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_get_with_timeout_and_headers(self, mock_request):
         fetcher = Fetcher(
             label="test_get_with_timeout", 
@@ -54,7 +54,7 @@ class TestFetcher(unittest.TestCase):
         self.assertEqual(response.json(), {"data": "test"})
 
     
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_circuit_sharing_between_fetchers(self, mock_request):
         fetcher1 = Fetcher(label="shared_circuit", logger=CustomLogger(), metrics=PrometheusMetrics(), circuit_config=self.circuit_config)
         fetcher2 = Fetcher(label="shared_circuit", logger=CustomLogger(), metrics=PrometheusMetrics(), circuit_config=self.circuit_config)
@@ -67,7 +67,7 @@ class TestFetcher(unittest.TestCase):
         with self.assertRaises(CircuitBreakerError):
             fetcher2.get("http://localhost:8080/api/example")
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_circuit_independence_between_fetchers(self, mock_request):
         fetcher1 = Fetcher(label="circuit_1", logger=CustomLogger(), metrics=PrometheusMetrics(), circuit_config=self.circuit_config)
         fetcher2 = Fetcher(label="circuit_2", logger=CustomLogger(), metrics=PrometheusMetrics(), circuit_config=self.circuit_config)
@@ -87,7 +87,7 @@ class TestFetcher(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"data": "success"})
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_get_success(self, mock_request):
         fetcher = Fetcher(label="test_get_success", logger=self.logger, metrics=self.metrics, circuit_config=self.circuit_config)
         
@@ -100,7 +100,7 @@ class TestFetcher(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"data": "test"})
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_post_success(self, mock_request):
         fetcher = Fetcher(label="test_post_success", logger=self.logger, metrics=self.metrics, circuit_config=self.circuit_config)
         
@@ -113,7 +113,7 @@ class TestFetcher(unittest.TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.json(), {"success": True})
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_delete_success(self, mock_request):
         fetcher = Fetcher(label="test_delete_success", logger=self.logger, metrics=self.metrics, circuit_config=self.circuit_config)
         
@@ -124,7 +124,7 @@ class TestFetcher(unittest.TestCase):
         response = fetcher.delete("http://localhost:8080/api/example")
         self.assertEqual(response.status_code, 204)
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_put_success(self, mock_request):
         fetcher = Fetcher(label="test_put_success", logger=self.logger, metrics=self.metrics, circuit_config=self.circuit_config)
         
@@ -137,7 +137,7 @@ class TestFetcher(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"updated": True})
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_patch_success(self, mock_request):
         fetcher = Fetcher(label="test_patch_success", logger=self.logger, metrics=self.metrics, circuit_config=self.circuit_config)
         
@@ -150,7 +150,7 @@ class TestFetcher(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"patched": True})
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_get_circuit_breaker_error(self, mock_request):
         fetcher = Fetcher(label="test_get_circuit_breaker_error", logger=self.logger, metrics=self.metrics, circuit_config=self.circuit_config)
 
@@ -160,7 +160,7 @@ class TestFetcher(unittest.TestCase):
             fetcher.get("http://localhost:8080/api/example")
             fetcher.get("http://localhost:8080/api/example")
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_get_retry(self, mock_request):
         circuit_config = {
             "fail_max": 2,
@@ -178,7 +178,7 @@ class TestFetcher(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"data": "test"})
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_half_open_circuit(self, mock_request):
         fetcher = Fetcher(label="test_half_open_circuit", logger=self.logger, metrics=self.metrics, circuit_config=self.circuit_config)
 
@@ -195,7 +195,7 @@ class TestFetcher(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json(), {"data": "half-open success"})
     
-    @patch('requests.request')
+    @patch('requests.Session.request')
     @patch.object(CustomLogger, 'info')
     @patch.object(PrometheusMetrics, 'track_request')
     def test_fetcher_with_logs_and_metrics(self, mock_track_request, mock_logger_info, mock_request):
@@ -213,7 +213,7 @@ class TestFetcher(unittest.TestCase):
         mock_logger_info.assert_called()
         mock_track_request.assert_called()
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     @patch.object(CustomLogger, 'info')
     @patch.object(PrometheusMetrics, 'track_request')
     def test_fetcher_without_logs_and_metrics(self, mock_track_request, mock_logger_info, mock_request):
@@ -231,7 +231,7 @@ class TestFetcher(unittest.TestCase):
         mock_logger_info.assert_not_called()
         mock_track_request.assert_not_called()
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     @patch.object(CustomLogger, 'info')
     @patch.object(PrometheusMetrics, 'track_request')
     def test_fetcher_with_logs_without_metrics(self, mock_track_request, mock_logger_info, mock_request):
@@ -249,7 +249,7 @@ class TestFetcher(unittest.TestCase):
         mock_logger_info.assert_called()
         mock_track_request.assert_not_called()
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     @patch.object(CustomLogger, 'info')
     @patch.object(PrometheusMetrics, 'track_request')
     def test_fetcher_without_logs_with_metrics(self, mock_track_request, mock_logger_info, mock_request):
@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.hedging import CancelEvent, HedgeConfigError, HedgePolicy
+from tests.http_server import LocalHTTPServer
+
+
+def slow_first_responder(delay, first_status=200):
+    calls, lock = [], threading.Lock()
+
+    def responder(handler, body):
+        with lock:
+            calls.append(handler.path)
+            first = len(calls) == 1
+        if first:
+            time.sleep(delay)
+            return first_status, {}, b'{"data": "test"}'
+        return 200, {}, b'{"data": "test"}'
+
+    responder.calls = calls
+    return responder
+
+
+class TestHedgePolicy(unittest.TestCase):
+    def test_requires_delay_or_percentile(self):
+        with self.assertRaises(ValueError):
+            HedgePolicy.from_config({"budget": 0.1})
+
+    def test_delay_follows_observed_percentile(self):
+        policy = HedgePolicy(percentile=95, delay=1.0, window=100)
+        self.assertEqual(policy.hedge_delay(), 1.0)
+
+        for latency in range(1, 101):
+            policy.observe(latency / 1000)
+        self.assertEqual(policy.hedge_delay(), 0.096)
+
+    def test_budget_limits_hedges(self):
+        policy = HedgePolicy(delay=0.1, budget=0.1)
+        for _ in range(20):
+            policy.record_request()
+
+        self.assertEqual([policy.try_acquire_hedge() for _ in range(3)], [True, True, False])
+
+    def test_primary_workers_are_bounded(self):
+        policy, release = HedgePolicy(delay=0.1, max_primaries=1), threading.Event()
+        primary = policy.submit_primary(release.wait)
+        self.assertIsNone(policy.submit_primary(release.wait))
+
+        release.set()
+        primary.result()
+        deadline, next_primary = time.monotonic() + 1, None
+        while next_primary is None and time.monotonic() < deadline:
+            next_primary = policy.submit_primary(time.sleep, 0)
+        self.assertIsNotNone(next_primary)
+
+    def test_cancel_event_follows_its_parent(self):
+        parent = threading.Event()
+        event = CancelEvent(parent)
+        self.assertFalse(event.wait(0.01))
+
+        threading.Timer(0.05, parent.set).start()
+        self.assertTrue(event.wait(1))
+        self.assertTrue(event.is_set())
+
+
+class TestHedgedRequests(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_hedge_wins_over_slow_primary(self):
+        metrics = MagicMock()
+        responder = slow_first_responder(0.5)
+        hedge_config = {"delay": 0.05, "budget": 1.0}
+
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_hedge_wins", metrics=metrics, hedge_config=hedge_config) as fetcher:
+                start = time.monotonic()
+                response = fetcher.get(f"{server.url}/api/example")
+                elapsed = time.monotonic() - start
+
+        self.assertEqual(response.json(), {"data": "test"})
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(len(responder.calls), 2)
+        self.assertEqual(
+            [c.args for c in metrics.track_hedge.call_args_list],
+            [("test_hedge_wins", "GET", "sent"), ("test_hedge_wins", "GET", "won")],
+        )
+
+    def test_losing_primary_is_not_retried(self):
+        responder = slow_first_responder(0.3, first_status=503)
+        hedge_config = {"delay": 0.05, "budget": 1.0}
+        circuit_config = {"retry_statuses": [503], "backoff_strategy": lambda attempt: 0.05}
+
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(
+                label="test_hedge_loser", circuit_config=circuit_config, hedge_config=hedge_config
+            ) as fetcher:
+                self.assertEqual(fetcher.get(f"{server.url}/api/example").status_code, 200)
+                time.sleep(0.5)
+
+        self.assertEqual(len(responder.calls), 2)
+
+    def test_primaries_do_not_queue_for_hedge_workers(self):
+        def responder(handler, body):
+            time.sleep(0.2)
+            return 200, {}, b'{"data": "test"}'
+
+        hedge_config = {"delay": 1.0, "budget": 0, "max_workers": 1}
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_hedge_workers", hedge_config=hedge_config) as fetcher:
+                start = time.monotonic()
+                responses = fetcher.gather([f"{server.url}/api/example"] * 4, concurrency=4)
+                elapsed = time.monotonic() - start
+
+        self.assertEqual([r.status_code for r in responses], [200] * 4)
+        self.assertLess(elapsed, 0.6)
+
+    def test_policy_is_shared_per_label(self):
+        hedge_config = {"percentile": 95, "delay": 0.2, "budget": 0.05}
+        fetcher1 = Fetcher(label="test_hedge_shared", hedge_config=hedge_config)
+        fetcher2 = Fetcher(label="test_hedge_shared", hedge_config=dict(hedge_config))
+        self.assertIs(fetcher1.hedge_policy, fetcher2.hedge_policy)
+
+        with self.assertRaises(HedgeConfigError):
+            Fetcher(label="test_hedge_shared", hedge_config={**hedge_config, "budget": 0.5})
+
+    def test_busy_primary_workers_send_without_hedging(self):
+        calls = []
+
+        def responder(handler, body):
+            calls.append(handler.path)
+            time.sleep(0.1)
+            return 200, {}, b'{"data": "test"}'
+
+        hedge_config = {"delay": 0.01, "budget": 1.0, "max_primaries": 1}
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_hedge_max_primaries", hedge_config=hedge_config) as fetcher:
+                responses = fetcher.gather([f"{server.url}/api/example"] * 2, concurrency=2)
+
+        # One request is hedged, the other one runs on the caller's thread
+        self.assertEqual([r.status_code for r in responses], [200] * 2)
+        self.assertEqual(len(calls), 3)
+
+    def test_fast_primary_is_not_hedged(self):
+        responder = slow_first_responder(0)
+        hedge_config = {"delay": 0.5, "budget": 1.0}
+
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_hedge_fast_primary", hedge_config=hedge_config) as fetcher:
+                fetcher.get(f"{server.url}/api/example")
+
+        self.assertEqual(len(responder.calls), 1)
+
+    def test_exhausted_budget_and_non_idempotent_methods_are_not_hedged(self):
+        responder = slow_first_responder(0.2)
+        hedge_config = {"delay": 0.01, "budget": 0}
+
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_hedge_budget", hedge_config=hedge_config) as fetcher:
+                fetcher.get(f"{server.url}/api/example")
+            with Fetcher(label="test_hedge_post", hedge_config={"delay": 0.01, "budget": 1.0}) as fetcher:
+                fetcher.post(f"{server.url}/api/example", data={"key": "value"})
+
+        self.assertEqual(len(responder.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
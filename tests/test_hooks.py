@@ -0,0 +1,229 @@
+import logging
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.hooks.hook_interface import HookInterface
+from tests.http_server import LocalHTTPServer
+import requests
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+    from src.fetchin.hooks.opentelemetry_hooks import OpenTelemetryHooks
+except ImportError:  # pragma: no cover
+    trace = None
+
+
+def sampled(traceparent: str):
+    return bool(int(traceparent.rsplit("-", 1)[1], 16) & 1)
+
+
+class RecordingHooks(HookInterface):
+    def __init__(self):
+        self.events = []
+
+    def on_request_start(self, context):
+        self.events.append("request_start")
+        context.headers["X-Request-Id"] = "abc"
+
+    def on_attempt_start(self, context):
+        self.events.append(f"attempt_start:{context.attempt}")
+
+    def on_response(self, context, response):
+        self.events.append(f"response:{response.status_code}")
+
+    def on_attempt_end(self, context, response, error, duration):
+        self.events.append(f"attempt_end:{type(error).__name__ if error else 'ok'}")
+
+    def on_retry_scheduled(self, context, delay):
+        self.events.append(f"retry:{delay}")
+
+    def on_request_end(self, context, response, error, duration):
+        self.events.append(f"request_end:{response.status_code if response else type(error).__name__}")
+
+    def on_circuit_state_change(self, label, breaker, previous_state, state):
+        self.events.append(f"circuit:{state}")
+
+
+class TestHooks(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.circuit_config = {"fail_max": 5, "backoff_strategy": lambda attempt: 0}
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch("requests.Session.request")
+    def test_lifecycle_events(self, mock_request):
+        hooks = RecordingHooks()
+        fetcher = Fetcher(label="test_hooks_lifecycle", circuit_config=self.circuit_config, hooks=[hooks])
+        mock_request.side_effect = [requests.exceptions.ConnectionError(), MagicMock(status_code=200)]
+
+        fetcher.get("http://localhost:8080/api/example", headers={"Accept": "application/json"})
+
+        self.assertEqual(
+            hooks.events,
+            [
+                "request_start",
+                "attempt_start:1",
+                "attempt_end:ConnectionError",
+                "retry:0",
+                "attempt_start:2",
+                "response:200",
+                "attempt_end:ok",
+                "request_end:200",
+            ],
+        )
+        headers = mock_request.call_args.kwargs["headers"]
+        self.assertEqual(headers, {"Accept": "application/json", "X-Request-Id": "abc"})
+        self.assertNotIn("hook_context", mock_request.call_args.kwargs)
+
+    @patch("requests.Session.request")
+    def test_failed_requests_and_breaker_changes(self, mock_request):
+        hooks = RecordingHooks()
+        circuit_config = {"fail_max": 1}
+        fetcher = Fetcher(label="test_hooks_breaker", circuit_config=circuit_config, max_retries=1, hooks=[hooks])
+        mock_request.side_effect = requests.exceptions.ConnectionError()
+
+        with self.assertRaises(Exception):
+            fetcher.get("http://localhost:8080/api/example")
+
+        self.assertIn("circuit:open", hooks.events)
+        self.assertEqual(hooks.events[-1], "request_end:CircuitBreakerError")
+
+    @patch("requests.Session.request")
+    def test_failing_hooks_are_logged_and_skipped(self, mock_request):
+        class BrokenHooks(HookInterface):
+            def on_attempt_start(self, context):
+                raise RuntimeError("broken")
+
+        logger, hooks = MagicMock(), RecordingHooks()
+        fetcher = Fetcher(label="test_hooks_broken", logger=logger, hooks=[BrokenHooks(), hooks])
+        mock_request.return_value = MagicMock(status_code=200)
+
+        self.assertEqual(fetcher.get("http://localhost:8080/api/example").status_code, 200)
+        self.assertIn("attempt_start:1", hooks.events)
+        message = logger.error.call_args.args[0]
+        self.assertEqual(message, "Hook BrokenHooks.on_attempt_start failed: RuntimeError('broken')")
+
+    def test_losing_hedge_emits_nothing_after_the_request_ended(self):
+        calls, lock = [], threading.Lock()
+
+        def responder(handler, body):
+            with lock:
+                calls.append(handler.path)
+                first = len(calls) == 1
+            if first:
+                time.sleep(0.3)
+            return 200, {}, b"{}"
+
+        hooks, contexts = RecordingHooks(), []
+        hooks.on_attempt_start = lambda context: contexts.append((context.hedge, context.attempt))
+        hedge_config = {"delay": 0.05, "budget": 1.0}
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_hooks_hedge", hedge_config=hedge_config, hooks=[hooks]) as fetcher:
+                fetcher.get(f"{server.url}/api/example")
+                time.sleep(0.4)
+
+        self.assertEqual(sorted(contexts), [(False, 1), (True, 1)])
+        self.assertEqual(hooks.events[-1], "request_end:200")
+        self.assertEqual(hooks.events.count("attempt_end:ok"), 1)
+
+    @patch("requests.Session.request")
+    def test_no_hooks_leaves_requests_untouched(self, mock_request):
+        mock_request.return_value = MagicMock(status_code=200)
+        fetcher = Fetcher(label="test_hooks_disabled")
+
+        with patch.object(fetcher, "_emit") as emit:
+            fetcher.get("http://localhost:8080/api/example")
+
+        emit.assert_not_called()
+        mock_request.assert_called_once_with("GET", "http://localhost:8080/api/example")
+
+
+@unittest.skipIf(trace is None, "opentelemetry-sdk is not installed")
+class TestOpenTelemetryHooks(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.exporter = InMemorySpanExporter()
+        self.provider = TracerProvider()
+        self.provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        self.received = []
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def responder(self, handler, body):
+        self.received.append(handler.headers.get("traceparent"))
+        status = 503 if len(self.received) == 1 else 200
+        return status, {}, b"{}"
+
+    def test_span_per_request_with_propagated_trace_context(self):
+        hooks = OpenTelemetryHooks(tracer_provider=self.provider, propagator=TraceContextTextMapPropagator())
+        circuit_config = {"retry_statuses": [503], "backoff_strategy": lambda attempt: 0}
+        with LocalHTTPServer(self.responder) as server:
+            with Fetcher(label="test_otel", circuit_config=circuit_config, hooks=[hooks]) as fetcher:
+                fetcher.get(f"{server.url}/api/example")
+
+        (span,) = self.exporter.get_finished_spans()
+        self.assertEqual(span.name, "GET")
+        self.assertEqual(span.kind, trace.SpanKind.CLIENT)
+        self.assertEqual(span.attributes["http.response.status_code"], 200)
+        self.assertEqual(span.attributes["http.request.resend_count"], 1)
+        self.assertEqual([e.name for e in span.events], ["retry_scheduled", "retry"])
+
+        trace_id = format(span.context.trace_id, "032x")
+        span_id = format(span.context.span_id, "016x")
+        self.assertEqual([h.rsplit("-", 1)[0] for h in self.received], [f"00-{trace_id}-{span_id}"] * 2)
+        self.assertTrue(all(sampled(h) for h in self.received))
+
+    def test_head_based_sampling(self):
+        hooks = OpenTelemetryHooks(tracer_provider=self.provider, sample_rate=0, propagator=TraceContextTextMapPropagator())
+        with LocalHTTPServer(self.responder) as server:
+            with Fetcher(label="test_otel_sampling", hooks=[hooks]) as fetcher:
+                fetcher.get(f"{server.url}/api/example")
+
+                tracer = self.provider.get_tracer("test")
+                with tracer.start_as_current_span("parent") as parent:
+                    fetcher.get(f"{server.url}/api/example")
+
+        spans = self.exporter.get_finished_spans()
+        self.assertEqual([s.name for s in spans], ["GET", "parent"])
+        self.assertEqual(spans[0].parent.span_id, parent.get_span_context().span_id)
+        self.assertEqual([sampled(h) for h in self.received], [False, True])
+
+    def test_failed_request_marks_the_span(self):
+        hooks = OpenTelemetryHooks(tracer_provider=self.provider)
+        fetcher = Fetcher(label="test_otel_error", max_retries=1, hooks=[hooks])
+
+        with patch("requests.Session.request", side_effect=requests.exceptions.ConnectionError()):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                fetcher.get("http://localhost:8080/api/example")
+
+        (span,) = self.exporter.get_finished_spans()
+        self.assertEqual(span.status.status_code, trace.StatusCode.ERROR)
+        self.assertEqual(span.attributes["error.type"], "ConnectionError")
+
+
+class TestAsyncHooks(unittest.IsolatedAsyncioTestCase):
+    async def test_async_lifecycle_events(self):
+        hooks = RecordingHooks()
+        with LocalHTTPServer() as server:
+            async with AsyncFetcher(label="test_async_hooks", hooks=[hooks]) as fetcher:
+                response = await fetcher.get(f"{server.url}/api/example")
+
+        self.assertEqual(response.request.headers["X-Request-Id"], "abc")
+        self.assertEqual(
+            hooks.events,
+            ["request_start", "attempt_start:1", "response:200", "attempt_end:ok", "request_end:200"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import logging
+import socket
+import threading
+import time
+import unittest
+import requests
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.transports.http2_transport import HTTP2Transport
+
+try:
+    from tests.h2_server import LocalH2Server
+except ImportError:  # pragma: no cover
+    LocalH2Server = None
+
+H2C_CONFIG = {"http2_prior_knowledge": True}
+
+
+class SlowResponder:
+    def __init__(self, delay: float = 0.1, statuses=()):
+        self.delay = delay
+        self.statuses = list(statuses)
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request, body):
+        with self.lock:
+            self.requests.append((request, body))
+            status = self.statuses.pop(0) if self.statuses else 200
+        time.sleep(self.delay)
+        return status, {"content-type": "application/json"}, body or b'{"ok": true}'
+
+
+@unittest.skipIf(LocalH2Server is None, "h2 is not installed")
+class TestHTTP2Transport(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_concurrent_requests_share_one_connection(self):
+        responder = SlowResponder()
+        with LocalH2Server(responder) as server:
+            with Fetcher(label="test_http2_multiplex", pool_config=H2C_CONFIG) as fetcher:
+                self.assertIsInstance(fetcher.transport, HTTP2Transport)
+                start = time.monotonic()
+                responses = fetcher.gather([f"{server.url}/api/example"] * 20, concurrency=20)
+                elapsed = time.monotonic() - start
+
+        self.assertEqual([r.json() for r in responses], [{"ok": True}] * 20)
+        self.assertEqual(server.connections, 1)
+        self.assertGreater(server.max_in_flight, 1)
+        self.assertLess(elapsed, 20 * responder.delay)
+
+    def test_max_streams_bounds_in_flight_requests(self):
+        config = {**H2C_CONFIG, "max_streams": 2}
+        with LocalH2Server(SlowResponder(delay=0.05)) as server:
+            with Fetcher(label="test_http2_max_streams", pool_config=config) as fetcher:
+                fetcher.gather([f"{server.url}/api/example"] * 8, concurrency=8)
+
+        self.assertEqual(server.max_in_flight, 2)
+
+    def test_bodies_headers_and_retries(self):
+        responder = SlowResponder(delay=0, statuses=[503])
+        circuit_config = {"retry_statuses": [503], "backoff_strategy": lambda attempt: 0}
+        with LocalH2Server(responder) as server:
+            with Fetcher(
+                label="test_http2_retry", circuit_config=circuit_config, pool_config=H2C_CONFIG
+            ) as fetcher:
+                response = fetcher.post(
+                    f"{server.url}/ingest", data={"id": 1}, headers={"X-Request-Id": "abc"}, params={"v": 2}
+                )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"id": 1})
+        self.assertEqual(len(responder.requests), 2)
+        request, body = responder.requests[-1]
+        self.assertEqual((request.command, request.path), ("POST", "/ingest?v=2"))
+        self.assertEqual(request.headers["x-request-id"], "abc")
+        self.assertEqual(json.loads(body), {"id": 1})
+
+    def test_streamed_responses_release_their_stream(self):
+        config = {**H2C_CONFIG, "max_streams": 1}
+        with LocalH2Server(SlowResponder(delay=0)) as server:
+            with Fetcher(label="test_http2_stream", pool_config=config) as fetcher:
+                for _ in range(2):
+                    with fetcher.stream("GET", f"{server.url}/api/example") as stream:
+                        self.assertEqual(b"".join(stream.iter_bytes(4)), b'{"ok": true}')
+
+    def test_connection_errors_match_requests(self):
+        with socket.create_server(("127.0.0.1", 0)) as sock:
+            port = sock.getsockname()[1]
+        with Fetcher(label="test_http2_refused", max_retries=1, pool_config=H2C_CONFIG) as fetcher:
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                fetcher.get(f"http://127.0.0.1:{port}/api/example")
+
+
+@unittest.skipIf(LocalH2Server is None, "h2 is not installed")
+class TestAsyncHTTP2(unittest.IsolatedAsyncioTestCase):
+    async def test_async_fetcher_multiplexes_with_max_streams(self):
+        import asyncio
+
+        config = {**H2C_CONFIG, "max_streams": 3}
+        with LocalH2Server(SlowResponder(delay=0.05)) as server:
+            async with AsyncFetcher(label="test_async_http2", pool_config=config) as fetcher:
+                responses = await asyncio.gather(
+                    *(fetcher.get(f"{server.url}/api/example") for _ in range(9))
+                )
+
+        self.assertEqual({r.http_version for r in responses}, {"HTTP/2"})
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(server.max_in_flight, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import src.fetchin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("requests", "urllib3", "prometheus_client", "httpx", "sqlite3")
+IMPORT_BUDGET_US = 50_000
+
+
+def run_python(code: str):
+    script = f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                import_times[module.strip()] = int(cumulative)
+    return set(json.loads(result.stdout)), import_times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_package_import_is_lazy(self):
+        modules, import_times = run_python("import src.fetchin")
+
+        self.assertNotIn("src.fetchin.fetcher.base", modules)
+        self.assertNotIn("pybreaker", modules)
+        self.assertLess(import_times["src.fetchin"], IMPORT_BUDGET_US)
+
+    def test_fetcher_does_not_load_the_http_stack_or_prometheus(self):
+        modules, _ = run_python(
+            "from src.fetchin import Fetcher, MetricsInterface, PrometheusMetrics\n"
+            "Fetcher(label='lazy')"
+        )
+        self.assertEqual([m for m in HEAVY_MODULES if m in modules], [])
+
+    def test_fetcher_import_stays_light(self):
+        # pybreaker's optional redis support pulls in asyncio on its own, the
+        # check runs as if redis were not installed
+        modules, import_times = run_python(
+            "import sys\nsys.modules['redis'] = None\n"
+            "from src.fetchin import Fetcher\nFetcher(label='lazy')"
+        )
+
+        self.assertNotIn("asyncio", modules)
+        self.assertLess(import_times["src.fetchin.fetcher.base"], IMPORT_BUDGET_US)
+
+    def test_heavy_modules_load_on_first_use(self):
+        modules, _ = run_python(
+            "from src.fetchin import Fetcher, PrometheusMetrics\n"
+            "Fetcher(label='lazy', metrics=PrometheusMetrics()).session"
+        )
+        self.assertIn("prometheus_client", modules)
+        self.assertIn("requests", modules)
+
+    def test_lazy_attributes(self):
+        from src.fetchin import Fetcher
+        from src.fetchin.fetcher.fetcher import Fetcher as FetcherClass
+
+        self.assertIs(Fetcher, FetcherClass)
+        self.assertIn("PrometheusMetrics", dir(src.fetchin))
+        with self.assertRaises(AttributeError):
+            src.fetchin.Missing
+
+
+if __name__ == "__main__":
+    unittest.main()
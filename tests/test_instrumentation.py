@@ -0,0 +1,91 @@
+import logging
+import unittest
+from unittest.mock import patch, MagicMock
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.metrics.metrics_interface import MetricsInterface
+from tests.http_server import LocalHTTPServer
+import requests
+
+
+class LegacyMetrics(MetricsInterface):
+    def __init__(self):
+        self.requests = []
+
+    def track_request(self, method, status_code, response_time):
+        self.requests.append((method, status_code))
+
+    def track_retry(self, method):
+        pass
+
+
+class TestRequestTimings(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('requests.Session.request')
+    def test_attempt_time_excludes_failed_attempts_and_backoff(self, mock_request):
+        metrics = MagicMock()
+        circuit_config = {"fail_max": 5, "backoff_strategy": lambda attempt: 0.2}
+        fetcher = Fetcher(label="test_attempt_timing", metrics=metrics, circuit_config=circuit_config)
+        mock_request.side_effect = [requests.exceptions.ConnectionError(), MagicMock(status_code=200)]
+
+        fetcher.get("http://localhost:8080/api/example")
+
+        label, method, status_code, response_time = metrics.track_labelled_request.call_args.args
+        self.assertEqual((label, method, status_code), ("test_attempt_timing", "GET", 200))
+        self.assertLess(response_time, 0.1)
+
+        label, method, status_code, duration = metrics.track_end_to_end.call_args.args
+        self.assertEqual((label, method, status_code), ("test_attempt_timing", "GET", 200))
+        self.assertGreaterEqual(duration, 0.2)
+
+    @patch('requests.Session.request')
+    def test_end_to_end_is_tracked_for_failed_requests(self, mock_request):
+        metrics = MagicMock()
+        fetcher = Fetcher(label="test_failed_timing", metrics=metrics, max_retries=1)
+        mock_request.side_effect = requests.exceptions.InvalidURL()
+
+        with self.assertRaises(requests.exceptions.InvalidURL):
+            fetcher.get("http://localhost:8080/api/example")
+
+        self.assertEqual(metrics.track_end_to_end.call_args.args[:3], ("test_failed_timing", "GET", None))
+
+    @patch('requests.Session.request')
+    def test_metrics_without_labelled_request_still_work(self, mock_request):
+        metrics = LegacyMetrics()
+        mock_request.return_value = MagicMock(status_code=200)
+
+        Fetcher(label="test_legacy_metrics", metrics=metrics).get("http://localhost:8080/api/example")
+        self.assertEqual(metrics.requests, [("GET", 200)])
+
+    def test_phase_breakdown(self):
+        metrics = MagicMock()
+        with LocalHTTPServer() as server:
+            with Fetcher(label="test_phases", metrics=metrics) as fetcher:
+                fetcher.get(f"{server.url}/api/example")
+
+        phases = {c.args[2]: c.args[3] for c in metrics.track_phase.call_args_list}
+        self.assertEqual(set(phases), {"queue", "connect", "ttfb", "download"})
+        self.assertGreater(phases["connect"], 0)
+        self.assertTrue(all(duration >= 0 for duration in phases.values()))
+
+
+class TestAsyncRequestTimings(unittest.IsolatedAsyncioTestCase):
+    async def test_async_phase_breakdown(self):
+        metrics = MagicMock()
+        with LocalHTTPServer() as server:
+            async with AsyncFetcher(label="test_async_phases", metrics=metrics) as fetcher:
+                await fetcher.get(f"{server.url}/api/example")
+
+        phases = {c.args[2]: c.args[3] for c in metrics.track_phase.call_args_list}
+        self.assertEqual(set(phases), {"queue", "connect", "ttfb", "download"})
+        self.assertGreater(phases["connect"], 0)
+        metrics.track_end_to_end.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import logging
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.load_balancer import EndpointSlot, LoadBalancer
+from src.fetchin.metrics.prometheus_metrics import PrometheusMetrics
+from prometheus_client import CollectorRegistry, generate_latest
+from tests.http_server import LocalHTTPServer
+
+
+def failing_responder(handler, body):
+    return 503, {}, b"unavailable"
+
+
+class TestLoadBalancer(unittest.TestCase):
+    def test_least_outstanding_selection(self):
+        balancer = LoadBalancer(["http://a", "http://b", "http://c"])
+        picks = [balancer.select() for _ in range(3)]
+        self.assertEqual({e.name for e in picks}, {"a", "b", "c"})
+
+        balancer.release(picks[1], 0.01, failed=False)
+        self.assertIs(balancer.select(), picks[1])
+
+    def test_ewma_prefers_the_faster_endpoint(self):
+        balancer = LoadBalancer(["http://a", "http://b"], strategy="ewma")
+        slow, fast = balancer.endpoints
+        for endpoint, latency in ((slow, 0.5), (fast, 0.05)):
+            balancer.select(exclude=[e for e in balancer.endpoints if e is not endpoint])
+            balancer.release(endpoint, latency, failed=False)
+
+        self.assertIs(balancer.select(), fast)
+        self.assertIs(balancer.select(), fast)
+
+    def test_ejection_after_consecutive_failures(self):
+        balancer = LoadBalancer(["http://a", "http://b"], max_failures=2, ejection_time=0.1)
+        bad, good = balancer.endpoints
+
+        self.assertFalse(balancer.release(balancer.select(exclude=[good]), failed=True))
+        self.assertTrue(balancer.release(balancer.select(exclude=[good]), failed=True))
+        self.assertTrue(bad.is_ejected(time.monotonic()))
+        self.assertIs(balancer.select(exclude=[good]), good)
+
+        time.sleep(0.1)
+        self.assertIs(balancer.select(exclude=[good]), bad)
+
+    def test_slot_counts_exceptions_as_failures(self):
+        balancer = LoadBalancer(["http://a"], max_failures=1)
+        on_release = MagicMock()
+
+        with self.assertRaises(ConnectionError):
+            with EndpointSlot(balancer, balancer.select(), on_release):
+                raise ConnectionError()
+
+        endpoint, _, ejected = on_release.call_args.args
+        self.assertEqual(endpoint.in_flight, 0)
+        self.assertTrue(ejected)
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            LoadBalancer([])
+        with self.assertRaises(ValueError):
+            LoadBalancer(["http://a"], strategy="round_robin")
+
+
+class TestFetcherLoadBalancing(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.circuit_config = {"fail_max": 5, "retry_statuses": [503], "backoff_strategy": lambda attempt: 0}
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch("src.fetchin.fetcher.load_balancer.random.random", return_value=0)
+    def test_retry_goes_to_a_different_replica(self, _):
+        metrics = MagicMock()
+        with LocalHTTPServer(failing_responder) as bad, LocalHTTPServer() as good:
+            config = {"endpoints": [bad.url, good.url]}
+            with Fetcher(
+                label="test_lb_retry",
+                metrics=metrics,
+                circuit_config=self.circuit_config,
+                load_balancer_config=config,
+            ) as fetcher:
+                response = fetcher.get("/api/example")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.url, f"{good.url}/api/example")
+        bad_host, good_host = (e.name for e in fetcher.load_balancer.endpoints)
+        released = [c.args for c in metrics.track_endpoint.call_args_list if c.args[3] is not None]
+        self.assertEqual([(host, in_flight) for _, host, in_flight, _ in released], [(bad_host, 0), (good_host, 0)])
+
+    @patch("src.fetchin.fetcher.load_balancer.random.random", return_value=0)
+    def test_open_circuit_fails_over_and_ejects_the_replica(self, _):
+        metrics = MagicMock()
+        circuit_config = {"fail_max": 1, "backoff_strategy": lambda attempt: 0}
+        with LocalHTTPServer() as down:
+            down_url = down.url
+
+        with LocalHTTPServer() as good:
+            config = {"endpoints": [down_url, good.url], "max_failures": 10}
+            with Fetcher(
+                label="test_lb_circuit",
+                metrics=metrics,
+                circuit_config=circuit_config,
+                load_balancer_config=config,
+            ) as fetcher:
+                first = fetcher.get("/api/example")
+                second = fetcher.get("/api/example")
+
+        self.assertEqual((first.status_code, second.status_code), (200, 200))
+        down_host = fetcher.load_balancer.endpoints[0].name
+        metrics.track_endpoint_ejection.assert_called_once_with("test_lb_circuit", down_host)
+        self.assertEqual(fetcher._circuit_breaker_for(down_url).current_state, "open")
+        self.assertEqual(fetcher._circuit_breaker_for(good.url).current_state, "closed")
+
+    @patch("requests.Session.request")
+    def test_absolute_urls_bypass_the_balancer(self, mock_request):
+        mock_request.return_value = MagicMock(status_code=200)
+        fetcher = Fetcher(label="test_lb_absolute", load_balancer_config={"endpoints": ["http://replica:8080"]})
+
+        fetcher.get("http://localhost:8080/api/example")
+        fetcher.get("/api/example")
+
+        urls = [c.args[1] for c in mock_request.call_args_list]
+        self.assertEqual(urls, ["http://localhost:8080/api/example", "http://replica:8080/api/example"])
+
+    def test_prometheus_endpoint_metrics(self):
+        registry = CollectorRegistry()
+        metrics = PrometheusMetrics(registry=registry)
+        metrics.track_endpoint("lb", "a:80", 3)
+        metrics.track_endpoint("lb", "a:80", 2, 0.25)
+        metrics.track_endpoint_ejection("lb", "a:80")
+
+        output = generate_latest(registry).decode("utf-8")
+        self.assertIn('http_endpoint_in_flight{endpoint="a:80",fetcher_label="lb"} 2.0', output)
+        self.assertIn('http_endpoint_latency_seconds_count{endpoint="a:80",fetcher_label="lb"} 1.0', output)
+        self.assertIn('http_endpoint_ejections_total{endpoint="a:80",fetcher_label="lb"} 1.0', output)
+
+
+class TestAsyncLoadBalancing(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch("src.fetchin.fetcher.load_balancer.random.random", return_value=0)
+    async def test_async_retry_goes_to_a_different_replica(self, _):
+        circuit_config = {"fail_max": 5, "retry_statuses": [503], "backoff_strategy": lambda attempt: 0}
+        with LocalHTTPServer(failing_responder) as bad, LocalHTTPServer() as good:
+            config = {"endpoints": [bad.url, good.url]}
+            async with AsyncFetcher(
+                label="test_async_lb_retry",
+                circuit_config=circuit_config,
+                load_balancer_config=config,
+            ) as fetcher:
+                response = await fetcher.get("/api/example")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(str(response.url), f"{good.url}/api/example")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,10 @@
+import gc
+import json
+import threading
 import unittest
-from src.fetchin.logging.logger import CustomLogger
+import weakref
+from unittest.mock import MagicMock
+from src.fetchin.logging.logger import CustomLogger, _json_dumps
 from io import StringIO
 import logging
 
@@ -24,5 +29,96 @@ class TestCustomLogger(unittest.TestCase):
         expected_output = '{"app_name": "MyApp", "environment": "production", "endpoint": "/api/data", "error_code": 500, "message": "Failed to fetch data"}'
         self.assertEqual(output, expected_output)
 
+    def test_json_fallback_encoder(self):
+        logger = CustomLogger(name="fetchin-json-encoder", encoder=_json_dumps)
+        logger.logger.handlers = [logging.StreamHandler(self.log_output)]
+
+        logger.info("Fetching data", extra={"endpoint": "/api/data"})
+        output = self.log_output.getvalue().strip()
+        self.assertEqual(output, '{"endpoint": "/api/data", "message": "Fetching data"}')
+
+    def test_record_is_not_built_below_level(self):
+        encoder = MagicMock(return_value="{}")
+        logger = CustomLogger(name="fetchin-level-check", encoder=encoder)
+        logger.logger.setLevel(logging.ERROR)
+
+        logger.info("Fetching data")
+        logger.debug("Fetching data")
+        encoder.assert_not_called()
+
+
+class TestAsyncCustomLogger(unittest.TestCase):
+    def setUp(self):
+        self.log_output = StringIO()
+
+    def make_logger(self, name, **kwargs):
+        logger = CustomLogger(name=name, extra_params={"app_name": "MyApp"}, async_mode=True, **kwargs)
+        handler = logging.StreamHandler(self.log_output)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.logger.handlers = [handler]
+        self.addCleanup(logger.close)
+        return logger
+
+    def test_records_are_written_by_background_thread(self):
+        logger = self.make_logger("fetchin-async")
+
+        for i in range(250):
+            logger.info("Fetching data", extra={"request": i})
+        logger.flush()
+
+        lines = self.log_output.getvalue().strip().splitlines()
+        self.assertEqual(len(lines), 250)
+        self.assertEqual(json.loads(lines[-1]), {"app_name": "MyApp", "request": 249, "message": "Fetching data"})
+        self.assertEqual(logger.queue_depth, 0)
+        self.assertEqual(logger.dropped, 0)
+
+    def test_full_queue_drops_records(self):
+        logger = self.make_logger("fetchin-async-drop", queue_size=1)
+        writing, release = threading.Event(), threading.Event()
+
+        def blocking_filter(record):
+            writing.set()
+            return release.wait()
+
+        logger.logger.handlers[0].addFilter(blocking_filter)
+
+        logger.info("first")
+        writing.wait()
+        logger.info("queued")
+        logger.info("dropped")
+        logger.info("dropped")
+
+        self.assertEqual(logger.dropped, 2)
+        self.assertEqual(logger.queue_depth, 1)
+        release.set()
+        logger.flush()
+
+        self.assertEqual(len(self.log_output.getvalue().strip().splitlines()), 2)
+
+    def test_records_after_close_are_written_synchronously(self):
+        for overflow in ("drop", "block"):
+            logger = self.make_logger(f"fetchin-async-closed-{overflow}", queue_size=1, overflow=overflow)
+            logger.close()
+            for i in range(3):
+                logger.info("late", extra={"request": i})
+            logger.flush()
+
+        lines = self.log_output.getvalue().strip().splitlines()
+        self.assertEqual([json.loads(line)["request"] for line in lines], [0, 1, 2] * 2)
+
+    def test_unclosed_logger_is_not_kept_alive(self):
+        logger = CustomLogger(name="fetchin-async-unclosed", async_mode=True)
+        thread, logger_ref = logger.writer._thread, weakref.ref(logger)
+        del logger
+        gc.collect()
+
+        self.assertIsNone(logger_ref())
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+
+    def test_invalid_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            CustomLogger(name="fetchin-async-invalid", async_mode=True, overflow="spill")
+
 if __name__ == '__main__':
     unittest.main()
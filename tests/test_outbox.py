@@ -0,0 +1,221 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from requests.auth import HTTPBasicAuth
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.outbox_storage import (
+    FileOutboxStorage,
+    MemoryOutboxStorage,
+    OutboxEntry,
+    OutboxFull,
+    SQLiteOutboxStorage,
+)
+from tests.http_server import LocalHTTPServer
+
+
+class EventSink:
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.bodies = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, handler, body):
+        self.release.wait(1)
+        self.bodies.append(json.loads(body))
+        status = self.statuses.pop(0) if self.statuses else 202
+        return status, {}, b""
+
+
+class TestOutbox(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.circuit_config = {"backoff_strategy": lambda attempt: 0}
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_enqueue_returns_before_delivery(self):
+        sink, metrics = EventSink(), MagicMock()
+        sink.release.clear()
+        with LocalHTTPServer(sink) as server:
+            with Fetcher(label="test_outbox_enqueue", metrics=metrics) as fetcher:
+                start = time.monotonic()
+                fetcher.enqueue("POST", f"{server.url}/events", data={"id": 1})
+                self.assertLess(time.monotonic() - start, 0.5)
+                self.assertEqual(fetcher.outbox.depth, 1)
+
+                sink.release.set()
+                self.assertTrue(fetcher.outbox.flush(timeout=2))
+
+        self.assertEqual(sink.bodies, [{"id": 1}])
+        label, depth, lag = metrics.track_outbox.call_args.args
+        self.assertEqual((label, depth), ("test_outbox_enqueue", 0))
+        self.assertGreater(lag, 0)
+
+    def test_events_are_coalesced_into_batches(self):
+        sink = EventSink()
+        outbox_config = {"batch_size": 10, "linger": 0.2}
+        with LocalHTTPServer(sink) as server:
+            with Fetcher(label="test_outbox_batch", outbox_config=outbox_config) as fetcher:
+                for i in range(5):
+                    fetcher.enqueue("POST", f"{server.url}/events", data={"id": i})
+                self.assertTrue(fetcher.outbox.flush(timeout=2))
+
+        self.assertEqual(sink.bodies, [[{"id": i} for i in range(5)]])
+
+    def test_failed_deliveries_are_retried_later(self):
+        sink = EventSink(statuses=[503, 429])
+        with LocalHTTPServer(sink) as server:
+            with Fetcher(
+                label="test_outbox_retry",
+                circuit_config=self.circuit_config,
+                max_retries=1,
+                outbox_config={"poll_interval": 0.05},
+            ) as fetcher:
+                fetcher.enqueue("POST", f"{server.url}/events", data={"id": 1})
+                self.assertTrue(fetcher.outbox.flush(timeout=2))
+
+        self.assertEqual(sink.bodies, [{"id": 1}] * 3)
+
+    def test_dead_letters(self):
+        sink, metrics = EventSink(statuses=[400, 500, 500]), MagicMock()
+        outbox_config = {"max_attempts": 2, "poll_interval": 0.05}
+        with LocalHTTPServer(sink) as server:
+            with Fetcher(
+                label="test_outbox_dead_letters",
+                metrics=metrics,
+                circuit_config=self.circuit_config,
+                max_retries=1,
+                outbox_config=outbox_config,
+            ) as fetcher:
+                fetcher.enqueue("POST", f"{server.url}/events", data={"id": 1})
+                fetcher.outbox.flush(timeout=2)
+                fetcher.enqueue("POST", f"{server.url}/events", data={"id": 2})
+                self.assertTrue(fetcher.outbox.flush(timeout=2))
+                dead_letters = fetcher.outbox.dead_letters()
+
+        self.assertEqual(
+            [(entry.data, reason) for entry, reason in dead_letters],
+            [({"id": 1}, "status_400"), ({"id": 2}, "status_500")],
+        )
+        metrics.track_outbox_dead_letter.assert_called_with(
+            "test_outbox_dead_letters", "status_500", 1
+        )
+
+    def test_unserializable_kwargs_are_delivered_from_memory(self):
+        sink = EventSink()
+        outbox_config = {"batch_size": 10}
+        with LocalHTTPServer(sink) as server:
+            with Fetcher(label="test_outbox_auth", outbox_config=outbox_config) as fetcher:
+                for i in range(2):
+                    fetcher.enqueue("POST", f"{server.url}/events", data={"id": i}, auth=HTTPBasicAuth("u", "p"))
+                self.assertTrue(fetcher.outbox.flush(timeout=2))
+
+        # Entries whose kwargs cannot be compared are not batched together
+        self.assertEqual(sorted(sink.bodies, key=str), [[{"id": 0}], [{"id": 1}]])
+
+    def test_worker_errors_dead_letter_the_batch(self):
+        sink = EventSink()
+        with LocalHTTPServer(sink) as server:
+            with Fetcher(label="test_outbox_worker_error") as fetcher:
+                with patch.object(fetcher, "_body_kwargs", side_effect=[RuntimeError("bug"), {"json": {"id": 2}}]):
+                    fetcher.enqueue("POST", f"{server.url}/events", data={"id": 1})
+                    self.assertTrue(fetcher.outbox.flush(timeout=2))
+                    fetcher.enqueue("POST", f"{server.url}/events", data={"id": 2})
+                    self.assertTrue(fetcher.outbox.flush(timeout=2))
+                dead_letters = fetcher.outbox.dead_letters()
+
+        self.assertEqual([(entry.data, reason) for entry, reason in dead_letters], [({"id": 1}, "RuntimeError")])
+        self.assertEqual(sink.bodies, [{"id": 2}])
+
+    def test_closed_outbox_rejects_requests(self):
+        fetcher = Fetcher(label="test_outbox_closed")
+        fetcher.close()
+        fetcher.outbox.close()
+        with self.assertRaises(RuntimeError):
+            fetcher.enqueue("POST", "http://localhost:8080/events", data={})
+
+
+class TestOutboxStorage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _exercise(self, open_storage):
+        storage = open_storage()
+        for i in range(4):
+            storage.put(OutboxEntry("POST", "http://localhost/events", {"id": i}))
+        first, second, third = storage.take(3, time.time())
+        storage.ack([first])
+        second.attempts, second.next_attempt_at = 1, time.time() + 60
+        storage.release([second])
+        storage.dead_letter([third], "status_400")
+        storage.close()
+
+        # The fourth entry was never claimed, the second is waiting for a retry
+        storage = open_storage()
+        self.assertEqual(len(storage), 2)
+        (entry,) = storage.take(10, time.time())
+        self.assertEqual(entry.data, {"id": 3})
+        (entry,) = storage.take(10, time.time() + 120)
+        self.assertEqual((entry.data, entry.attempts), ({"id": 1}, 1))
+        ((entry, reason),) = storage.dead_letters()
+        self.assertEqual((entry.data, reason), ({"id": 2}, "status_400"))
+        storage.put(OutboxEntry("POST", "http://localhost/events", {"id": 4}))
+        self.assertEqual(len(storage), 3)
+        storage.close()
+
+    def test_file_storage_survives_restarts(self):
+        path = os.path.join(self.directory.name, "outbox.log")
+        self._exercise(lambda: FileOutboxStorage(path, compact_after=2))
+
+    def test_file_storage_ignores_a_torn_last_record(self):
+        path = os.path.join(self.directory.name, "outbox.log")
+        storage = FileOutboxStorage(path)
+        storage.put(OutboxEntry("POST", "http://localhost/events", {"id": 1}))
+        storage.close()
+        with open(path, "a") as log:
+            log.write('{"op": "put", "entry": {"entry_')
+
+        self.assertEqual(len(FileOutboxStorage(path)), 1)
+
+    def test_sqlite_storage_survives_restarts(self):
+        path = os.path.join(self.directory.name, "outbox.db")
+        self._exercise(lambda: SQLiteOutboxStorage(path))
+
+    def test_only_recent_dead_letters_are_kept(self):
+        file_path = os.path.join(self.directory.name, "outbox.log")
+        sqlite_path = os.path.join(self.directory.name, "outbox.db")
+        for open_storage in (
+            lambda: MemoryOutboxStorage(max_dead_letters=2),
+            lambda: FileOutboxStorage(file_path, max_dead_letters=2),
+            lambda: SQLiteOutboxStorage(sqlite_path, max_dead_letters=2),
+        ):
+            storage = open_storage()
+            for i in range(4):
+                storage.put(OutboxEntry("POST", "http://localhost/events", {"id": i}))
+                storage.dead_letter(storage.take(1, time.time()), "status_400")
+            self.assertEqual([entry.data["id"] for entry, _ in storage.dead_letters()], [2, 3])
+            storage.close()
+
+        self.assertEqual(len(FileOutboxStorage(file_path, max_dead_letters=2).dead_letters()), 2)
+        with open(file_path) as log:
+            self.assertEqual(len(log.readlines()), 2)
+
+    def test_max_entries(self):
+        storage = MemoryOutboxStorage(max_entries=1)
+        storage.put(OutboxEntry("POST", "http://localhost/events"))
+        with self.assertRaises(OutboxFull):
+            storage.put(OutboxEntry("POST", "http://localhost/events"))
+
+
+if __name__ == "__main__":
+    unittest.main()
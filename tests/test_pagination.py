@@ -0,0 +1,161 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlsplit
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.pagination import CursorPagination, OffsetPagination, PaginationStrategy
+from tests.http_server import LocalHTTPServer
+
+ITEMS = list(range(5))
+REQUEST_ID = contextvars.ContextVar("request_id", default=None)
+
+
+class PagedAPI:
+    def __init__(self, page_size: int = 2, fail_once: int = None):
+        self.page_size = page_size
+        self.fail_once = fail_once
+        self.requested = []
+        self.page_requested = threading.Event()
+
+    def __call__(self, handler, body):
+        query = {k: v[0] for k, v in parse_qs(urlsplit(handler.path).query).items()}
+        page = int(query.get("page") or query.get("cursor") or 0)
+        if page == self.fail_once:
+            self.fail_once = None
+            return 503, {}, b""
+        self.requested.append(page)
+        self.page_requested.set()
+
+        if "offset" in query:
+            start = int(query["offset"])
+            items = ITEMS[start : start + int(query["limit"])]
+            return 200, {}, json.dumps(items).encode()
+
+        start = page * self.page_size
+        items = ITEMS[start : start + self.page_size]
+        headers, next_cursor = {}, None
+        if start + self.page_size < len(ITEMS):
+            next_cursor = str(page + 1)
+            headers["Link"] = f'</items?page={page + 1}>; rel="next"'
+        body = {"items": items, "meta": {"next": next_cursor}}
+        return 200, headers, json.dumps(body).encode()
+
+
+class TestPaginate(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_link_header_strategy(self):
+        api, metrics = PagedAPI(), MagicMock()
+        with LocalHTTPServer(api) as server:
+            with Fetcher(label="test_paginate_link", metrics=metrics) as fetcher:
+                pages = list(fetcher.paginate(f"{server.url}/items"))
+
+        self.assertEqual([p.json()["items"] for p in pages], [[0, 1], [2, 3], [4]])
+        self.assertEqual(api.requested, [0, 1, 2])
+        self.assertEqual(metrics.track_page.call_count, 3)
+        metrics.track_page.assert_called_with("test_paginate_link", "link")
+
+    def test_cursor_and_offset_strategies(self):
+        with LocalHTTPServer(PagedAPI()) as server:
+            with Fetcher(label="test_paginate_strategies") as fetcher:
+                cursor = CursorPagination(cursor_field="meta.next")
+                cursor_pages = fetcher.paginate(f"{server.url}/items", strategy=cursor)
+                offset = OffsetPagination(limit=2)
+                offset_pages = fetcher.paginate(f"{server.url}/items", strategy=offset, prefetch=0)
+
+                cursor_items = [p.json()["items"] for p in cursor_pages]
+                offset_items = [p.json() for p in offset_pages]
+
+        self.assertEqual(cursor_items, [[0, 1], [2, 3], [4]])
+        self.assertEqual(offset_items, [[0, 1], [2, 3], [4]])
+
+    def test_next_page_is_prefetched_with_bounded_depth(self):
+        api = PagedAPI(page_size=1)
+        with LocalHTTPServer(api) as server:
+            with Fetcher(label="test_paginate_prefetch") as fetcher:
+                pages = fetcher.paginate(f"{server.url}/items", prefetch=1)
+                next(pages)
+                api.page_requested.clear()
+                self.assertTrue(api.page_requested.wait(1))
+                time.sleep(0.1)
+                self.assertEqual(api.requested, [0, 1])
+
+                pages.close()
+                time.sleep(0.1)
+                self.assertLessEqual(len(api.requested), 3)
+
+    def test_retries_apply_per_page(self):
+        api = PagedAPI(fail_once=1)
+        circuit_config = {"retry_statuses": [503], "backoff_strategy": lambda attempt: 0}
+        with LocalHTTPServer(api) as server:
+            with Fetcher(label="test_paginate_retry", circuit_config=circuit_config) as fetcher:
+                pages = list(fetcher.paginate(f"{server.url}/items", max_pages=2))
+
+        self.assertEqual([p.status_code for p in pages], [200, 200])
+        self.assertEqual(api.requested, [0, 1])
+
+    def test_errors_are_raised_to_the_caller(self):
+        transport = MagicMock()
+        first = MagicMock(status_code=200, links={"next": {"url": "/items?page=1"}})
+        transport.request.side_effect = [first, ConnectionError("boom")]
+        fetcher = Fetcher(label="test_paginate_error", max_retries=1, transport=transport)
+
+        pages = fetcher.paginate("http://localhost:8080/items")
+        self.assertIs(next(pages), first)
+        with self.assertRaises(ConnectionError):
+            next(pages)
+
+    def test_prefetched_pages_run_in_the_caller_context(self):
+        seen = []
+
+        def request(method, url, **kwargs):
+            seen.append(REQUEST_ID.get())
+            return MagicMock(status_code=200, links={"next": {"url": "/items"}} if len(seen) < 3 else {})
+
+        transport = MagicMock()
+        transport.request.side_effect = request
+        fetcher = Fetcher(label="test_paginate_context", transport=transport)
+        token = REQUEST_ID.set("abc")
+        try:
+            pages = list(fetcher.paginate("http://localhost:8080/items", prefetch=1))
+        finally:
+            REQUEST_ID.reset(token)
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(seen, ["abc"] * 3)
+
+    def test_custom_strategies_must_implement_next_request(self):
+        class FirstPageOnly(PaginationStrategy):
+            pass
+
+        with self.assertRaises(TypeError):
+            FirstPageOnly()
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            Fetcher(label="test_paginate_unknown").paginate("http://localhost/items", strategy="page")
+
+
+class TestAsyncPaginate(unittest.IsolatedAsyncioTestCase):
+    async def test_async_prefetch(self):
+        api = PagedAPI()
+        with LocalHTTPServer(api) as server:
+            async with AsyncFetcher(label="test_async_paginate") as fetcher:
+                pages = fetcher.paginate(f"{server.url}/items", strategy="link", prefetch=2)
+                items = [page.json()["items"] async for page in pages]
+
+        self.assertEqual(items, [[0, 1], [2, 3], [4]])
+        self.assertEqual(api.requested, [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,7 @@
+import threading
 import unittest
+from unittest.mock import MagicMock
+from src.fetchin.metrics.metric_buffer import MetricBuffer
 from src.fetchin.metrics.prometheus_metrics import PrometheusMetrics
 from prometheus_client import CollectorRegistry, generate_latest
 
@@ -21,5 +24,136 @@ class TestPrometheusMetrics(unittest.TestCase):
         self.assertIn('http_request_retries_total', output)
         self.assertIn('1', output)
 
+    def test_track_pool_checkout(self):
+        self.metrics.track_pool_checkout("api-service", True)
+        self.metrics.track_pool_checkout("api-service", False)
+
+        output = generate_latest(self.registry).decode('utf-8')
+        self.assertIn('http_connection_pool_checkouts_total{fetcher_label="api-service",result="hit"} 1.0', output)
+        self.assertIn('http_connection_pool_checkouts_total{fetcher_label="api-service",result="miss"} 1.0', output)
+
+    def test_track_rate_limit(self):
+        self.metrics.track_rate_limit("api-service", 0.25, False)
+        self.metrics.track_rate_limit("api-service", 0, True)
+
+        output = generate_latest(self.registry).decode('utf-8')
+        self.assertIn('http_rate_limit_wait_seconds_sum{fetcher_label="api-service"} 0.25', output)
+        self.assertIn('http_rate_limit_rejections_total{fetcher_label="api-service"} 1.0', output)
+
+    def test_track_labelled_request_with_summary(self):
+        self.metrics.track_labelled_request("api-service", "GET", 200, 0.5)
+
+        output = generate_latest(self.registry).decode('utf-8')
+        self.assertIn('http_request_duration_seconds_sum{method="GET",status_code="200"} 0.5', output)
+
+    def test_histogram_with_fetcher_label(self):
+        registry = CollectorRegistry()
+        metrics = PrometheusMetrics(registry=registry, histogram=True, buckets=(0.1, 1.0))
+        metrics.track_labelled_request("api-service", "GET", 200, 0.5)
+
+        output = generate_latest(registry).decode('utf-8')
+        self.assertIn('http_request_duration_seconds_bucket{fetcher_label="api-service",le="0.1",method="GET",status_code="200"} 0.0', output)
+        self.assertIn('http_request_duration_seconds_bucket{fetcher_label="api-service",le="1.0",method="GET",status_code="200"} 1.0', output)
+
+    def test_track_end_to_end_and_phase(self):
+        self.metrics.track_end_to_end("api-service", "GET", None, 2.5)
+        self.metrics.track_phase("api-service", "GET", "ttfb", 0.25)
+
+        output = generate_latest(self.registry).decode('utf-8')
+        self.assertIn('http_request_end_to_end_duration_seconds_sum{fetcher_label="api-service",method="GET",status_code="error"} 2.5', output)
+        self.assertIn('http_request_phase_duration_seconds_sum{fetcher_label="api-service",method="GET",phase="ttfb"} 0.25', output)
+
+class TestBufferedPrometheusMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = CollectorRegistry()
+        self.metrics = PrometheusMetrics(registry=self.registry, buffered=True)
+        self.addCleanup(self.metrics.close)
+
+    def test_bound_children_are_reused(self):
+        metrics = PrometheusMetrics(registry=CollectorRegistry())
+        metrics.track_request("GET", 200, 0.5)
+        metrics.track_request("GET", 200, 0.5)
+
+        self.assertEqual(len(metrics._children), 2)
+
+    def test_buffer_is_flushed_at_scrape_time(self):
+        self.metrics.track_request("GET", 200, 0.5)
+        self.metrics.track_request("GET", 200, 1.0)
+        self.assertEqual(self.metrics.request_counter._metrics, {})
+
+        output = generate_latest(self.registry).decode('utf-8')
+        self.assertIn('http_requests_total{method="GET",status_code="200"} 2.0', output)
+        self.assertIn('http_request_duration_seconds_sum{method="GET",status_code="200"} 1.5', output)
+
+    def test_observations_are_pre_aggregated(self):
+        buffered_registry, registry = CollectorRegistry(), CollectorRegistry()
+        buffered = PrometheusMetrics(registry=buffered_registry, histogram=True, buffered=True)
+        direct = PrometheusMetrics(registry=registry, histogram=True)
+        for metrics in (buffered, direct):
+            for value in (0.001, 0.01, 0.3, 0.3, 4.0, 60.0):
+                metrics.track_request("GET", 200, value, label="api-service")
+            metrics.track_request("GET", 503, 0.2, label="api-service")
+
+        for metrics in (buffered, direct):
+            for _ in range(1000):
+                metrics.track_phase("api-service", "GET", "ttfb", 0.01)
+
+        observations = buffered.buffer._buffer().observations
+        self.assertEqual(len(observations), 3)
+        count, total, buckets = observations[(buffered.phase_time, ("api-service", "GET", "ttfb"))]
+        self.assertEqual((count, sum(buckets)), (1000, 1000))
+        buffered.flush()
+        samples = [
+            [line for line in generate_latest(r).decode().splitlines() if "_created" not in line]
+            for r in (buffered_registry, registry)
+        ]
+        self.assertEqual(samples[0], samples[1])
+
+        summary = self.metrics
+        for value in (0.5, 1.5):
+            summary.track_request("GET", 200, value)
+        summary.flush()
+        labels = {"method": "GET", "status_code": "200"}
+        self.assertEqual(self.registry.get_sample_value("http_request_duration_seconds_count", labels), 2)
+        self.assertEqual(self.registry.get_sample_value("http_request_duration_seconds_sum", labels), 2.0)
+
+    def test_children_without_private_values_are_observed_directly(self):
+        child = MagicMock(spec=["observe", "inc"])
+        buffer = MetricBuffer(lambda metric, labels: child)
+        buffer.observe("duration", ("GET",), 0.5)
+        buffer.observe("duration", ("GET",), 1.5)
+
+        self.assertEqual([c.args for c in child.observe.call_args_list], [(0.5,), (1.5,)])
+        buffer.flush()
+        self.assertEqual(child.observe.call_count, 2)
+
+    def test_buffers_from_every_thread_are_flushed(self):
+        def worker():
+            for _ in range(100):
+                self.metrics.track_retry("GET")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.metrics.flush()
+        self.assertEqual(self.registry.get_sample_value('http_request_retries_total', {"method": "GET"}), 400)
+        self.assertEqual(self.metrics.buffer._buffers, [])
+
+    def test_periodic_flush(self):
+        registry = CollectorRegistry()
+        metrics = PrometheusMetrics(registry=registry, buffered=True, flush_interval=0.05)
+        self.addCleanup(metrics.close)
+        metrics.track_cache("api-service", "hit")
+
+        for _ in range(40):
+            if metrics.cache_counter._metrics:
+                break
+            threading.Event().wait(0.05)
+        self.assertIn(("api-service", "hit"), metrics.cache_counter._metrics)
+
+
 if __name__ == '__main__':
     unittest.main()
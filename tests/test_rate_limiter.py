@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.rate_limiter import RateLimitConfigError, RateLimitExceeded, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_is_available_immediately(self):
+        bucket = TokenBucket(rate=1, burst=5)
+        self.assertEqual([bucket.acquire("reject") for _ in range(5)], [0] * 5)
+
+        with self.assertRaises(RateLimitExceeded):
+            bucket.acquire("reject")
+
+    def test_wait_with_timeout(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        bucket.acquire()
+
+        self.assertAlmostEqual(bucket.acquire("wait", timeout=0.1), 0.05, delta=0.01)
+        with self.assertRaises(RateLimitExceeded):
+            bucket.acquire("wait", timeout=0.01)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1).acquire("drop")
+
+    def test_concurrent_acquire_respects_rate(self):
+        bucket = TokenBucket(rate=100, burst=10)
+
+        def worker():
+            for _ in range(5):
+                bucket.acquire()
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 40 tokens, 10 of them from the burst, the rest at 100 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.28)
+
+
+class TestAsyncTokenBucket(unittest.IsolatedAsyncioTestCase):
+    async def test_async_acquire_does_not_block_event_loop(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        waits = await asyncio.gather(bucket.acquire_async(), bucket.acquire_async(), ticker())
+
+        self.assertEqual(waits[0], 0)
+        self.assertAlmostEqual(waits[1], 0.1, delta=0.02)
+        self.assertEqual(len(ticks), 5)
+
+
+class TestFetcherRateLimit(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('requests.Session.request')
+    def test_limiter_is_shared_per_label(self, mock_request):
+        mock_request.return_value = MagicMock(status_code=200)
+        rate_limit_config = {"rate": 1, "burst": 1, "mode": "reject"}
+        metrics = MagicMock()
+
+        fetcher1 = Fetcher(label="test_rate_limit_shared", metrics=metrics, rate_limit_config=rate_limit_config)
+        fetcher2 = Fetcher(label="test_rate_limit_shared", metrics=metrics, rate_limit_config=rate_limit_config)
+        self.assertIs(fetcher1.rate_limiter, fetcher2.rate_limiter)
+
+        fetcher1.get("http://localhost:8080/api/example")
+        with self.assertRaises(RateLimitExceeded):
+            fetcher2.get("http://localhost:8080/api/example")
+
+        self.assertEqual(mock_request.call_count, 1)
+        metrics.track_rate_limit.assert_any_call("test_rate_limit_shared", 0, False)
+        metrics.track_rate_limit.assert_any_call("test_rate_limit_shared", 0, True)
+
+    def test_conflicting_config_for_label(self):
+        fetcher = Fetcher(label="test_rate_limit_conflict", rate_limit_config={"rate": 10, "burst": 5})
+        same = Fetcher(label="test_rate_limit_conflict", rate_limit_config={"rate": 10, "burst": 5, "mode": "reject"})
+        self.assertIs(same.rate_limiter, fetcher.rate_limiter)
+        self.assertEqual(same.rate_limit_mode, "reject")
+
+        for rate_limit_config in ({"rate": 20, "burst": 5}, {"rate": 10}):
+            with self.assertRaises(RateLimitConfigError):
+                Fetcher(label="test_rate_limit_conflict", rate_limit_config=rate_limit_config)
+
+    @patch('requests.Session.request')
+    def test_without_rate_limit_config(self, mock_request):
+        fetcher = Fetcher(label="test_rate_limit_disabled")
+        self.assertIsNone(fetcher.rate_limiter)
+
+
+if __name__ == "__main__":
+    unittest.main()
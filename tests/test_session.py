@@ -0,0 +1,66 @@
+import logging
+import time
+import unittest
+from unittest.mock import MagicMock
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.session import create_session
+from tests.http_server import LocalHTTPServer
+
+
+class TestPooledSession(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_connection_is_reused_between_requests(self):
+        checkouts = []
+        session = create_session(on_checkout=checkouts.append)
+
+        with LocalHTTPServer() as server:
+            for _ in range(3):
+                session.get(f"{server.url}/api/example").content
+        session.close()
+
+        self.assertEqual(checkouts, [False, True, True])
+
+    def test_keep_alive_disabled(self):
+        checkouts = []
+        session = create_session({"keep_alive": False}, on_checkout=checkouts.append)
+
+        with LocalHTTPServer() as server:
+            for _ in range(2):
+                session.get(f"{server.url}/api/example").content
+        session.close()
+
+        self.assertEqual(checkouts, [False, False])
+
+    def test_idle_connections_are_evicted(self):
+        checkouts = []
+        session = create_session({"idle_timeout": 0.05}, on_checkout=checkouts.append)
+
+        with LocalHTTPServer() as server:
+            session.get(f"{server.url}/api/example").content
+            time.sleep(0.1)
+            session.get(f"{server.url}/api/example").content
+        session.close()
+
+        self.assertEqual(checkouts, [False, False])
+
+    def test_fetcher_reports_pool_checkouts_and_closes(self):
+        metrics = MagicMock()
+
+        with LocalHTTPServer() as server:
+            with Fetcher(label="test_pool_metrics", metrics=metrics) as fetcher:
+                fetcher.get(f"{server.url}/api/example")
+                fetcher.get(f"{server.url}/api/example")
+                fetcher.transport.session = MagicMock(wraps=fetcher.session)
+
+        fetcher.session.close.assert_called_once()
+        metrics.track_pool_checkout.assert_any_call("test_pool_metrics", False)
+        metrics.track_pool_checkout.assert_any_call("test_pool_metrics", True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import threading
+import time
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+from src.fetchin.fetcher.async_fetcher import AsyncFetcher
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.singleflight import SingleFlight, singleflight_key
+import requests
+
+
+class TestSingleFlightKey(unittest.TestCase):
+    def test_key_uses_relevant_headers_only(self):
+        first = singleflight_key("GET", "http://a", {"headers": {"Accept": "application/json", "X-Request-Id": "1"}})
+        second = singleflight_key("GET", "http://a", {"headers": {"accept": "application/json", "X-Request-Id": "2"}})
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, singleflight_key("GET", "http://a", {"headers": {"Authorization": "other"}}))
+
+    def test_requests_with_bodies_are_not_coalesced(self):
+        self.assertIsNone(singleflight_key("POST", "http://a", {}))
+        self.assertIsNone(singleflight_key("GET", "http://a", {"json": {"k": 1}}))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def run_concurrently(self, func, count=8):
+        barrier = threading.Barrier(count)
+        results = [None] * count
+
+        def worker(index):
+            barrier.wait()
+            try:
+                results[index] = func()
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_share_one_execution(self):
+        group, calls = SingleFlight(), []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        results = self.run_concurrently(lambda: group.do("key", slow))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False] + [True] * 7)
+        self.assertTrue(all(value == "value" for value, _ in results))
+
+    def test_exception_is_delivered_to_every_caller(self):
+        group = SingleFlight()
+
+        def failing():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        results = self.run_concurrently(lambda: group.do("key", failing), count=4)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    @patch('requests.Session.request')
+    def test_fetcher_coalesces_identical_gets(self, mock_request):
+        def slow_response(*args, **kwargs):
+            time.sleep(0.1)
+            return MagicMock(status_code=200)
+
+        mock_request.side_effect = slow_response
+        metrics = MagicMock()
+        fetcher = Fetcher(label="test_singleflight", metrics=metrics, singleflight=True)
+
+        results = self.run_concurrently(lambda: fetcher.get("http://localhost:8080/api/example"), count=5)
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(metrics.track_coalesced.call_count, 4)
+        metrics.track_coalesced.assert_called_with("test_singleflight", "GET")
+
+    @patch('requests.Session.request')
+    def test_fetcher_without_singleflight(self, mock_request):
+        mock_request.return_value = MagicMock(status_code=200)
+        fetcher = Fetcher(label="test_singleflight_disabled")
+
+        self.run_concurrently(lambda: fetcher.get("http://localhost:8080/api/example"), count=3)
+        self.assertEqual(mock_request.call_count, 3)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_async_fetcher_coalesces_identical_gets(self, mock_request):
+        async def slow_response(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return MagicMock(status_code=200)
+
+        mock_request.side_effect = slow_response
+        metrics = MagicMock()
+        fetcher = AsyncFetcher(label="test_async_singleflight", metrics=metrics, singleflight=True)
+
+        results = await asyncio.gather(*(fetcher.get("http://localhost:8080/api/example") for _ in range(5)))
+
+        self.assertEqual(mock_request.await_count, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(metrics.track_coalesced.call_count, 4)
+
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_async_exception_is_shared(self, mock_request):
+        async def failing(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            raise requests.exceptions.InvalidURL("bad")
+
+        mock_request.side_effect = failing
+        fetcher = AsyncFetcher(label="test_async_singleflight_error", max_retries=1, singleflight=True)
+
+        results = await asyncio.gather(
+            *(fetcher.get("http://localhost:8080/api/example") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        self.assertEqual(mock_request.await_count, 1)
+        self.assertTrue(all(isinstance(result, requests.exceptions.InvalidURL) for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
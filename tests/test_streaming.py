@@ -0,0 +1,82 @@
+import json
+import logging
+import unittest
+from unittest.mock import MagicMock
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.fetcher.streaming import ResponseTooLarge
+from tests.http_server import LocalHTTPServer
+
+
+def ndjson_responder(handler, body):
+    records = (json.dumps({"id": i}).encode() + b"\n" for i in range(100))
+    return 200, {"Content-Type": "application/x-ndjson"}, records
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_iter_ndjson_in_small_chunks(self):
+        metrics = MagicMock()
+        with LocalHTTPServer(ndjson_responder) as server:
+            with Fetcher(label="test_stream_ndjson", metrics=metrics) as fetcher:
+                with fetcher.stream("GET", f"{server.url}/export", chunk_size=7) as response:
+                    records = list(response.iter_ndjson())
+                    size = response.bytes_received
+                fetcher.get(f"{server.url}/api/example")
+
+        self.assertEqual(records, [{"id": i} for i in range(100)])
+        metrics.track_bytes_received.assert_called_once_with("test_stream_ndjson", "GET", size)
+        self.assertEqual(metrics.track_pool_checkout.call_args_list[-1].args, ("test_stream_ndjson", True))
+
+        phases = [c.args[2] for c in metrics.track_phase.call_args_list]
+        self.assertEqual(phases.count("ttfb"), 2)
+        self.assertEqual(phases.count("download"), 2)
+
+    def test_iter_lines_keeps_partial_lines_across_chunks(self):
+        def responder(handler, body):
+            return 200, {}, iter([b"fir", b"st\r\nsec", b"ond\n", b"third"])
+
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_stream_lines") as fetcher:
+                with fetcher.stream("GET", f"{server.url}/export") as response:
+                    self.assertEqual(list(response.iter_lines()), [b"first", b"second", b"third"])
+
+    def test_max_bytes_is_enforced_while_reading(self):
+        with LocalHTTPServer(ndjson_responder) as server:
+            with Fetcher(label="test_stream_max_bytes") as fetcher:
+                response = fetcher.stream("GET", f"{server.url}/export", max_bytes=100)
+                with self.assertRaises(ResponseTooLarge):
+                    for _ in response.iter_bytes(32):
+                        pass
+
+                self.assertTrue(response.closed)
+                self.assertEqual(fetcher.circuit_breaker.fail_counter, 0)
+
+    def test_content_length_above_max_bytes_fails_fast(self):
+        with LocalHTTPServer() as server:
+            with Fetcher(label="test_stream_content_length") as fetcher:
+                with self.assertRaises(ResponseTooLarge) as context:
+                    fetcher.stream("GET", f"{server.url}/api/example", max_bytes=4)
+
+        self.assertEqual(context.exception.received, 16)
+
+    def test_retries_apply_to_the_header_phase(self):
+        statuses = [503, 200]
+
+        def responder(handler, body):
+            return statuses.pop(0), {}, iter([b'{"id": 1}\n'])
+
+        circuit_config = {"retry_statuses": [503], "backoff_strategy": lambda attempt: 0}
+        with LocalHTTPServer(responder) as server:
+            with Fetcher(label="test_stream_retry", circuit_config=circuit_config) as fetcher:
+                with fetcher.stream("GET", f"{server.url}/export") as response:
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(list(response.iter_ndjson()), [{"id": 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()
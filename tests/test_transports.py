@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from src.fetchin.fetcher.fetcher import Fetcher
+from src.fetchin.transports import MemoryTransport, RecordReplayTransport
+from tests.http_server import LocalHTTPServer
+
+STUBS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "stubs")
+
+
+class TestMemoryTransport(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_serves_wiremock_mappings_without_network(self):
+        metrics = MagicMock()
+        transport = MemoryTransport.from_directory(STUBS_DIR)
+
+        with Fetcher(label="test_memory_transport", metrics=metrics, transport=transport) as fetcher:
+            response = fetcher.get("http://wiremock.invalid/api/example")
+            missing = fetcher.get("http://wiremock.invalid/api/missing")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"message": "This is a mocked response from WireMock!"})
+        self.assertEqual(response.headers["Content-Type"], "application/json")
+        self.assertEqual(missing.status_code, 404)
+        metrics.track_labelled_request.assert_any_call("test_memory_transport", "GET", 200, unittest.mock.ANY)
+
+    def test_request_matchers_and_priority(self):
+        transport = MemoryTransport([
+            {"request": {"method": "ANY", "urlPathPattern": "/users/.*"}, "response": {"status": 500}},
+            {
+                "priority": 1,
+                "request": {
+                    "method": "POST",
+                    "urlPath": "/users/1",
+                    "queryParameters": {"expand": {"equalTo": "orders"}},
+                    "headers": {"Authorization": {"matches": "Bearer .+"}},
+                    "bodyPatterns": [{"equalToJson": {"name": "Ada"}}],
+                },
+                "response": {"status": 201, "jsonBody": {"id": 1}, "headers": {"Content-Type": "application/json"}},
+            },
+        ])
+        fetcher = Fetcher(label="test_memory_matchers", transport=transport)
+
+        response = fetcher.post(
+            "http://api.invalid/users/1",
+            data={"name": "Ada"},
+            params={"expand": "orders"},
+            headers={"Authorization": "Bearer token"},
+        )
+        self.assertEqual((response.status_code, response.json()), (201, {"id": 1}))
+        self.assertEqual(fetcher.post("http://api.invalid/users/1", data={"name": "Ada"}).status_code, 500)
+        self.assertEqual(fetcher.get("http://api.invalid/orders").status_code, 404)
+
+    def test_streaming_from_memory(self):
+        transport = MemoryTransport([{"request": {"urlPath": "/export"}, "response": {"body": '{"id": 1}\n{"id": 2}\n'}}])
+        with Fetcher(label="test_memory_stream", transport=transport) as fetcher:
+            with fetcher.stream("GET", "http://api.invalid/export", chunk_size=4) as response:
+                self.assertEqual(list(response.iter_ndjson()), [{"id": 1}, {"id": 2}])
+
+
+class TestRecordReplayTransport(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_recorded_traffic_is_replayed_without_the_upstream(self):
+        with LocalHTTPServer() as server:
+            url = f"{server.url}/api/example?page=2"
+            with Fetcher(label="test_record", transport=RecordReplayTransport(self.directory.name, mode="record")) as fetcher:
+                recorded = fetcher.get(url)
+
+        files = os.listdir(os.path.join(self.directory.name, "mappings"))
+        self.assertEqual(len(files), 1)
+        with open(os.path.join(self.directory.name, "mappings", files[0])) as f:
+            self.assertEqual(json.load(f)["request"], {"method": "GET", "url": "/api/example?page=2"})
+
+        with Fetcher(label="test_replay", transport=RecordReplayTransport(self.directory.name)) as fetcher:
+            replayed = fetcher.get(url)
+
+        self.assertEqual(replayed.status_code, recorded.status_code)
+        self.assertEqual(replayed.json(), {"data": "test"})
+
+    def test_auto_mode_records_only_unmatched_requests(self):
+        upstream = MagicMock()
+        upstream.request.return_value = MemoryTransport(
+            [{"request": {"urlPath": "/api/example"}, "response": {"body": "fresh"}}]
+        ).request("GET", "http://api.invalid/api/example")
+        transport = RecordReplayTransport(self.directory.name, mode="auto", transport=upstream)
+
+        first = transport.request("GET", "http://api.invalid/api/example")
+        second = transport.request("GET", "http://api.invalid/api/example")
+
+        self.assertEqual((first.text, second.text), ("fresh", "fresh"))
+        upstream.request.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()